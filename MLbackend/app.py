@@ -1,15 +1,10 @@
+from flask import Flask, jsonify, render_template, request, send_file, url_for
 
-import os
-import traceback
-from pathlib import Path
-
-from flask import Flask, jsonify, render_template, request, send_file
-from flask_mail import Message
-
-from MLbackend.community_smells import detect_community_smells
-from MLbackend.email_utils import configure_app
-from MLbackend.validations import validate_email,validate_pat,validate_url,InvalidInputError
-from flask_mail import Message
+from MLbackend.config import (JOB_QUEUE_PATH, LOGGER, RESULT_STORE_PATH,
+                              RESULT_TTL_SECONDS)
+from MLbackend.job_queue import FAILED, FINISHED, JobQueue
+from MLbackend.result_store import ResultStore
+from MLbackend.validations import validate_email,validate_pat,validate_url,validate_window_months,InvalidInputError
 
 app = Flask(
     __name__,
@@ -17,7 +12,8 @@ app = Flask(
     static_folder="../frontend/static/",
 )
 
-configure_app(app)
+app.job_queue = JobQueue(JOB_QUEUE_PATH, LOGGER)
+app.result_store = ResultStore(RESULT_STORE_PATH, RESULT_TTL_SECONDS, LOGGER)
 
 
 @app.route("/")
@@ -30,37 +26,83 @@ def detect_smells():
     url = request.form["repo-url"]
     email = request.form["email"]
     pat = request.form["access-token"]
+    # optional, analyse only the last months instead of the full history
+    window_months = request.form.get("window-months") or None
 
     try:
         validate_url(url)
         validate_email(email)
         validate_pat(pat)
-        result = detect_community_smells(url, pat)
-        global pdf_path
-        if not result:
-            return (
-                jsonify(
-                    {
-                        "status": "error",
-                        "message": "No data found, Please try again later",
-                    }
-                ),
-                404,
-            )
-        pdf_path = result.pdf_file_path
-        send_email(email=email)
-        return render_template("results.html", data=result.get_web_result())
+        payload = dict(url=url, email=email, pat=pat)
+        if window_months is not None:
+            validate_window_months(window_months)
+            payload["window_months"] = int(window_months)
+        job_id = app.job_queue.submit(payload)
+        return (
+            jsonify(
+                {
+                    "status": "queued",
+                    "job_id": job_id,
+                    "status_url": url_for("smells_status", job_id=job_id),
+                    "result_url": url_for("smells_result", job_id=job_id),
+                }
+            ),
+            202,
+        )
     except InvalidInputError as input_error:
         return jsonify({"status": "error", "message": str(input_error)}), 400
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
-@app.route("/api/v1/pdf", methods=["GET"])
-def generate_pdf():
+@app.route("/api/v1/smells/<job_id>", methods=["GET"])
+def smells_status(job_id):
+    job = app.job_queue.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Unknown job"}), 404
+
+    return jsonify(
+        {
+            "status": job["status"],
+            "job_id": job["id"],
+            "message": job["error"],
+            "created_at": job["created_at"],
+            "started_at": job["started_at"],
+            "finished_at": job["finished_at"],
+        }
+    )
+
+
+@app.route("/api/v1/smells/<job_id>/result", methods=["GET"])
+def smells_result(job_id):
+    job = app.job_queue.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Unknown job"}), 404
+
+    if job["status"] == FAILED:
+        return jsonify({"status": "error", "message": job["error"]}), 500
+
+    if job["status"] != FINISHED:
+        return jsonify({"status": job["status"], "job_id": job["id"]}), 202
+
+    stored = app.result_store.get(job["result"]["result_id"])
+    if stored is None:
+        return jsonify({"status": "error", "message": "Result has expired"}), 410
+
+    return render_template(
+        "results.html",
+        data=stored["web_result"],
+        pdf_url=url_for("generate_pdf", result_id=stored["id"]),
+    )
+
+
+@app.route("/api/v1/pdf/<result_id>", methods=["GET"])
+def generate_pdf(result_id):
     try:
-        pdf_path1 = Path(pdf_path).resolve()
-        return send_file(pdf_path1, as_attachment=True)
+        pdf_path = app.result_store.get_pdf_path(result_id)
+        if pdf_path is None:
+            return jsonify({"status": "error", "message": "Report not found"}), 404
+        return send_file(pdf_path, as_attachment=True)
     except Exception as _:
         return (
             jsonify(
@@ -73,23 +115,6 @@ def generate_pdf():
         )
 
 
-def send_email(email):
-    try:
-        PDF_FILE_PATH = os.path.abspath(pdf_path)
-        msg = Message(
-            subject="Community Smells Detector",
-            sender="g01communitysmellsdetector@gmail.com",
-            recipients=[email],
-        )
-        msg.body = "Hey, PFA smells report"
-        with app.open_resource(PDF_FILE_PATH) as fp:
-            msg.attach("smell_report.pdf", "application/pdf", fp.read())
-
-        app.mail.send(msg)
-        return "Message sent!"
-    except Exception as e:
-        return str(e)
-
-
+# the API only queues jobs, MLbackend.worker runs them and sends the report mails
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=3000)
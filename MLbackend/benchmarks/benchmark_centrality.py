@@ -0,0 +1,146 @@
+import random
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Set, Tuple
+
+from dateutil.relativedelta import relativedelta
+
+from MLbackend.src.centrality_analysis import (find_related_authors,
+                                               find_related_commits,
+                                               find_related_participants)
+from MLbackend.src.commit_record import CommitRecord
+from MLbackend.src.commit_table import CommitTable
+from MLbackend.src.utils import author_id_extractor
+
+
+def find_related_authors_pairwise(
+    commits: List[CommitRecord],
+) -> Tuple[Dict[str, Set[str]], Counter]:
+    # the original scan, every commit is compared with every other commit of the batch
+    all_related_authors = {}
+    author_commits = Counter({})
+
+    for commit in commits:
+        author = author_id_extractor(commit.author)
+        author_commits.update({author: 1})
+
+        commit_date = datetime.fromtimestamp(commit.committed_date)
+        earliest_date = commit_date + relativedelta(months=-1)
+        latest_date = commit_date + relativedelta(months=+1)
+
+        commit_related_commits = filter(
+            lambda c: find_related_commits(author, earliest_date, latest_date, c), commits
+        )
+        commit_related_authors = set(
+            list(map(lambda c: author_id_extractor(c.author), commit_related_commits))
+        )
+
+        author_related_authors = all_related_authors.setdefault(author, set())
+        author_related_authors.update(commit_related_authors)
+
+    return all_related_authors, author_commits
+
+
+def find_related_participants_rescan(
+    batch: List[List[str]],
+) -> Tuple[Dict[str, Set[str]], Counter]:
+    # the original scan, every participant list is searched again for every participant
+    all_related_authors = {}
+    author_items = Counter({})
+
+    for authors in batch:
+        for author in authors:
+            author_items.update({author: 1})
+
+            related_authors = set(
+                related_author
+                for otherAuthors in batch
+                for related_author in otherAuthors
+                if author in otherAuthors and related_author != author
+            )
+            author_related_authors = all_related_authors.setdefault(author, set())
+            author_related_authors.update(related_authors)
+
+    return all_related_authors, author_items
+
+
+def generate_threads(
+    thread_count: int, author_count: int, max_participants: int, seed: int = 0
+) -> List[List[str]]:
+    generator = random.Random(seed)
+    return [
+        [
+            f"dev{generator.randrange(author_count)}"
+            for _ in range(generator.randint(1, max_participants))
+        ]
+        for _ in range(thread_count)
+    ]
+
+
+def generate_commits(
+    commit_count: int, author_count: int, days: int, seed: int = 0
+) -> CommitTable:
+    generator = random.Random(seed)
+    start = int(datetime(2020, 1, 1).timestamp())
+    return CommitTable.from_records([
+        CommitRecord(
+            f"{idx:040x}",
+            f"Dev {author}",
+            f"dev{author}@example.com",
+            timestamp,
+            0,
+            timestamp,
+            0,
+            "message",
+        )
+        for idx in range(commit_count)
+        for author, timestamp in [
+            (
+                generator.randrange(author_count),
+                start + generator.randrange(days * 24 * 60 * 60),
+            )
+        ]
+    ])
+
+
+def main() -> None:
+    for commit_count in [500, 2000, 5000]:
+        commits = generate_commits(commit_count, author_count=50, days=3 * 365)
+
+        started_at = time.perf_counter()
+        expected = find_related_authors_pairwise(list(commits))
+        pairwise_seconds = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        actual = find_related_authors(commits)
+        sweep_seconds = time.perf_counter() - started_at
+
+        assert actual == expected, "sweep and pairwise scan disagree"
+        print(
+            f"{commit_count} commits: pairwise {pairwise_seconds:.2f}s, "
+            f"sweep {sweep_seconds:.3f}s, {pairwise_seconds / sweep_seconds:.0f}x faster"
+        )
+
+    for thread_count in [200, 1000, 3000]:
+        threads = generate_threads(thread_count, author_count=300, max_participants=12)
+
+        started_at = time.perf_counter()
+        expected = find_related_participants_rescan(threads)
+        rescan_seconds = time.perf_counter() - started_at
+
+        timings = []
+        for mode in ["pairs", "sparse"]:
+            started_at = time.perf_counter()
+            actual = find_related_participants(threads, mode)
+            timings.append(time.perf_counter() - started_at)
+            assert actual == expected, f"{mode} mode and rescan disagree"
+
+        print(
+            f"{thread_count} threads: rescan {rescan_seconds:.2f}s, "
+            f"pairs {timings[0]:.3f}s, sparse {timings[1]:.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import git
+
+from MLbackend.src.commit_record import CommitRecord
+from MLbackend.src.commit_table import read_commit_log
+
+LOADERS: List[str] = ["gitpython", "records", "table"]
+
+
+def generate_repo(repo_path: str, commit_count: int, author_count: int = 200) -> None:
+    # empty commits are enough, the analyses only read commit metadata
+    stream = []
+    start = 1_577_836_800
+    for idx in range(1, commit_count + 1):
+        author = f"Dev {idx % author_count} <dev{idx % author_count}@example.com>"
+        message = f"change {idx}\n\nsomething was changed in a file\n".encode("utf-8")
+        timestamp = start + idx * 600
+        stream.append(
+            f"commit refs/heads/master\nmark :{idx}\n"
+            f"author {author} {timestamp} +0200\ncommitter {author} {timestamp} +0200\n"
+            f"data {len(message)}\n".encode("utf-8")
+        )
+        stream.append(message)
+        if idx > 1:
+            stream.append(f"from :{idx - 1}\n".encode("utf-8"))
+        stream.append(b"\n")
+
+    git.Repo.init(repo_path, bare=True)
+    subprocess.run(
+        ["git", "fast-import", "--quiet"], cwd=repo_path, input=b"".join(stream), check=True
+    )
+    return None
+
+
+def load_gitpython(repo: git.Repo) -> List[git.Commit]:
+    return list(repo.iter_commits())
+
+
+def load_records(repo: git.Repo) -> List[CommitRecord]:
+    return [CommitRecord.from_commit(commit) for commit in repo.iter_commits()]
+
+
+def touch(commits: Any) -> None:
+    # read what commit analysis reads, lazy objects only load their data here
+    for commit in commits:
+        commit.author.email
+        commit.committed_datetime
+        commit.author_tz_offset
+        commit.message
+    return None
+
+
+def measure(loader: str, repo_path: str) -> None:
+    # runs in its own process so the peak RSS belongs to this loader alone
+    loaders: Dict[str, Callable[[git.Repo], Any]] = dict(
+        gitpython=load_gitpython, records=load_records, table=read_commit_log
+    )
+    repo = git.Repo(repo_path, odbt=git.GitCmdObjectDB)
+    rss_before = current_rss_mb()
+
+    started_at = time.perf_counter()
+    commits = loaders[loader](repo)
+    touch(commits)
+    seconds = time.perf_counter() - started_at
+
+    # what stays resident while the commits are kept around for the analyses
+    retained_rss_mb = current_rss_mb() - rss_before
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{loader} {seconds:.2f} {retained_rss_mb:.0f} {peak_rss_mb:.0f}")
+    return None
+
+
+def current_rss_mb() -> float:
+    with open("/proc/self/statm") as file:
+        resident_pages = int(file.read().split()[1])
+    return resident_pages * resource.getpagesize() / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commits", type=int, default=100_000)
+    parser.add_argument("--measure", choices=LOADERS)
+    parser.add_argument("--repo")
+    args = parser.parse_args()
+
+    if args.measure is not None:
+        return measure(args.measure, args.repo)
+
+    with tempfile.TemporaryDirectory() as temp_path:
+        generate_repo(temp_path, args.commits)
+
+        for loader in LOADERS:
+            output = subprocess.run(
+                [sys.executable, "-m", __spec__.name, "--measure", loader, "--repo", temp_path],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()
+            print(
+                f"{args.commits} commits, {loader}: {output[1]}s, "
+                f"{output[2]} MB retained, peak RSS {output[3]} MB"
+            )
+
+    return None
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,23 @@
+import os
 from pathlib import Path
-from MLbackend.src.dev_network import community_smells_detector
-from MLbackend.config import LOGGER
+from typing import Any, Dict, Optional
+
+from MLbackend.config import (LOGGER, MAIL_OUTBOX_PATH, POLITENESS_BATCH_SIZE,
+                              POLITENESS_PROCESSES, RESULT_STORE_PATH,
+                              RESULT_TTL_SECONDS)
+from MLbackend.email_utils import queue_report_email
+from MLbackend.mail_outbox import MailOutbox
+from MLbackend.result_store import ResultStore
+from MLbackend.src.dev_network import community_smells_detector, remove_tree
+from MLbackend.src.model_registry import get_model_registry
+from MLbackend.src.politeness_engine import get_politeness_engine
+from MLbackend.src.smell_detection import METRIC_NAMES
 from MLbackend.src.utils.result import Result
 
 
-def detect_community_smells(url, pat):
+def detect_community_smells(
+    url, pat, run_id: Optional[str] = None, window_months: Optional[int] = None
+):
     senti_strength_path = Path(".", "MLbackend", "data")
     output_path = Path(".", "MLbackend", "src", "results")
     result_ins: Result = Result(logger=LOGGER)
@@ -16,8 +29,43 @@ def detect_community_smells(url, pat):
         output_path=output_path,
         logger=LOGGER,
         result=result_ins,
+        run_id=run_id,
+        window_months=window_months,
     )
     if len(result_ins.smells) == 0:
         return None
     else:
         return result_ins
+
+
+def preload_models() -> None:
+    get_model_registry(METRIC_NAMES, LOGGER)
+    get_politeness_engine(POLITENESS_BATCH_SIZE, POLITENESS_PROCESSES, LOGGER)
+    return None
+
+
+def run_smells_job(job_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    result = detect_community_smells(
+        payload["url"],
+        payload["pat"],
+        run_id=job_id,
+        window_months=payload.get("window_months"),
+    )
+    if not result:
+        raise LookupError("No data found, Please try again later")
+
+    # the report is sent in the background, a slow mail server doesn't hold up the job
+    mail_id = queue_report_email(
+        MailOutbox(MAIL_OUTBOX_PATH, LOGGER), payload["email"], result.pdf_file_path
+    )
+    LOGGER.info(f"Email for {payload['url']}: queued as {mail_id}")
+
+    result_store = ResultStore(RESULT_STORE_PATH, RESULT_TTL_SECONDS, LOGGER)
+    result_store.put(job_id, result.get_web_result(), result.pdf_file_path)
+
+    # the store keeps its own copy of the report, the run folder is no longer needed
+    run_results_path = os.path.dirname(result.pdf_file_path)
+    if os.path.exists(run_results_path):
+        remove_tree(run_results_path)
+
+    return dict(result_id=job_id)
@@ -1,7 +1,9 @@
 import logging
+import os
 from datetime import datetime
 from logging import Logger
 from pathlib import Path
+from typing import List
 
 LOG_FOLDER_PATH: Path = Path(".", "logs")
 LOG_FOLDER_PATH.mkdir(exist_ok=True)
@@ -14,3 +16,48 @@ logging.basicConfig(
 )
 
 LOGGER: Logger = logging.getLogger(__name__)
+
+JOB_QUEUE_PATH: Path = Path(".", "MLbackend", "src", "results", "jobs.db")
+JOB_WORKER_COUNT: int = int(os.getenv("JOB_WORKER_COUNT", "2"))
+
+MAIL_OUTBOX_PATH: Path = Path(".", "MLbackend", "src", "results", "outbox.db")
+
+RESULT_STORE_PATH: Path = Path(".", "MLbackend", "src", "results", "reports")
+RESULT_TTL_SECONDS: float = float(os.getenv("RESULT_TTL_HOURS", "24")) * 60 * 60
+
+# "auto" computes small graphs exactly and samples pivots above the node limit,
+# "parallel" computes exactly across CENTRALITY_WORKERS processes
+CENTRALITY_MODE: str = os.getenv("CENTRALITY_MODE", "auto")
+CENTRALITY_EXACT_NODE_LIMIT: int = int(os.getenv("CENTRALITY_EXACT_NODE_LIMIT", "1000"))
+CENTRALITY_PIVOTS: int = int(os.getenv("CENTRALITY_PIVOTS", "256"))
+CENTRALITY_WORKERS: int = int(os.getenv("CENTRALITY_WORKERS", str(os.cpu_count() or 1)))
+
+# Perspective API quota, requests run concurrently but never faster than PERSPECTIVE_QPS
+PERSPECTIVE_URL: str = os.getenv(
+    "PERSPECTIVE_URL", "https://commentanalyzer.googleapis.com/v1alpha1/comments:analyze"
+)
+PERSPECTIVE_QPS: float = float(os.getenv("PERSPECTIVE_QPS", "1"))
+PERSPECTIVE_CONCURRENCY: int = int(os.getenv("PERSPECTIVE_CONCURRENCY", "4"))
+
+# scores are cached across runs per model version, offline only the cached scores are used
+PERSPECTIVE_MODEL_VERSION: str = os.getenv("PERSPECTIVE_MODEL_VERSION", "TOXICITY/en")
+PERSPECTIVE_OFFLINE: bool = os.getenv("PERSPECTIVE_OFFLINE", "false").lower() == "true"
+
+# "perspective" scores comments with the Perspective API, "lexicon" with the local model
+# in MLbackend/models, which needs no key or network
+TOXICITY_BACKEND: str = os.getenv("TOXICITY_BACKEND", "perspective")
+
+# comments parsed per spaCy batch, larger runs are parsed across POLITENESS_PROCESSES processes
+POLITENESS_BATCH_SIZE: int = int(os.getenv("POLITENESS_BATCH_SIZE", "256"))
+POLITENESS_PROCESSES: int = int(os.getenv("POLITENESS_PROCESSES", str(os.cpu_count() or 1)))
+
+# bare, blobless clones shared by all analyses, least recently used ones are removed above this size
+REPO_CACHE_MAX_BYTES: int = int(float(os.getenv("REPO_CACHE_MAX_GB", "20")) * 1024 * 1024 * 1024)
+
+# where the batch results end up once a run is complete, "csv", "parquet" or both comma separated,
+# empty to keep them in memory only
+METRICS_EXPORT_FORMATS: List[str] = [
+    export_format.strip()
+    for export_format in os.getenv("METRICS_EXPORT", "csv").split(",")
+    if export_format.strip()
+]
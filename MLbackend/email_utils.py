@@ -1,8 +1,8 @@
-from flask import Flask
-from flask_mail import Mail
 from dotenv import load_dotenv
 import os
 
+from MLbackend.mail_outbox import MailOutbox, SmtpSettings
+
 
 load_dotenv()
 
@@ -10,12 +10,23 @@ load_dotenv()
 email = os.getenv('EMAIL')
 password = os.getenv('PASSWORD')
 
+# SMTP_HOST=localhost SMTP_PORT=1025 SMTP_USE_TLS=false delivers to a local debugging server
+SMTP_SETTINGS: SmtpSettings = SmtpSettings(
+    host=os.getenv("SMTP_HOST", "smtp.gmail.com"),
+    port=int(os.getenv("SMTP_PORT", "587")),
+    username=email,
+    password=password,
+    use_tls=os.getenv("SMTP_USE_TLS", "true").lower() == "true",
+    sender=os.getenv("SMTP_SENDER", "g01communitysmellsdetector@gmail.com"),
+)
+
 
-def configure_app(app: Flask):
-    app.config["MAIL_SERVER"] = "smtp.gmail.com"
-    app.config["MAIL_PORT"] = 587
-    app.config["MAIL_USERNAME"] = email
-    app.config["MAIL_PASSWORD"] = password
-    app.config["MAIL_USE_TLS"] = True
-    app.config["MAIL_USE_SSL"] = False
-    app.mail = Mail(app)
+def queue_report_email(outbox: MailOutbox, email: str, pdf_path: str) -> str:
+    # delivered by the mail sender in the background, see mail_outbox
+    return outbox.enqueue(
+        email,
+        "Community Smells Detector",
+        "Hey, PFA smells report",
+        attachment_name="smell_report.pdf",
+        attachment_path=os.path.abspath(pdf_path),
+    )
@@ -0,0 +1,232 @@
+import atexit
+import json
+import multiprocessing
+import os
+import sqlite3
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from logging import Logger
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from MLbackend.config import LOGGER
+
+QUEUED: str = "queued"
+RUNNING: str = "running"
+FINISHED: str = "finished"
+FAILED: str = "failed"
+
+
+class JobQueue:
+
+    def __init__(self, db_path: Path, logger: Logger) -> None:
+        self.db_path: Path = Path(db_path)
+        self.logger: Logger = logger
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    payload TEXT,
+                    result TEXT,
+                    error TEXT,
+                    worker_pid INTEGER,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )"""
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)"
+            )
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        # autocommit mode so that claims can take an explicit write lock
+        connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def submit(self, payload: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT INTO jobs (id, status, payload, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(payload), time.time()),
+            )
+        self.logger.info(f"Queued job {job_id}.")
+        return job_id
+
+    def claim(self, worker_pid: int) -> Optional[Dict[str, Any]]:
+        with self._connection() as connection:
+            # take the write lock up front so two workers never claim the same job
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT id, payload FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                (QUEUED,),
+            ).fetchone()
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+
+            connection.execute(
+                "UPDATE jobs SET status = ?, worker_pid = ?, started_at = ? WHERE id = ?",
+                (RUNNING, worker_pid, time.time(), row["id"]),
+            )
+            connection.execute("COMMIT")
+
+        self.logger.info(f"Worker {worker_pid} claimed job {row['id']}.")
+        return dict(id=row["id"], payload=json.loads(row["payload"]))
+
+    def finish(self, job_id: str, result: Dict[str, Any]) -> None:
+        # the payload holds the access token, so it is dropped once the job is done
+        with self._connection() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, payload = NULL, finished_at = ? WHERE id = ?",
+                (FINISHED, json.dumps(result), time.time(), job_id),
+            )
+        self.logger.info(f"Job {job_id} finished.")
+
+    def fail(self, job_id: str, error: str) -> None:
+        with self._connection() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, payload = NULL, finished_at = ? WHERE id = ?",
+                (FAILED, error, time.time(), job_id),
+            )
+        self.logger.error(f"Job {job_id} failed: {error}")
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT id, status, result, error, created_at, started_at, finished_at FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return dict(
+            id=row["id"],
+            status=row["status"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            created_at=format_timestamp(row["created_at"]),
+            started_at=format_timestamp(row["started_at"]),
+            finished_at=format_timestamp(row["finished_at"]),
+        )
+
+    def requeue_orphaned(self) -> int:
+        # jobs whose worker process died mid-run would otherwise stay running forever
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            rows = connection.execute(
+                "SELECT id, worker_pid FROM jobs WHERE status = ?", (RUNNING,)
+            ).fetchall()
+            orphaned = [row["id"] for row in rows if not is_process_alive(row["worker_pid"])]
+            connection.executemany(
+                "UPDATE jobs SET status = ?, worker_pid = NULL, started_at = NULL WHERE id = ?",
+                [(QUEUED, job_id) for job_id in orphaned],
+            )
+            connection.execute("COMMIT")
+
+        if len(orphaned) > 0:
+            self.logger.warning(f"Re-queued {len(orphaned)} orphaned job(s).")
+        return len(orphaned)
+
+
+def start_workers(
+    db_path: Path,
+    handler: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+    worker_count: int,
+    poll_interval: float = 1.0,
+    initializer: Optional[Callable[[], None]] = None,
+) -> List[multiprocessing.Process]:
+    JobQueue(db_path, LOGGER).requeue_orphaned()
+
+    workers = []
+    for _ in range(worker_count):
+        # not daemonic so a job may spread its centrality computation over child processes
+        worker = multiprocessing.Process(
+            target=worker_loop, args=(db_path, handler, poll_interval, initializer)
+        )
+        worker.start()
+        workers.append(worker)
+
+    # workers loop forever, stop them with the server instead of waiting on them at exit
+    atexit.register(stop_workers, workers)
+    LOGGER.info(f"Started {worker_count} job worker(s).")
+    return workers
+
+
+def stop_workers(workers: List[multiprocessing.Process]) -> None:
+    for worker in workers:
+        if worker.is_alive():
+            worker.terminate()
+    for worker in workers:
+        worker.join()
+    return None
+
+
+def worker_loop(
+    db_path: Path,
+    handler: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+    poll_interval: float,
+    initializer: Optional[Callable[[], None]] = None,
+) -> None:
+    queue = JobQueue(db_path, LOGGER)
+    worker_pid = os.getpid()
+
+    # e.g. load what every job needs once, before the first job is claimed
+    if initializer is not None:
+        initializer()
+
+    while True:
+        job = queue.claim(worker_pid)
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+
+        run_job(queue, job, handler)
+
+
+def run_job(
+    queue: JobQueue,
+    job: Dict[str, Any],
+    handler: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+) -> None:
+    try:
+        result = handler(job["id"], job["payload"])
+    except Exception as e:
+        LOGGER.debug(traceback.format_exc())
+        queue.fail(job["id"], str(e))
+        return None
+
+    queue.finish(job["id"], result)
+    return None
+
+
+def is_process_alive(pid: Optional[int]) -> bool:
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def format_timestamp(value: Optional[float]) -> Optional[str]:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value).isoformat(timespec="seconds")
@@ -0,0 +1,265 @@
+import atexit
+import multiprocessing
+import smtplib
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from email.message import EmailMessage
+from logging import Logger
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from MLbackend.config import LOGGER
+
+PENDING: str = "pending"
+SENDING: str = "sending"
+SENT: str = "sent"
+FAILED: str = "failed"
+
+# a failed delivery is retried after 30s, 1m, 2m, ... and given up after MAX_ATTEMPTS
+RETRY_BASE_SECONDS: float = 30
+RETRY_MAX_SECONDS: float = 60 * 60
+MAX_ATTEMPTS: int = 8
+
+# messages sent over one SMTP connection before it is closed again
+SEND_BATCH_SIZE: int = 20
+
+# claimed mails go back to another sender if this one hasn't reported back by then,
+# long enough for a whole batch to time out one by one
+SEND_LEASE_SECONDS: float = 15 * 60
+
+
+class SmtpSettings:
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        use_tls: bool,
+        sender: str,
+        timeout: float = 30,
+    ) -> None:
+        self.host: str = host
+        self.port: int = port
+        self.username: Optional[str] = username
+        self.password: Optional[str] = password
+        self.use_tls: bool = use_tls
+        self.sender: str = sender
+        self.timeout: float = timeout
+
+
+class MailOutbox:
+    # reports waiting for delivery, persisted so a slow or failing mail server
+    # never holds up an analysis and queued mails survive a restart
+
+    def __init__(self, db_path: Path, logger: Logger) -> None:
+        self.db_path: Path = Path(db_path)
+        self.logger: Logger = logger
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS outbox (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    recipient TEXT NOT NULL,
+                    subject TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    attachment_name TEXT,
+                    attachment BLOB,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    next_attempt_at REAL NOT NULL,
+                    sent_at REAL
+                )"""
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)"
+            )
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def enqueue(
+        self,
+        recipient: str,
+        subject: str,
+        body: str,
+        attachment_name: Optional[str] = None,
+        attachment_path: Optional[str] = None,
+    ) -> str:
+        # the attachment is copied in, the run folder it comes from is removed after the job
+        attachment = None
+        if attachment_path is not None:
+            with open(attachment_path, "rb") as file:
+                attachment = file.read()
+
+        mail_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT INTO outbox (id, status, recipient, subject, body, attachment_name, "
+                "attachment, created_at, next_attempt_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (mail_id, PENDING, recipient, subject, body, attachment_name, attachment, now, now),
+            )
+        self.logger.info(f"Queued mail {mail_id}.")
+        return mail_id
+
+    def claim_due(self, limit: int, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        # due mails and mails whose sender went away are leased to this sender
+        now = time.time() if now is None else now
+        with self._connection() as connection:
+            # take the write lock up front so two senders never claim the same mail
+            connection.execute("BEGIN IMMEDIATE")
+            rows = connection.execute(
+                "SELECT * FROM outbox WHERE status IN (?, ?) AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT ?",
+                (PENDING, SENDING, now, limit),
+            ).fetchall()
+            connection.executemany(
+                "UPDATE outbox SET status = ?, next_attempt_at = ? WHERE id = ?",
+                [(SENDING, now + SEND_LEASE_SECONDS, row["id"]) for row in rows],
+            )
+            connection.execute("COMMIT")
+        return [dict(row) for row in rows]
+
+    def mark_sent(self, mail_id: str) -> None:
+        # the report is dropped once delivered, only the delivery record is kept
+        with self._connection() as connection:
+            connection.execute(
+                "UPDATE outbox SET status = ?, attachment = NULL, error = NULL, sent_at = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (SENT, time.time(), mail_id),
+            )
+        self.logger.info(f"Mail {mail_id} sent.")
+
+    def mark_failed(self, mail_id: str, error: str) -> None:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT attempts FROM outbox WHERE id = ?", (mail_id,)
+            ).fetchone()
+            attempts = row["attempts"] + 1
+
+            if attempts >= MAX_ATTEMPTS:
+                connection.execute(
+                    "UPDATE outbox SET status = ?, attachment = NULL, error = ?, attempts = ? "
+                    "WHERE id = ?",
+                    (FAILED, error, attempts, mail_id),
+                )
+                self.logger.error(f"Giving up on mail {mail_id} after {attempts} attempts: {error}")
+                return None
+
+            delay = min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+            connection.execute(
+                "UPDATE outbox SET status = ?, error = ?, attempts = ?, next_attempt_at = ? "
+                "WHERE id = ?",
+                (PENDING, error, attempts, time.time() + delay, mail_id),
+            )
+        self.logger.warning(f"Mail {mail_id} failed, retrying in {delay:.0f}s: {error}")
+        return None
+
+    def get(self, mail_id: str) -> Optional[Dict[str, Any]]:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT id, status, recipient, attempts, error, sent_at FROM outbox WHERE id = ?",
+                (mail_id,),
+            ).fetchone()
+        return None if row is None else dict(row)
+
+
+def deliver_due(outbox: MailOutbox, settings: SmtpSettings) -> int:
+    # every due mail goes out over the same connection, which is only opened when there is mail
+    mails = outbox.claim_due(SEND_BATCH_SIZE)
+    if len(mails) == 0:
+        return 0
+
+    try:
+        smtp = open_smtp(settings)
+    except (OSError, smtplib.SMTPException) as e:
+        for mail in mails:
+            outbox.mark_failed(mail["id"], f"Could not connect to {settings.host}: {e}")
+        return 0
+
+    sent_count = 0
+    try:
+        for mail in mails:
+            try:
+                smtp.send_message(build_message(mail, settings.sender))
+            except smtplib.SMTPServerDisconnected as e:
+                # the rest of the batch is retried on a fresh connection
+                outbox.mark_failed(mail["id"], str(e))
+                break
+            except (OSError, smtplib.SMTPException) as e:
+                outbox.mark_failed(mail["id"], str(e))
+                continue
+
+            outbox.mark_sent(mail["id"])
+            sent_count += 1
+    finally:
+        try:
+            smtp.quit()
+        except (OSError, smtplib.SMTPException):
+            smtp.close()
+
+    return sent_count
+
+
+def open_smtp(settings: SmtpSettings) -> smtplib.SMTP:
+    smtp = smtplib.SMTP(settings.host, settings.port, timeout=settings.timeout)
+    try:
+        if settings.use_tls:
+            smtp.starttls()
+        if settings.username and settings.password:
+            smtp.login(settings.username, settings.password)
+    except Exception:
+        smtp.close()
+        raise
+    return smtp
+
+
+def build_message(mail: Dict[str, Any], sender: str) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = mail["subject"]
+    message["From"] = sender
+    message["To"] = mail["recipient"]
+    message.set_content(mail["body"])
+    if mail["attachment"] is not None:
+        message.add_attachment(
+            mail["attachment"],
+            maintype="application",
+            subtype="pdf",
+            filename=mail["attachment_name"],
+        )
+    return message
+
+
+def start_mail_sender(
+    db_path: Path, settings: SmtpSettings, poll_interval: float = 5.0
+) -> multiprocessing.Process:
+    sender = multiprocessing.Process(
+        target=sender_loop, args=(db_path, settings, poll_interval), daemon=True
+    )
+    sender.start()
+
+    # the sender loops forever, stop it with the server instead of waiting on it at exit
+    atexit.register(sender.terminate)
+    LOGGER.info("Started the mail sender.")
+    return sender
+
+
+def sender_loop(db_path: Path, settings: SmtpSettings, poll_interval: float) -> None:
+    outbox = MailOutbox(db_path, LOGGER)
+    while True:
+        if deliver_due(outbox, settings) < SEND_BATCH_SIZE:
+            time.sleep(poll_interval)
@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import sqlite3
+import time
+from contextlib import contextmanager
+from logging import Logger
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+
+class ResultStore:
+
+    def __init__(self, store_path: Path, ttl_seconds: float, logger: Logger) -> None:
+        self.store_path: Path = Path(store_path)
+        self.ttl_seconds: float = ttl_seconds
+        self.logger: Logger = logger
+
+        self.store_path.mkdir(parents=True, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS results (
+                    id TEXT PRIMARY KEY,
+                    web_result TEXT,
+                    pdf_file_path TEXT,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )"""
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_expiry ON results (expires_at)"
+            )
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(
+            self.store_path / "results.db", timeout=30, isolation_level=None
+        )
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def put(
+        self, result_id: str, web_result: Dict[str, Any], pdf_file_path: Optional[str]
+    ) -> None:
+        self.evict_expired()
+
+        # copy the report so a later run of the same repository cannot overwrite it
+        stored_pdf_path = None
+        if pdf_file_path is not None and os.path.exists(pdf_file_path):
+            stored_pdf_path = self.store_path / f"{result_id}.pdf"
+            shutil.copyfile(pdf_file_path, stored_pdf_path)
+        else:
+            self.logger.warning(f"No PDF report found for result {result_id}.")
+
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results (id, web_result, pdf_file_path, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    result_id,
+                    json.dumps(web_result),
+                    None if stored_pdf_path is None else str(stored_pdf_path),
+                    now,
+                    now + self.ttl_seconds,
+                ),
+            )
+        self.logger.info(f"Stored result {result_id}.")
+
+    def get(self, result_id: str) -> Optional[Dict[str, Any]]:
+        self.evict_expired()
+
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT id, web_result, pdf_file_path FROM results WHERE id = ?",
+                (result_id,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return dict(
+            id=row["id"],
+            web_result=json.loads(row["web_result"]),
+            pdf_file_path=row["pdf_file_path"],
+        )
+
+    def get_pdf_path(self, result_id: str) -> Optional[Path]:
+        stored = self.get(result_id)
+        if stored is None or stored["pdf_file_path"] is None:
+            return None
+        return Path(stored["pdf_file_path"]).resolve()
+
+    def evict_expired(self) -> int:
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            rows = connection.execute(
+                "SELECT id, pdf_file_path FROM results WHERE expires_at <= ?",
+                (time.time(),),
+            ).fetchall()
+            connection.executemany(
+                "DELETE FROM results WHERE id = ?", [(row["id"],) for row in rows]
+            )
+            connection.execute("COMMIT")
+
+        for row in rows:
+            if row["pdf_file_path"] is not None and os.path.exists(row["pdf_file_path"]):
+                os.remove(row["pdf_file_path"])
+
+        if len(rows) > 0:
+            self.logger.info(f"Evicted {len(rows)} expired result(s).")
+        return len(rows)
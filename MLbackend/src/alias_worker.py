@@ -1,26 +1,57 @@
 import os
 from logging import Logger
-from typing import Generator, List
+from typing import Dict, Generator, Iterable, Optional
 
 import git
 import yaml
 
+from MLbackend.src.commit_record import CommitRecord
+from MLbackend.src.commit_table import CommitTable
 from MLbackend.src.configuration import Configuration
 from MLbackend.src.utils import author_id_extractor
 
 
 def replace_aliases(
-    commits: List[git.Commit], config: Configuration, logger: Logger
-) -> Generator[git.Commit, None, None]:
+    commits: Iterable[CommitRecord], config: Configuration, logger: Logger
+) -> Iterable[CommitRecord]:
 
     logger.info("Cleaning aliased authors")
 
+    aliases = load_aliases(config)
+    if aliases is None:
+        return commits
+
+    # replace all author aliases with a unique one
+    return replace_all(commits, aliases)
+
+
+def replace_table_aliases(
+    commits: CommitTable, config: Configuration, logger: Logger
+) -> CommitTable:
+
+    logger.info("Cleaning aliased authors")
+
+    aliases = load_aliases(config)
+    if aliases is None:
+        return commits
+
+    # the table lists every author once, so each is replaced once instead of once per commit
+    authors = []
+    for author in commits.authors:
+        author_id = author_id_extractor(author)
+        email = aliases[author_id] if author_id in aliases else author.email
+        authors.append(git.Actor(author.name, email))
+
+    return commits.with_authors(authors)
+
+
+def load_aliases(config: Configuration) -> Optional[Dict[str, str]]:
     # build path
     alias_path = os.path.join(config.repository_path, "aliases.yml")
 
     # quick lowercase and trim if no alias file
     if not os.path.exists(alias_path):
-        return commits
+        return None
 
     # read aliases
     content = ""
@@ -29,7 +60,7 @@ def replace_aliases(
 
     aliases = yaml.load(content, Loader=yaml.FullLoader)
     if aliases is None:
-        return commits
+        return None
 
     # transpose for easy replacements
     transposes_aliases = {}
@@ -37,12 +68,14 @@ def replace_aliases(
         for email in aliases[alias]:
             transposes_aliases[email] = alias
 
-    # replace all author aliases with a unique one
-    return replace_all(commits, transposes_aliases)
+    return transposes_aliases
 
 
-def replace_all(commits, aliases) -> Generator[git.Commit, None, None]:
-    for commit in list(commits):
+def replace_all(
+    commits: Iterable[CommitRecord], aliases: Dict[str, str]
+) -> Generator[CommitRecord, None, None]:
+    # records carry their own author, so replacing it never touches another commit
+    for commit in commits:
         copy = commit
         author = author_id_extractor(commit.author)
 
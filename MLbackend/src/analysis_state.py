@@ -0,0 +1,303 @@
+import fcntl
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from datetime import datetime
+from logging import Logger
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+import git
+from dateutil.parser import isoparse
+from dateutil.relativedelta import relativedelta
+
+from MLbackend.src.batch_outputs import BatchOutputs
+from MLbackend.src.commit_table import CommitTable, read_commit_log
+from MLbackend.src.configuration import Configuration
+from MLbackend.src.utils.result import Result
+
+# bump whenever the stored layout changes so older states are rebuilt instead of misread
+STATE_VERSION: int = 5
+
+STATE_FILE_NAME: str = "analysis_state.json"
+RESULT_FILE_NAME: str = "result.pkl"
+REPORT_FILE_NAME: str = "smell_report.pdf"
+BATCHES_FILE_NAME: str = "batches.pkl"
+LOCK_FILE_NAME: str = "analysis_state.lock"
+
+NODE_KINDS: List[str] = ["pullRequests", "issues"]
+
+
+class AnalysisState:
+
+    def __init__(self, state_path: str, logger: Logger) -> None:
+        self.state_path: str = state_path
+        self.logger: Logger = logger
+
+        self.head_sha: Optional[str] = None
+        # start of the history the cached commits cover, None for the full history
+        self.since: Optional[str] = None
+        self.commits: CommitTable = CommitTable.from_rows([])
+        self.nodes: Dict[str, Dict[str, Dict[str, Any]]] = {kind: {} for kind in NODE_KINDS}
+        self.updated_at: Dict[str, Optional[str]] = {kind: None for kind in NODE_KINDS}
+        self.batch_fingerprints: List[str] = []
+        # outputs of the previous analysis per batch, read by reusable_batches
+        self.stored_batches: Dict[int, Dict[str, Any]] = {}
+
+        # held from loading until the analysis is closed, so analyses of the same repository
+        # never read or write the state in between each other
+        self.lock: Optional[TextIO] = None
+        self._lock()
+        self._load()
+
+    def _lock(self) -> None:
+        os.makedirs(self.state_path, exist_ok=True)
+        self.lock = open(os.path.join(self.state_path, LOCK_FILE_NAME), "a")
+        try:
+            fcntl.flock(self.lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self.logger.info("Waiting for another analysis of this repository to finish.")
+            fcntl.flock(self.lock, fcntl.LOCK_EX)
+        return None
+
+    def close(self) -> None:
+        if self.lock is not None:
+            self.lock.close()
+            self.lock = None
+        return None
+
+    def _load(self) -> None:
+        state_file_path = os.path.join(self.state_path, STATE_FILE_NAME)
+        if not os.path.exists(state_file_path):
+            self.logger.info("No previous analysis found, analysing the full history.")
+            return None
+
+        try:
+            with open(state_file_path, "r", encoding="utf-8") as file:
+                state = json.load(file)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable analysis state: {e}")
+            return None
+
+        if state.get("version") != STATE_VERSION:
+            self.logger.info("Analysis state is from an older version, analysing the full history.")
+            return None
+
+        self.head_sha = state["head_sha"]
+        self.since = state["since"]
+        self.commits = CommitTable.from_rows(state["commits"])
+        self.nodes = state["nodes"]
+        self.updated_at = state["updated_at"]
+        self.batch_fingerprints = state["batch_fingerprints"]
+        self.logger.info(f"Loaded analysis state at commit {self.head_sha}.")
+        return None
+
+    def save(self) -> None:
+        state = dict(
+            version=STATE_VERSION,
+            head_sha=self.head_sha,
+            since=self.since,
+            commits=self.commits.to_rows(),
+            nodes=self.nodes,
+            updated_at=self.updated_at,
+            batch_fingerprints=self.batch_fingerprints,
+        )
+
+        self._replace(STATE_FILE_NAME, json.dumps(state).encode("utf-8"))
+        return None
+
+    def _replace(self, file_name: str, content: bytes) -> None:
+        # write next to the target and swap it in, so a crash never leaves half a file behind
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.state_path, suffix=".tmp")
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(content)
+        os.replace(temp_path, os.path.join(self.state_path, file_name))
+        return None
+
+    def _read_stored(self, file_name: str) -> Optional[Tuple[List[str], Any]]:
+        # the fingerprints the stored value was computed for and the value itself
+        file_path = os.path.join(self.state_path, file_name)
+        if not os.path.exists(file_path):
+            return None
+
+        try:
+            with open(file_path, "rb") as file:
+                return pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            self.logger.warning(f"Ignoring unreadable {file_name}: {e}")
+            return None
+
+    def load_commits(self, repo: git.Repo, since: Optional[datetime] = None) -> CommitTable:
+        head_sha = repo.head.commit.hexsha
+        cached = self.commits
+        covers_history = self.since is None or (
+            since is not None and isoparse(self.since) <= since
+        )
+
+        if not covers_history:
+            # the cached commits start later than this analysis does
+            self.logger.info("Cached commits don't reach back far enough, walking the history.")
+            table = read_commit_log(repo, since=since)
+            self.since = None if since is None else since.isoformat()
+        elif self.head_sha == head_sha:
+            self.logger.info("No new commits since the previous analysis.")
+            table = cached
+        elif self.head_sha is not None and is_ancestor(repo, self.head_sha, head_sha):
+            new_table = read_commit_log(repo, f"{self.head_sha}..{head_sha}", since)
+            self.logger.info(f"Found {len(new_table)} new commits since {self.head_sha}.")
+            table = CommitTable.concat([new_table, cached])
+        else:
+            # first run or rewritten history, the cached commits can't be trusted
+            table = read_commit_log(repo, since=since)
+            self.since = None if since is None else since.isoformat()
+
+        # aliases are applied to a copy of the authors, the alias file may change between runs
+        self.head_sha = head_sha
+        self.commits = table
+        return table
+
+    def merge_nodes(self, kind: str, nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        cached = self.nodes[kind]
+        for node in nodes:
+            cached[str(node["number"])] = node
+
+            updated_at = node.get("updatedAt")
+            if updated_at is not None and (
+                self.updated_at[kind] is None or updated_at > self.updated_at[kind]
+            ):
+                self.updated_at[kind] = updated_at
+
+        self.logger.info(f"Fetched {len(nodes)} updated {kind}, {len(cached)} in total.")
+        return sorted(cached.values(), key=lambda node: node["number"])
+
+    def changed_batches(self, fingerprints: List[str]) -> List[int]:
+        return changed_indices(self.batch_fingerprints, fingerprints)
+
+    def reusable_batches(self, fingerprints: List[str]) -> List[int]:
+        # batches whose fingerprint is the one their stored outputs were computed for
+        stored = self._read_stored(BATCHES_FILE_NAME)
+        if stored is None:
+            return []
+        stored_fingerprints, self.stored_batches = stored
+
+        batch_count = len(fingerprints) - 1
+        previous_batch_count = len(stored_fingerprints) - 1
+        changed = set(changed_indices(stored_fingerprints, fingerprints))
+        if batch_count in changed:
+            # PRs and issues outside of every batch are analysed with the last batch,
+            # so both the current and the previous last batch are affected
+            changed.update([batch_count - 1, previous_batch_count - 1])
+        return [idx for idx in range(batch_count) if idx not in changed]
+
+    def restore_batches(self, batch_outputs: BatchOutputs, batch_indices: List[int]) -> None:
+        batch_outputs.reuse(self.stored_batches, batch_indices)
+        return None
+
+    def can_reuse(self, fingerprints: List[str]) -> bool:
+        stored = self._read_stored(RESULT_FILE_NAME)
+        return (
+            stored is not None
+            and stored[0] == fingerprints
+            and os.path.exists(os.path.join(self.state_path, REPORT_FILE_NAME))
+        )
+
+    def restore_result(self, result: Result, pdf_file_path: str) -> None:
+        stored_fingerprints, snapshot = self._read_stored(RESULT_FILE_NAME)
+        result.restore(snapshot)
+
+        os.makedirs(os.path.dirname(pdf_file_path), exist_ok=True)
+        shutil.copyfile(os.path.join(self.state_path, REPORT_FILE_NAME), pdf_file_path)
+        result.set_pdf_file_path(pdf_file_path=pdf_file_path)
+        return None
+
+    def store_result(
+        self, result: Result, fingerprints: List[str], batch_outputs: BatchOutputs
+    ) -> None:
+        # the report goes first, a result is only reused when its fingerprints match
+        with open(result.pdf_file_path, "rb") as file:
+            self._replace(REPORT_FILE_NAME, file.read())
+        self._replace(RESULT_FILE_NAME, pickle.dumps((fingerprints, result.snapshot())))
+        self._replace(BATCHES_FILE_NAME, pickle.dumps((fingerprints, batch_outputs.outputs)))
+
+        self.batch_fingerprints = fingerprints
+        return None
+
+
+def changed_indices(previous_fingerprints: List[str], fingerprints: List[str]) -> List[int]:
+    return [
+        idx
+        for idx, fingerprint in enumerate(fingerprints)
+        if idx >= len(previous_fingerprints) or previous_fingerprints[idx] != fingerprint
+    ]
+
+
+def is_ancestor(repo: git.Repo, ancestor_sha: str, sha: str) -> bool:
+    try:
+        return repo.is_ancestor(ancestor_sha, sha)
+    except git.exc.GitCommandError:
+        # the old head is gone, e.g. after a force push
+        return False
+
+
+def describe_inputs(repo: git.Repo, config: Configuration) -> List[Any]:
+    # everything besides commits, PRs and issues that changes the outcome of a run
+    alias_path = os.path.join(config.repository_path, "aliases.yml")
+    alias_digest = None
+    if os.path.exists(alias_path):
+        with open(alias_path, "rb") as file:
+            alias_digest = hashlib.sha256(file.read()).hexdigest()
+
+    tags = sorted([tag.path, tag.object.hexsha] for tag in repo.tags)
+
+    return [
+        config.batch_months,
+        config.start_date,
+        config.google_key is not None,
+        config.toxicity_backend,
+        config.perspective_model_version,
+        config.perspective_offline,
+        config.centrality_mode,
+        config.centrality_exact_node_limit,
+        config.centrality_pivots,
+        alias_digest,
+        tags,
+    ]
+
+
+def compute_batch_fingerprints(
+    commit_batches: List[CommitTable],
+    batch_dates: List[datetime],
+    delta: relativedelta,
+    nodes: Dict[str, List[Dict[str, Any]]],
+    inputs: List[Any],
+) -> List[str]:
+    # the last fingerprint covers PRs and issues created outside of every batch
+    digests = [hashlib.sha256() for _ in range(len(batch_dates) + 1)]
+    encoded_inputs = json.dumps(inputs, default=str).encode("utf-8")
+    for idx, digest in enumerate(digests):
+        digest.update(encoded_inputs)
+        if idx < len(batch_dates):
+            digest.update(batch_dates[idx].isoformat().encode("utf-8"))
+
+    for idx, batch in enumerate(commit_batches):
+        for hexsha in sorted(batch.hexshas()):
+            digests[idx].update(hexsha.encode("utf-8"))
+
+    for kind, kind_nodes in nodes.items():
+        for node in kind_nodes:
+            created_at = isoparse(node["createdAt"])
+            batch_idx = next(
+                (
+                    idx
+                    for idx, batch_date in enumerate(batch_dates)
+                    if batch_date <= created_at < batch_date + delta
+                ),
+                len(batch_dates),
+            )
+            digests[batch_idx].update(
+                f"{kind}:{node['number']}:{node.get('updatedAt')}".encode("utf-8")
+            )
+
+    return [digest.hexdigest() for digest in digests]
@@ -0,0 +1,26 @@
+from typing import Any, Dict, Iterable, Set
+
+
+class BatchOutputs:
+    # what every analysis produced per batch. batches that didn't change since the previous
+    # analysis start out filled from its outputs and are skipped by the analyses
+
+    def __init__(self) -> None:
+        self.outputs: Dict[int, Dict[str, Any]] = {}
+        self.reused: Set[int] = set()
+
+    def reuse(self, outputs: Dict[int, Dict[str, Any]], batch_indices: Iterable[int]) -> None:
+        for batch_idx in batch_indices:
+            self.outputs[batch_idx] = dict(outputs[batch_idx])
+            self.reused.add(batch_idx)
+        return None
+
+    def is_reused(self, batch_idx: int) -> bool:
+        return batch_idx in self.reused
+
+    def get(self, batch_idx: int, name: str) -> Any:
+        return self.outputs[batch_idx][name]
+
+    def put(self, batch_idx: int, name: str, value: Any) -> None:
+        self.outputs.setdefault(batch_idx, {})[name] = value
+        return None
@@ -3,21 +3,26 @@ import os
 from collections import Counter
 from datetime import datetime
 from logging import Logger
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set, Tuple, Union
 
 import networkx as nx
+import numpy as np
 from dateutil.relativedelta import relativedelta
-from git.objects import Commit
-from networkx.algorithms.community import greedy_modularity_communities
+from scipy import sparse
 
+from MLbackend.src.commit_record import CommitRecord
+from MLbackend.src.commit_table import CommitTable
 from MLbackend.src.configuration import Configuration
 from MLbackend.src.stats_analysis import output_statistics
 from MLbackend.src.utils import author_id_extractor
 from MLbackend.src.utils.result import Result
 
+# above this many participant pairs the co-participation graph is built as a sparse matrix product
+SPARSE_PAIR_THRESHOLD: int = 5_000_000
+
 
 def centrality_analysis(
-    commits: List[Commit],
+    commits: Union[CommitTable, List[CommitRecord]],
     delta: relativedelta,
     batch_dates: List[datetime],
     config: Configuration,
@@ -27,20 +32,27 @@ def centrality_analysis(
     core_devs: List[List[Any]] = list()
 
     # work with batched commits
+    commits = CommitTable.of(commits)
     central_meta = []
     central_metric = []
 
     for idx, batch_start_date in enumerate(batch_dates):
-        batch_end_date = batch_start_date + delta
-
-        batch = [
-            commit
-            for commit in commits
-            if commit.committed_datetime >= batch_start_date
-            and commit.committed_datetime < batch_end_date
-        ]
+        if config.batch_outputs.is_reused(idx):
+            # the batch didn't change since the previous analysis
+            batch_core_devs, cen_meta, cen_metric = config.batch_outputs.get(idx, "centrality")
+            if result:
+                for author in batch_core_devs:
+                    result.add_core_dev(author)
+        else:
+            batch_end_date = batch_start_date + delta
+
+            batch = commits[
+                (commits.committed_dates >= batch_start_date.timestamp())
+                & (commits.committed_dates < batch_end_date.timestamp())
+            ]
 
-        batch_core_devs, cen_meta, cen_metric = process_batch(idx, batch, config, logger, result)
+            batch_core_devs, cen_meta, cen_metric = process_batch(idx, batch, config, logger, result)
+            config.batch_outputs.put(idx, "centrality", (batch_core_devs, cen_meta, cen_metric))
         central_meta.append(cen_meta)
         central_metric.append(cen_metric)
         core_devs.append(batch_core_devs)
@@ -49,66 +61,127 @@ def centrality_analysis(
 
 
 def process_batch(
-    batch_idx: int, commits: List[Commit], config: Configuration, logger: Logger, result: Result
+    batch_idx: int,
+    commits: Union[CommitTable, List[CommitRecord]],
+    config: Configuration,
+    logger: Logger,
+    result: Result,
 ) -> List[Any]:
-    all_related_authors = {}
-    author_commits = Counter({})
 
     # for all commits...
     logger.info("Analyzing centrality for commits")
-    for commit in commits:
-        author = author_id_extractor(commit.author)
+    all_related_authors, author_commits = find_related_authors(CommitTable.of(commits))
+
+    return prepare_graph(
+        all_related_authors, author_commits, batch_idx, "commitCentrality", config, logger, result
+    )
 
-        # increase author commit count
-        author_commits.update({author: 1})
 
-        # initialize dates for related author analysis
-        commit_date = datetime.fromtimestamp(commit.committed_date)
-        earliest_date = commit_date + relativedelta(months=-1)
-        latest_date = commit_date + relativedelta(months=+1)
+def find_related_authors(commits: CommitTable) -> Tuple[Dict[str, Set[str]], Counter]:
+    # authors and local commit dates come straight from the table's columns
+    authors = commits.author_ids()
+    commit_dates = [datetime.fromtimestamp(date) for date in commits.committed_dates.tolist()]
 
-        commit_related_commits = filter(
-            lambda c: find_related_commits(author, earliest_date, latest_date, c), commits
-        )
+    author_commits = Counter(authors)
+    all_related_authors: Dict[str, Set[str]] = {author: set() for author in authors}
+    if len(commits) == 0:
+        return all_related_authors, author_commits
 
-        commit_related_authors = set(
-            list(map(lambda c: author_id_extractor(c.author), commit_related_commits))
-        )
+    author_names = list(all_related_authors)
+    author_codes = {author: code for code, author in enumerate(author_names)}
+    codes = np.array([author_codes[author] for author in authors])
 
-        # get current related authors collection and update it
-        author_related_authors = all_related_authors.setdefault(author, set())
-        author_related_authors.update(commit_related_authors)
+    # sort once so every commit's +-1 month window is a contiguous slice
+    dates = np.array(commit_dates, dtype="datetime64[us]")
+    order = np.argsort(dates, kind="stable")
+    sorted_dates = dates[order]
+    sorted_codes = codes[order]
 
-    return prepare_graph(
-        all_related_authors, author_commits, batch_idx, "commitCentrality", config, logger, result
+    earliest_dates = np.array(
+        [commit_date + relativedelta(months=-1) for commit_date in commit_dates],
+        dtype="datetime64[us]",
     )
+    latest_dates = np.array(
+        [commit_date + relativedelta(months=+1) for commit_date in commit_dates],
+        dtype="datetime64[us]",
+    )
+    window_starts = np.searchsorted(sorted_dates, earliest_dates, side="left")
+    window_ends = np.searchsorted(sorted_dates, latest_dates, side="right")
+
+    # windows move forward with the commit date, so each author's windows merge in one pass
+    for code in np.unique(codes):
+        author_commit_idxs = order[sorted_codes == code]
+        starts = window_starts[author_commit_idxs]
+        ends = window_ends[author_commit_idxs]
+
+        breaks = np.flatnonzero(starts[1:] > ends[:-1]) + 1
+        merged_starts = starts[np.concatenate(([0], breaks))]
+        merged_ends = ends[np.concatenate((breaks - 1, [len(ends) - 1]))]
+
+        related_codes = np.unique(
+            np.concatenate(
+                [sorted_codes[start:end] for start, end in zip(merged_starts, merged_ends)]
+            )
+        )
+        all_related_authors[author_names[code]].update(
+            author_names[related_code] for related_code in related_codes if related_code != code
+        )
+
+    return all_related_authors, author_commits
 
 
 def build_grapql_network(
     batch_idx: int, batch: list, prefix: str, config: Configuration, logger: Logger, result: Result
 ):
-    all_related_authors = {}
-    author_items = Counter({})
-
-    # for all commits...
+    # for all PRs or issues...
     logger.info("Analyzing centrality")
-    for authors in batch:
+    all_related_authors, author_items = find_related_participants(batch)
+
+    return prepare_graph(all_related_authors, author_items, batch_idx, prefix, config, logger, result)
 
+
+def find_related_participants(
+    batch: List[List[str]], mode: str = "auto"
+) -> Tuple[Dict[str, Set[str]], Counter]:
+    author_items = Counter({})
+    all_related_authors: Dict[str, Set[str]] = {}
+    for authors in batch:
+        # count every listed participation, like the per-author loop did
+        author_items.update(authors)
         for author in authors:
+            all_related_authors.setdefault(author, set())
+
+    if mode == "auto":
+        pair_count = sum(len(set(authors)) ** 2 for authors in batch)
+        mode = "sparse" if pair_count > SPARSE_PAIR_THRESHOLD else "pairs"
+
+    if mode == "pairs":
+        # every participant of a thread is related to every other participant of it
+        for authors in batch:
+            thread_authors = set(authors)
+            for author in thread_authors:
+                all_related_authors[author].update(thread_authors)
+    elif mode == "sparse":
+        author_names = list(all_related_authors)
+        author_codes = {author: code for code, author in enumerate(author_names)}
+        rows = [idx for idx, authors in enumerate(batch) for _ in set(authors)]
+        columns = [author_codes[author] for authors in batch for author in set(authors)]
+
+        # threads x authors incidence, its gram matrix counts the threads each pair shares
+        incidence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, columns)),
+            shape=(len(batch), len(author_names)),
+        )
+        co_occurrence = (incidence.T @ incidence).tocoo()
+        for author_code, related_code in zip(co_occurrence.row, co_occurrence.col):
+            all_related_authors[author_names[author_code]].add(author_names[related_code])
+    else:
+        raise ValueError(f"Unknown co-participation mode {mode}. It should be auto, pairs or sparse.")
 
-            # increase author commit count
-            author_items.update({author: 1})
+    for author, related_authors in all_related_authors.items():
+        related_authors.discard(author)
 
-            # get current related authors collection and update it
-            related_authors = set(
-                related_author
-                for otherAuthors in batch
-                for related_author in otherAuthors
-                if author in otherAuthors and related_author != author
-            )
-            author_related_authors = all_related_authors.setdefault(author, set())
-            author_related_authors.update(related_authors)
-    return prepare_graph(all_related_authors, author_items, batch_idx, prefix, config, logger, result)
+    return all_related_authors, author_items
 
 
 def prepare_graph(
@@ -123,6 +196,29 @@ def prepare_graph(
 
     # prepare graph
     logger.info(f"Preparing NX graph for {output_prefix}")
+    config.graph_metrics.add_graph(
+        batch_idx, output_prefix, build_graph(all_related_authors), author_items
+    )
+
+    return output_graph_metrics(batch_idx, output_prefix, config, logger, result)
+
+
+def combine_grapql_networks(
+    batch_idx: int,
+    kinds: List[str],
+    prefix: str,
+    config: Configuration,
+    logger: Logger,
+    result: Result,
+) -> List[Any]:
+    # the combined network is the union of the networks already built for each kind
+    logger.info(f"Combining {' and '.join(kinds)} networks for {prefix}")
+    config.graph_metrics.compose(batch_idx, prefix, kinds)
+
+    return output_graph_metrics(batch_idx, prefix, config, logger, result)
+
+
+def build_graph(all_related_authors: dict) -> nx.Graph:
     G = nx.Graph()
 
     for author in all_related_authors:
@@ -131,24 +227,29 @@ def prepare_graph(
         for related_author in all_related_authors[author]:
             G.add_edge(author.strip(), related_author.strip())
 
-    # analyze graph
-    closeness = dict(nx.closeness_centrality(G))
-    betweenness = dict(nx.betweenness_centrality(G))
-    centrality: Dict[Any, float] = dict(nx.degree_centrality(G))
-    density = nx.density(G)
-    modularity = []
+    return G
 
-    try:
-        for idx, community in enumerate(greedy_modularity_communities(G)):
-            author_count = len(community)
-            community_commit_count = sum(author_items[author] for author in community)
-            row = [author_count, community_commit_count]
-            modularity.append(row)
-    except ZeroDivisionError:
-        # not handled
-        logger.warning(
-            f"A zero division error occured while preparing graph for {output_prefix}."
-        )
+
+def output_graph_metrics(
+    batch_idx: int,
+    output_prefix: str,
+    config: Configuration,
+    logger: Logger,
+    result: Result,
+) -> List[Any]:
+
+    # analyze graph, metrics are computed once per batch and graph kind
+    metrics = config.graph_metrics.get(batch_idx, output_prefix, logger)
+    G = metrics.G
+    author_items = metrics.author_items
+    closeness = metrics.closeness
+    betweenness = metrics.betweenness
+    centrality = metrics.centrality
+    density = metrics.density
+    modularity = [
+        [len(community), sum(author_items[author] for author in community)]
+        for community in metrics.communities
+    ]
 
     # finding high centrality authors
     high_centrality_authors: List[Any] = [
@@ -164,7 +265,7 @@ def prepare_graph(
 
     try:
         percentage_high_centrality_authors = number_high_centrality_authors / len(
-            all_related_authors
+            author_items
         )
     except ZeroDivisionError:
         percentage_high_centrality_authors = 0
@@ -191,14 +292,11 @@ def prepare_graph(
     logger.info(f"Outputting CSVs for {output_prefix}")
 
     # output non-tabular results
-    with open(
-        os.path.join(config.results_path, f"results_{batch_idx}.csv"), "a", newline=""
-    ) as f:
-        w = csv.writer(f, delimiter=",")
-        w.writerow([f"{output_prefix}_Density", density])
-        w.writerow([f"{output_prefix}_Community Count", len(modularity)])
-        w.writerow([f"{output_prefix}_TFN", tfn])
-        w.writerow([f"{output_prefix}_TFC", tfc])
+    config.metrics.set(batch_idx, f"{output_prefix}_Density", density)
+    config.metrics.set(batch_idx, f"{output_prefix}_Community Count", len(modularity))
+    config.metrics.set(batch_idx, f"{output_prefix}_TFN", tfn)
+    config.metrics.set(batch_idx, f"{output_prefix}_TFC", tfc)
+    config.metrics.set(batch_idx, f"{output_prefix}_CentralityMode", metrics.centrality_mode)
     results_meta = [
         ["Metric", "Value"],
         [f"{output_prefix}_Density", density],
@@ -243,19 +341,16 @@ def prepare_graph(
             w.writerow(combined[key])
 
     # output high centrality authors
-    with open(
-        os.path.join(config.results_path, f"results_{batch_idx}.csv"), "a", newline=""
-    ) as f:
-        w = csv.writer(f, delimiter=",")
-        w.writerow(
-            [f"{output_prefix}_NumberHighCentralityAuthors", number_high_centrality_authors]
-        )
-        w.writerow(
-            [
-                f"{output_prefix}_PercentageHighCentralityAuthors",
-                percentage_high_centrality_authors,
-            ]
-        )
+    config.metrics.set(
+        batch_idx,
+        f"{output_prefix}_NumberHighCentralityAuthors",
+        number_high_centrality_authors,
+    )
+    config.metrics.set(
+        batch_idx,
+        f"{output_prefix}_PercentageHighCentralityAuthors",
+        percentage_high_centrality_authors,
+    )
 
     results_meta.append(
         [f"{output_prefix}_NumberHighCentralityAuthors", number_high_centrality_authors]
@@ -272,7 +367,7 @@ def prepare_graph(
         batch_idx,
         [value for key, value in closeness.items()],
         f"{output_prefix}_Closeness",
-        config.results_path,
+        config.metrics,
         logger,
     )
 
@@ -280,7 +375,7 @@ def prepare_graph(
         batch_idx,
         [value for key, value in betweenness.items()],
         f"{output_prefix}_Betweenness",
-        config.results_path,
+        config.metrics,
         logger,
     )
 
@@ -288,7 +383,7 @@ def prepare_graph(
         batch_idx,
         [value for key, value in centrality.items()],
         f"{output_prefix}_Centrality",
-        config.results_path,
+        config.metrics,
         logger,
     )
 
@@ -296,7 +391,7 @@ def prepare_graph(
         batch_idx,
         [community[0] for community in modularity],
         f"{output_prefix}_CommunityAuthorCount",
-        config.results_path,
+        config.metrics,
         logger,
     )
 
@@ -304,7 +399,7 @@ def prepare_graph(
         batch_idx,
         [community[1] for community in modularity],
         f"{output_prefix}_CommunityAuthorItemCount",
-        config.results_path,
+        config.metrics,
         logger,
     )
 
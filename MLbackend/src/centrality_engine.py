@@ -0,0 +1,121 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from logging import Logger
+from typing import Any, Dict, List, Tuple
+
+import networkx as nx
+
+AUTO: str = "auto"
+EXACT: str = "exact"
+APPROXIMATE: str = "approximate"
+PARALLEL: str = "parallel"
+CENTRALITY_MODES: List[str] = [AUTO, EXACT, APPROXIMATE, PARALLEL]
+
+# pivots are sampled with a fixed seed so repeated runs report the same values
+CENTRALITY_SEED: int = 42
+
+
+def compute_centralities(
+    G: nx.Graph,
+    mode: str,
+    exact_node_limit: int,
+    pivots: int,
+    workers: int,
+    logger: Logger,
+) -> Tuple[Dict[Any, float], Dict[Any, float], str]:
+    if mode not in CENTRALITY_MODES:
+        raise ValueError(
+            f"Unknown centrality mode {mode}. It should be one of {', '.join(CENTRALITY_MODES)}."
+        )
+
+    node_count = G.number_of_nodes()
+    if mode == AUTO:
+        mode = EXACT if node_count <= exact_node_limit else APPROXIMATE
+
+    # sampling every node or splitting over a single worker is just the exact computation
+    if (mode == APPROXIMATE and pivots >= node_count) or (mode == PARALLEL and workers <= 1):
+        mode = EXACT
+
+    logger.info(f"Computing {mode} closeness and betweenness for {node_count} authors")
+    if mode == EXACT:
+        closeness = dict(nx.closeness_centrality(G))
+        betweenness = dict(nx.betweenness_centrality(G))
+    elif mode == APPROXIMATE:
+        closeness = approximate_closeness(G, pivots)
+        betweenness = dict(nx.betweenness_centrality(G, k=pivots, seed=CENTRALITY_SEED))
+    else:
+        closeness, betweenness = parallel_centralities(G, workers)
+
+    return closeness, betweenness, mode
+
+
+def approximate_closeness(G: nx.Graph, pivots: int) -> Dict[Any, float]:
+    node_count = G.number_of_nodes()
+    if node_count <= 1:
+        return {node: 0.0 for node in G}
+
+    # components no bigger than the sample are cheap to compute exactly, only sample the rest
+    closeness = {}
+    sampled_components = []
+    for component in nx.connected_components(G):
+        if len(component) <= pivots:
+            subgraph = G.subgraph(component)
+            for node, value in nx.closeness_centrality(subgraph).items():
+                # scaled by the reachable share of the graph, like networkx does for disconnected graphs
+                closeness[node] = value * (len(component) - 1) / (node_count - 1)
+        else:
+            sampled_components.append(component)
+
+    # distances to a sample of pivots stand in for the distances to every author,
+    # each component gets its share of pivots and at least two so every author reaches one
+    sampled_count = sum(len(component) for component in sampled_components)
+    generator = random.Random(CENTRALITY_SEED)
+    for component in sampled_components:
+        component_nodes = [node for node in G if node in component]
+        pivot_count = max(2, round(pivots * len(component) / sampled_count))
+        distance_sums = dict.fromkeys(component_nodes, 0)
+        pivot_counts = dict.fromkeys(component_nodes, 0)
+        for pivot in generator.sample(component_nodes, pivot_count):
+            for node, distance in nx.single_source_shortest_path_length(G, pivot).items():
+                if node != pivot:
+                    distance_sums[node] += distance
+                    pivot_counts[node] += 1
+
+        for node in component_nodes:
+            mean_distance = distance_sums[node] / pivot_counts[node]
+            closeness[node] = (len(component) - 1) / (mean_distance * (node_count - 1))
+
+    return {node: closeness[node] for node in G}
+
+
+def parallel_centralities(
+    G: nx.Graph, workers: int
+) -> Tuple[Dict[Any, float], Dict[Any, float]]:
+    nodes = list(G)
+    chunks = [nodes[idx::workers] for idx in range(workers) if idx < len(nodes)]
+
+    closeness = {}
+    betweenness = dict.fromkeys(nodes, 0.0)
+    with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+        for chunk_closeness in executor.map(closeness_for_nodes, repeat(G), chunks):
+            closeness.update(chunk_closeness)
+        for chunk_betweenness in executor.map(betweenness_from_sources, repeat(G), chunks):
+            for node, value in chunk_betweenness.items():
+                betweenness[node] += value
+
+    # the subsets halve undirected pair counts, undo that and normalise like betweenness_centrality
+    node_count = len(nodes)
+    scale = 2 / ((node_count - 1) * (node_count - 2)) if node_count > 2 else 2
+    return (
+        {node: closeness[node] for node in nodes},
+        {node: value * scale for node, value in betweenness.items()},
+    )
+
+
+def closeness_for_nodes(G: nx.Graph, nodes: List[Any]) -> Dict[Any, float]:
+    return {node: nx.closeness_centrality(G, u=node) for node in nodes}
+
+
+def betweenness_from_sources(G: nx.Graph, sources: List[Any]) -> Dict[Any, float]:
+    return nx.betweenness_centrality_subset(G, sources, list(G), normalized=False)
@@ -2,70 +2,36 @@ import csv
 import os
 from datetime import datetime
 from logging import Logger
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Tuple, Union
 
-import git
-import pytz
+import numpy as np
 from dateutil.relativedelta import relativedelta
-from git.objects.commit import Commit
-from sentistrength import PySentiStr
+from git.objects.util import from_timestamp
 
+from MLbackend.src.commit_record import CommitRecord
+from MLbackend.src.commit_table import CommitTable
 from MLbackend.src.configuration import Configuration
+from MLbackend.src.senti_server import CachedSentiStrength
 from MLbackend.src.stats_analysis import output_statistics
 from MLbackend.src.utils import author_id_extractor
 from MLbackend.src.utils.result import Result
 
 
 def commit_analysis(
-    senti: PySentiStr,
-    commits: List[git.Commit],
+    senti: CachedSentiStrength,
+    commits: Union[CommitTable, List[CommitRecord]],
     delta: relativedelta,
     config: Configuration,
     logger: Logger,
     result: Result,
 ) -> Tuple[List[datetime], Dict[str, Dict[str, Any]], List[int]]:
 
-    # sort commits
-    commits.sort(key=lambda o: o.committed_datetime)
-
     # split commits into batches
-    batches = []
-    batch = []
-    start_date = None
-    if config.start_date is not None:
-        start_date = datetime.strptime(config.start_date, "%Y-%m-%d")
-        start_date = start_date.replace(tzinfo=pytz.UTC)
-    batch_start_date = None
-    batch_end_date = None
-    batch_dates = []
-
-    for commit in commits:
-        if start_date is not None and start_date > commit.committed_datetime:
-            continue
-        # prepare first batch
-        if batch_start_date is None:
-            batch_start_date = commit.committed_datetime
-            batch_end_date = batch_start_date + delta
-
-            batch_dates.append(batch_start_date)
-            result.add_batch_dates([batch_start_date])
-
-        # prepare next batch
-        elif commit.committed_datetime > batch_end_date:
-            batches.append(batch)
-            batch = []
-            batch_start_date = commit.committed_datetime
-            batch_end_date = batch_start_date + delta
-
-            batch_dates.append(batch_start_date)
-            result.add_batch_dates([batch_start_date])
-
-        # populate current batch
-        batch.append(commit)
-
-    # complete batch list and perform clean up
-    batches.append(batch)
-    del batch, commits
+    commits = CommitTable.of(commits)
+    batches, batch_dates = split_commit_batches(commits, delta, config)
+    for batch_date in batch_dates:
+        result.add_batch_dates([batch_date])
+    del commits
 
     # run analysis per batch
     author_info_dict = {}
@@ -75,10 +41,22 @@ def commit_analysis(
     for idx, batch in enumerate(batches):
 
         # get batch authors
-
-        batch_author_info_dict, batch_days_active, meta_res, metric_res = (
-            commit_batch_analysis(idx, senti, batch, config, logger, result)
-        )
+        if config.batch_outputs.is_reused(idx):
+            # the batch didn't change since the previous analysis
+            result.restore_batch(idx, config.batch_outputs.get(idx, "commit_result"))
+            batch_author_info_dict, batch_days_active, meta_res, metric_res = (
+                config.batch_outputs.get(idx, "commits")
+            )
+        else:
+            batch_author_info_dict, batch_days_active, meta_res, metric_res = (
+                commit_batch_analysis(idx, senti, batch, config, logger, result)
+            )
+            config.batch_outputs.put(
+                idx,
+                "commits",
+                (batch_author_info_dict, batch_days_active, meta_res, metric_res),
+            )
+            config.batch_outputs.put(idx, "commit_result", result.batch_snapshot(idx))
         meta_results.append(meta_res)
         metric_results.append(metric_res)
 
@@ -89,10 +67,51 @@ def commit_analysis(
     return batch_dates, author_info_dict, days_active, meta_results[0], metric_results[0]
 
 
+def split_commit_batches(
+    commits: Union[CommitTable, List[CommitRecord]],
+    delta: relativedelta,
+    config: Configuration,
+) -> Tuple[List[CommitTable], List[datetime]]:
+
+    # sort commits
+    commits = CommitTable.of(commits).sorted_by_commit_date()
+    committed_dates = commits.committed_dates
+
+    batches = []
+    batch_start_idx = 0
+    start_date = config.start_datetime()
+    if start_date is not None:
+        batch_start_idx = int(
+            np.searchsorted(committed_dates, start_date.timestamp(), side="left")
+        )
+    batch_dates = []
+
+    # a batch starts at its first commit and takes every commit up to one delta later
+    while batch_start_idx < len(commits):
+        batch_start_date = from_timestamp(
+            int(committed_dates[batch_start_idx]),
+            int(commits.committer_tz_offsets[batch_start_idx]),
+        )
+        batch_end_date = batch_start_date + delta
+        batch_end_idx = int(
+            np.searchsorted(committed_dates, batch_end_date.timestamp(), side="right")
+        )
+
+        batches.append(commits[batch_start_idx:batch_end_idx])
+        batch_dates.append(batch_start_date)
+        batch_start_idx = batch_end_idx
+
+    # complete batch list
+    if len(batches) == 0:
+        batches.append(commits[batch_start_idx:batch_start_idx])
+
+    return batches, batch_dates
+
+
 def commit_batch_analysis(
     idx: int,
-    senti: PySentiStr,
-    commits: List[git.Commit],
+    senti: CachedSentiStrength,
+    commits: Union[CommitTable, List[CommitRecord]],
     config: Configuration,
     logger: Logger,
     result: Result,
@@ -104,15 +123,12 @@ def commit_batch_analysis(
 
     # traverse all commits
     logger.info("Analyzing commits")
-    start_date = None
-    if config.start_date is not None:
-        start_date = datetime.strptime(config.start_date, "%Y-%m-%d")
-        start_date = start_date.replace(tzinfo=pytz.UTC)
-    # sort commits
-    commits.sort(key=lambda o: o.committed_datetime, reverse=True)
+    start_date = config.start_datetime()
+    # newest commits first, the batch is already sorted the other way round
+    commits = CommitTable.of(commits)[::-1]
 
     commit_messages = []
-    commit: Commit
+    commit: CommitRecord
     last_date = None
     first_date = None
     real_commit_count = 0
@@ -267,18 +283,14 @@ def commit_batch_analysis(
             w.writerow([key, len(timezone["authors"]), timezone["commit_count"]])
 
     # output results
-    with open(
-        os.path.join(config.results_path, f"results_{idx}.csv"), "a", newline=""
-    ) as f:
-        w = csv.writer(f, delimiter=",")
-        w.writerow(["commit_count", real_commit_count])
-        w.writerow(["days_active", days_active])
-        w.writerow(["FirstCommitDate", "{:%Y-%m-%d}".format(first_commit_date)])
-        w.writerow(["LastCommitDate", "{:%Y-%m-%d}".format(last_commit_date)])
-        w.writerow(["AuthorCount", len([*author_info_dict])])
-        w.writerow(["SponsoredAuthorCount", sponsored_author_count])
-        w.writerow(["PercentageSponsoredAuthors", percentage_sponsored_authors])
-        w.writerow(["TimezoneCount", len([*timezone_info_dict])])
+    config.metrics.set(idx, "commit_count", real_commit_count)
+    config.metrics.set(idx, "days_active", days_active)
+    config.metrics.set(idx, "FirstCommitDate", "{:%Y-%m-%d}".format(first_commit_date))
+    config.metrics.set(idx, "LastCommitDate", "{:%Y-%m-%d}".format(last_commit_date))
+    config.metrics.set(idx, "AuthorCount", len([*author_info_dict]))
+    config.metrics.set(idx, "SponsoredAuthorCount", sponsored_author_count)
+    config.metrics.set(idx, "PercentageSponsoredAuthors", percentage_sponsored_authors)
+    config.metrics.set(idx, "TimezoneCount", len([*timezone_info_dict]))
 
     result_meta = [
         ["Metrics", "Value"],
@@ -298,7 +310,7 @@ def commit_batch_analysis(
         idx,
         [author["active_days"] for login, author in author_info_dict.items()],
         "AuthorActiveDays",
-        config.results_path,
+        config.metrics,
         logger,
         result,
     )
@@ -307,7 +319,7 @@ def commit_batch_analysis(
         idx,
         [author["commit_count"] for login, author in author_info_dict.items()],
         "AuthorCommitCount",
-        config.results_path,
+        config.metrics,
         logger,
         result,
     )
@@ -316,7 +328,7 @@ def commit_batch_analysis(
         idx,
         [len(timezone["authors"]) for key, timezone in timezone_info_dict.items()],
         "TimezoneAuthorCount",
-        config.results_path,
+        config.metrics,
         logger,
         result,
     )
@@ -325,7 +337,7 @@ def commit_batch_analysis(
         idx,
         [timezone["commit_count"] for key, timezone in timezone_info_dict.items()],
         "TimezoneCommitCount",
-        config.results_path,
+        config.metrics,
         logger,
         result,
     )
@@ -334,7 +346,7 @@ def commit_batch_analysis(
         idx,
         sentiment_scores,
         "CommitMessageSentiment",
-        config.results_path,
+        config.metrics,
         logger,
         result,
     )
@@ -343,7 +355,7 @@ def commit_batch_analysis(
         idx,
         commit_message_sentiments_positive,
         "CommitMessageSentimentsPositive",
-        config.results_path,
+        config.metrics,
         logger,
         result,
     )
@@ -352,7 +364,7 @@ def commit_batch_analysis(
         idx,
         commit_message_sentiments_negative,
         "CommitMessageSentimentsNegative",
-        config.results_path,
+        config.metrics,
         logger,
         result,
     )
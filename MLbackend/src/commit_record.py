@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Any, List
+
+import git
+from git.objects.util import from_timestamp
+
+
+class CommitRecord:
+    # the commit fields the analyses read, detached from the repository so they can be stored,
+    # slots keep a record at a fraction of a git.Commit and every field is loaded up front
+    __slots__ = (
+        "hexsha",
+        "author",
+        "authored_date",
+        "author_tz_offset",
+        "committed_date",
+        "committer_tz_offset",
+        "message",
+    )
+
+    def __init__(
+        self,
+        hexsha: str,
+        author_name: str,
+        author_email: str,
+        authored_date: int,
+        author_tz_offset: int,
+        committed_date: int,
+        committer_tz_offset: int,
+        message: str,
+    ) -> None:
+        self.hexsha: str = hexsha
+        self.author: git.Actor = git.Actor(author_name, author_email)
+        self.authored_date: int = authored_date
+        self.author_tz_offset: int = author_tz_offset
+        self.committed_date: int = committed_date
+        self.committer_tz_offset: int = committer_tz_offset
+        self.message: str = message
+
+    @property
+    def authored_datetime(self) -> datetime:
+        return from_timestamp(self.authored_date, self.author_tz_offset)
+
+    @property
+    def committed_datetime(self) -> datetime:
+        return from_timestamp(self.committed_date, self.committer_tz_offset)
+
+    @classmethod
+    def from_commit(cls, commit: git.Commit) -> "CommitRecord":
+        return cls(
+            commit.hexsha,
+            commit.author.name,
+            commit.author.email,
+            commit.authored_date,
+            commit.author_tz_offset,
+            commit.committed_date,
+            commit.committer_tz_offset,
+            commit.message,
+        )
+
+    @classmethod
+    def from_row(cls, row: List[Any]) -> "CommitRecord":
+        return cls(*row)
+
+    def to_row(self) -> List[Any]:
+        return [
+            self.hexsha,
+            self.author.name,
+            self.author.email,
+            self.authored_date,
+            self.author_tz_offset,
+            self.committed_date,
+            self.committer_tz_offset,
+            self.message,
+        ]
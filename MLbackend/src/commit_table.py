@@ -0,0 +1,340 @@
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import git
+import numpy as np
+from git.objects.util import utctz_to_altz
+
+from MLbackend.src.commit_record import CommitRecord
+from MLbackend.src.utils import author_id_extractor
+
+# one NUL separated field per placeholder, -z ends every commit with another NUL
+LOG_FORMAT: str = "%x00".join(["%H", "%P", "%an", "%ae", "%at", "%ad", "%ct", "%cd", "%B"])
+LOG_FIELD_COUNT: int = 9
+LOG_READ_SIZE: int = 1 << 16
+
+SHA_SIZE: int = 20
+
+
+class CommitTable:
+    # the commit fields the analyses read, one array per field instead of one object per commit,
+    # slices and reorderings share the authors, parents and messages of the table they came from
+
+    def __init__(
+        self,
+        shas: np.ndarray,
+        parent_starts: np.ndarray,
+        parent_ends: np.ndarray,
+        parents: np.ndarray,
+        authors: List[git.Actor],
+        author_codes: np.ndarray,
+        authored_dates: np.ndarray,
+        author_tz_offsets: np.ndarray,
+        committed_dates: np.ndarray,
+        committer_tz_offsets: np.ndarray,
+        message_starts: np.ndarray,
+        message_ends: np.ndarray,
+        messages: bytes,
+    ) -> None:
+        self.shas: np.ndarray = shas
+        self.parent_starts: np.ndarray = parent_starts
+        self.parent_ends: np.ndarray = parent_ends
+        self.parents: np.ndarray = parents
+        self.authors: List[git.Actor] = authors
+        self.author_codes: np.ndarray = author_codes
+        self.authored_dates: np.ndarray = authored_dates
+        self.author_tz_offsets: np.ndarray = author_tz_offsets
+        self.committed_dates: np.ndarray = committed_dates
+        self.committer_tz_offsets: np.ndarray = committer_tz_offsets
+        self.message_starts: np.ndarray = message_starts
+        self.message_ends: np.ndarray = message_ends
+        self.messages: bytes = messages
+
+    def __len__(self) -> int:
+        return len(self.shas)
+
+    def __iter__(self) -> Iterator[CommitRecord]:
+        for idx in range(len(self)):
+            yield self.record(idx)
+
+    def __getitem__(self, key: Union[slice, np.ndarray]) -> "CommitTable":
+        return self.take(key)
+
+    def take(self, key: Union[slice, np.ndarray]) -> "CommitTable":
+        return CommitTable(
+            self.shas[key],
+            self.parent_starts[key],
+            self.parent_ends[key],
+            self.parents,
+            self.authors,
+            self.author_codes[key],
+            self.authored_dates[key],
+            self.author_tz_offsets[key],
+            self.committed_dates[key],
+            self.committer_tz_offsets[key],
+            self.message_starts[key],
+            self.message_ends[key],
+            self.messages,
+        )
+
+    def with_authors(self, authors: List[git.Actor]) -> "CommitTable":
+        table = self.take(slice(None))
+        table.authors = authors
+        return table
+
+    def sorted_by_commit_date(self) -> "CommitTable":
+        # most consumers want ascending commit dates, only reorder when the table isn't already
+        if np.all(self.committed_dates[1:] >= self.committed_dates[:-1]):
+            return self
+
+        return self.take(np.argsort(self.committed_dates, kind="stable"))
+
+    def hexsha(self, idx: int) -> str:
+        return self.shas[idx].tobytes().hex()
+
+    def hexshas(self) -> List[str]:
+        return [sha.tobytes().hex() for sha in self.shas]
+
+    def parent_hexshas(self, idx: int) -> List[str]:
+        return [
+            sha.tobytes().hex()
+            for sha in self.parents[self.parent_starts[idx] : self.parent_ends[idx]]
+        ]
+
+    def message(self, idx: int) -> str:
+        return self.messages[self.message_starts[idx] : self.message_ends[idx]].decode(
+            "utf-8", errors="replace"
+        )
+
+    def author_ids(self) -> List[str]:
+        ids = [author_id_extractor(author) for author in self.authors]
+        return [ids[code] for code in self.author_codes]
+
+    def record(self, idx: int) -> CommitRecord:
+        author = self.authors[self.author_codes[idx]]
+        return CommitRecord(
+            self.hexsha(idx),
+            author.name,
+            author.email,
+            int(self.authored_dates[idx]),
+            int(self.author_tz_offsets[idx]),
+            int(self.committed_dates[idx]),
+            int(self.committer_tz_offsets[idx]),
+            self.message(idx),
+        )
+
+    def parent_indices(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # parents outside of the table, e.g. beyond a shallow boundary, are left out
+        rows = {sha.tobytes(): idx for idx, sha in enumerate(self.shas)}
+        starts = array("q")
+        ends = array("q")
+        indices = array("q")
+        for idx in range(len(self)):
+            starts.append(len(indices))
+            for sha in self.parents[self.parent_starts[idx] : self.parent_ends[idx]]:
+                parent_idx = rows.get(sha.tobytes())
+                if parent_idx is not None:
+                    indices.append(parent_idx)
+            ends.append(len(indices))
+
+        return (
+            np.frombuffer(starts, dtype=np.int64),
+            np.frombuffer(ends, dtype=np.int64),
+            np.frombuffer(indices, dtype=np.int64),
+        )
+
+    def to_rows(self) -> List[List[Any]]:
+        return [
+            [self.hexsha(idx), self.parent_hexshas(idx)] + self.record(idx).to_row()[1:]
+            for idx in range(len(self))
+        ]
+
+    @classmethod
+    def of(cls, commits: Union["CommitTable", Sequence[CommitRecord]]) -> "CommitTable":
+        # analyses take a table or records loaded elsewhere, e.g. by tests and benchmarks
+        if isinstance(commits, CommitTable):
+            return commits
+
+        return cls.from_records(commits)
+
+    @classmethod
+    def from_rows(cls, rows: List[List[Any]]) -> "CommitTable":
+        builder = CommitTableBuilder()
+        for hexsha, parents, *fields in rows:
+            builder.append(hexsha, parents, *fields)
+        return builder.build()
+
+    @classmethod
+    def from_records(cls, records: Sequence[CommitRecord]) -> "CommitTable":
+        builder = CommitTableBuilder()
+        for record in records:
+            builder.append(record.hexsha, [], *record.to_row()[1:])
+        return builder.build()
+
+    @classmethod
+    def concat(cls, tables: List["CommitTable"]) -> "CommitTable":
+        authors: List[git.Actor] = []
+        author_lookup: Dict[Tuple[str, str], int] = {}
+        author_codes = []
+        parent_starts = []
+        parent_ends = []
+        message_starts = []
+        message_ends = []
+        parent_count = 0
+        message_size = 0
+        for table in tables:
+            # every table brings its own authors, parents and messages, so remap and offset them
+            codes = []
+            for author in table.authors:
+                code = author_lookup.setdefault((author.name, author.email), len(authors))
+                if code == len(authors):
+                    authors.append(git.Actor(author.name, author.email))
+                codes.append(code)
+            author_codes.append(np.array(codes, dtype=np.int32)[table.author_codes])
+
+            parent_starts.append(table.parent_starts + parent_count)
+            parent_ends.append(table.parent_ends + parent_count)
+            message_starts.append(table.message_starts + message_size)
+            message_ends.append(table.message_ends + message_size)
+            parent_count += len(table.parents)
+            message_size += len(table.messages)
+
+        return CommitTable(
+            np.concatenate([table.shas for table in tables]),
+            np.concatenate(parent_starts),
+            np.concatenate(parent_ends),
+            np.concatenate([table.parents for table in tables]),
+            authors,
+            np.concatenate(author_codes),
+            np.concatenate([table.authored_dates for table in tables]),
+            np.concatenate([table.author_tz_offsets for table in tables]),
+            np.concatenate([table.committed_dates for table in tables]),
+            np.concatenate([table.committer_tz_offsets for table in tables]),
+            np.concatenate(message_starts),
+            np.concatenate(message_ends),
+            b"".join(table.messages for table in tables),
+        )
+
+
+class CommitTableBuilder:
+    # collects a table row by row into flat buffers, nothing per commit survives besides the bytes
+
+    def __init__(self) -> None:
+        self.shas: bytearray = bytearray()
+        self.parent_offsets: array = array("q", [0])
+        self.parents: bytearray = bytearray()
+        self.authors: List[git.Actor] = []
+        self.author_lookup: Dict[Tuple[str, str], int] = {}
+        self.author_codes: array = array("i")
+        self.authored_dates: array = array("q")
+        self.author_tz_offsets: array = array("i")
+        self.committed_dates: array = array("q")
+        self.committer_tz_offsets: array = array("i")
+        self.message_offsets: array = array("q", [0])
+        self.messages: bytearray = bytearray()
+
+    def append(
+        self,
+        hexsha: str,
+        parents: List[str],
+        author_name: str,
+        author_email: str,
+        authored_date: int,
+        author_tz_offset: int,
+        committed_date: int,
+        committer_tz_offset: int,
+        message: Union[str, bytes],
+    ) -> None:
+        self.shas += bytes.fromhex(hexsha)
+        for parent in parents:
+            self.parents += bytes.fromhex(parent)
+        self.parent_offsets.append(len(self.parents) // SHA_SIZE)
+
+        code = self.author_lookup.get((author_name, author_email))
+        if code is None:
+            code = len(self.authors)
+            self.author_lookup[(author_name, author_email)] = code
+            self.authors.append(git.Actor(author_name, author_email))
+        self.author_codes.append(code)
+
+        self.authored_dates.append(authored_date)
+        self.author_tz_offsets.append(author_tz_offset)
+        self.committed_dates.append(committed_date)
+        self.committer_tz_offsets.append(committer_tz_offset)
+
+        self.messages += message.encode("utf-8") if isinstance(message, str) else message
+        self.message_offsets.append(len(self.messages))
+        return None
+
+    def append_log_fields(self, fields: List[bytes]) -> None:
+        (
+            hexsha,
+            parents,
+            author_name,
+            author_email,
+            authored_date,
+            author_tz,
+            committed_date,
+            committer_tz,
+            message,
+        ) = fields
+        return self.append(
+            hexsha.decode("ascii"),
+            parents.decode("ascii").split(),
+            author_name.decode("utf-8", errors="replace"),
+            author_email.decode("utf-8", errors="replace"),
+            int(authored_date),
+            utctz_to_altz(author_tz.decode("ascii")),
+            int(committed_date),
+            utctz_to_altz(committer_tz.decode("ascii")),
+            message,
+        )
+
+    def build(self) -> CommitTable:
+        parent_offsets = np.frombuffer(self.parent_offsets, dtype=np.int64)
+        message_offsets = np.frombuffer(self.message_offsets, dtype=np.int64)
+        return CommitTable(
+            np.frombuffer(bytes(self.shas), dtype=np.uint8).reshape(-1, SHA_SIZE),
+            parent_offsets[:-1],
+            parent_offsets[1:],
+            np.frombuffer(bytes(self.parents), dtype=np.uint8).reshape(-1, SHA_SIZE),
+            self.authors,
+            np.frombuffer(self.author_codes, dtype=np.int32),
+            np.frombuffer(self.authored_dates, dtype=np.int64),
+            np.frombuffer(self.author_tz_offsets, dtype=np.int32),
+            np.frombuffer(self.committed_dates, dtype=np.int64),
+            np.frombuffer(self.committer_tz_offsets, dtype=np.int32),
+            message_offsets[:-1],
+            message_offsets[1:],
+            bytes(self.messages),
+        )
+
+
+def read_commit_log(
+    repo: git.Repo, rev: Optional[str] = None, since: Optional[datetime] = None
+) -> CommitTable:
+    # a single git log stream instead of one lazily loaded object per commit,
+    # with a start date git stops walking once it reaches older commits
+    args = [] if rev is None else [rev]
+    if since is not None:
+        args.append(f"--since={since.isoformat()}")
+    process = repo.git.log(*args, format=LOG_FORMAT, z=True, date="format:%z", as_process=True)
+
+    builder = CommitTableBuilder()
+    fields: List[bytes] = []
+    pending = b""
+    for chunk in iter(lambda: process.proc.stdout.read(LOG_READ_SIZE), b""):
+        tokens = (pending + chunk).split(b"\x00")
+        pending = tokens.pop()
+        for token in tokens:
+            fields.append(token)
+            if len(fields) == LOG_FIELD_COUNT:
+                builder.append_log_fields(fields)
+                fields = []
+
+    if len(fields) == LOG_FIELD_COUNT - 1:
+        builder.append_log_fields(fields + [pending])
+    process.wait()
+
+    return builder.build()
@@ -1,6 +1,15 @@
 import argparse
 import os
-from typing import Sequence
+from datetime import datetime, timezone
+from typing import Optional, Sequence
+
+from dateutil.relativedelta import relativedelta
+
+from MLbackend.config import PERSPECTIVE_MODEL_VERSION, PERSPECTIVE_URL
+from MLbackend.src.batch_outputs import BatchOutputs
+from MLbackend.src.graph_metrics import GraphMetricsCache
+from MLbackend.src.metrics_store import MetricsStore
+from MLbackend.src.toxicity_backend import PERSPECTIVE, create_toxicity_backend
 
 
 class Configuration:
@@ -14,6 +23,18 @@ class Configuration:
         pat: str,
         google_key: str,
         start_date: str,
+        run_id: Optional[str] = None,
+        centrality_mode: str = "auto",
+        centrality_exact_node_limit: int = 1000,
+        centrality_pivots: int = 256,
+        centrality_workers: int = 1,
+        window_months: Optional[int] = None,
+        perspective_url: str = PERSPECTIVE_URL,
+        perspective_qps: float = 1,
+        perspective_concurrency: int = 4,
+        perspective_model_version: str = PERSPECTIVE_MODEL_VERSION,
+        perspective_offline: bool = False,
+        toxicity_backend: str = PERSPECTIVE,
     ):
         self.repository_url = repository_url
         self.batch_months = batch_months
@@ -23,6 +44,42 @@ class Configuration:
         self.pat = pat
         self.google_key = google_key
         self.start_date = start_date
+        self.window_months = window_months
+
+        # a trailing window analyses the last months up to today
+        if self.start_date is None and self.window_months is not None:
+            window_start = datetime.now(timezone.utc) - relativedelta(months=self.window_months)
+            self.start_date = window_start.strftime("%Y-%m-%d")
+        self.run_id = run_id
+        self.centrality_mode = centrality_mode
+        self.centrality_exact_node_limit = centrality_exact_node_limit
+        self.centrality_pivots = centrality_pivots
+        self.centrality_workers = centrality_workers
+
+        # graphs and their metrics are shared by every analysis of this run
+        self.graph_metrics = GraphMetricsCache(
+            centrality_mode, centrality_exact_node_limit, centrality_pivots, centrality_workers
+        )
+
+        # every analysis writes its batch results here, they are exported once at the end
+        self.metrics = MetricsStore()
+
+        # per-batch outputs of the analyses, unchanged batches are restored instead of recomputed
+        self.batch_outputs = BatchOutputs()
+
+        # toxicity scores of PR and issue comments are shared by every batch of this run
+        self.toxicity_backend = toxicity_backend
+        self.perspective_model_version = perspective_model_version
+        self.perspective_offline = perspective_offline
+        self.toxicity = create_toxicity_backend(
+            toxicity_backend,
+            perspective_url,
+            google_key,
+            perspective_qps,
+            perspective_concurrency,
+            perspective_model_version,
+            perspective_offline,
+        )
 
         # parse repo name into owner and project name
         split = self.repository_url.split("/")
@@ -32,8 +89,16 @@ class Configuration:
         # build repo path
         self.repository_path = os.path.join(self.output_path, split[3], split[4])
 
-        # build results path
+        # build results path, runs with an id get their own folder so they can't clash
         self.results_path = os.path.join(self.repository_path, "results")
+        if self.run_id is not None:
+            self.results_path = os.path.join(self.results_path, self.run_id)
 
         # build metrics path
-        self.metricsPath = os.path.join(self.results_path, "metrics")
\ No newline at end of file
+        self.metricsPath = os.path.join(self.results_path, "metrics")
+
+    def start_datetime(self) -> Optional[datetime]:
+        # commits before midnight UTC of the start date are left out of the analysis
+        if self.start_date is None:
+            return None
+        return datetime.strptime(self.start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
\ No newline at end of file
@@ -1,5 +1,3 @@
-import csv
-import os
 from logging import Logger
 
 from MLbackend.src.configuration import Configuration
@@ -54,14 +52,10 @@ def dev_analysis(
     experienced_tfc = experienced_commit_count / commit_count * 100
 
     logger.info("Writing developer analysis results")
-    with open(
-        os.path.join(config.results_path, f"results_{batch_idx}.csv"), "a", newline=""
-    ) as f:
-        w = csv.writer(f, delimiter=",")
-        w.writerow(["NumberActiveExperiencedDevs", number_active_experienced_devs])
-        w.writerow(["BusFactorNumber", bus_factor])
-        w.writerow(["SponsoredTFC", sponsored_tfc])
-        w.writerow(["ExperiencedTFC", experienced_tfc])
+    config.metrics.set(batch_idx, "NumberActiveExperiencedDevs", number_active_experienced_devs)
+    config.metrics.set(batch_idx, "BusFactorNumber", bus_factor)
+    config.metrics.set(batch_idx, "SponsoredTFC", sponsored_tfc)
+    config.metrics.set(batch_idx, "ExperiencedTFC", experienced_tfc)
 
     meta_res = [
         ["Metric", "Value"],
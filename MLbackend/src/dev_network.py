@@ -2,12 +2,12 @@ import os
 import shutil
 import stat
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
 from pathlib import Path
 from typing import Any, List, Optional
 
 import pandas as pd
-import sentistrength
 from dateutil.relativedelta import relativedelta
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
@@ -15,16 +15,34 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
 
 import MLbackend.src.centrality_analysis as centrality
-from MLbackend.src.alias_worker import replace_aliases
-from MLbackend.src.commit_analysis import commit_analysis
+import MLbackend.src.graphql_analysis.graphql_analysis_helper as gql
+from MLbackend.config import (CENTRALITY_EXACT_NODE_LIMIT, CENTRALITY_MODE,
+                              CENTRALITY_PIVOTS, CENTRALITY_WORKERS,
+                              METRICS_EXPORT_FORMATS, PERSPECTIVE_CONCURRENCY,
+                              PERSPECTIVE_MODEL_VERSION, PERSPECTIVE_OFFLINE,
+                              PERSPECTIVE_QPS, PERSPECTIVE_URL,
+                              TOXICITY_BACKEND)
+from MLbackend.src.alias_worker import replace_table_aliases
+from MLbackend.src.analysis_state import (AnalysisState,
+                                          compute_batch_fingerprints,
+                                          describe_inputs)
+from MLbackend.src.commit_analysis import commit_analysis, split_commit_batches
 from MLbackend.src.configuration import Configuration
 from MLbackend.src.dev_analysis import dev_analysis
-from MLbackend.src.graphql_analysis.issue_analysis import issue_analysis
-from MLbackend.src.graphql_analysis.pr_analysis import pr_analysis
-from MLbackend.src.graphql_analysis.release_analysis import release_analysis
+from MLbackend.src.graphql_analysis.issue_analysis import (fetch_issue_nodes,
+                                                           issue_analysis)
+from MLbackend.src.graphql_analysis.pr_analysis import (fetch_pr_nodes,
+                                                        pr_analysis)
+from MLbackend.src.graphql_analysis.release_analysis import (
+    fetch_release_nodes, release_analysis)
 from MLbackend.src.pdf_generation import generate_pdf
+from MLbackend.src.perspective_client import (TOXICITY_CACHE_MAX_ENTRIES,
+                                              PerspectiveClient)
 from MLbackend.src.politeness_analysis import politeness_analysis
-from MLbackend.src.repo_loader import get_repo
+from MLbackend.src.repo_loader import close_repo, get_repo
+from MLbackend.src.score_cache import ScoreCache
+from MLbackend.src.senti_server import (SENTIMENT_CACHE_MAX_ENTRIES,
+                                        CachedSentiStrength, get_senti_server)
 from MLbackend.src.smell_detection import smell_detection
 from MLbackend.src.tag_analysis import tag_analysis
 from MLbackend.src.utils.result import Result
@@ -40,6 +58,8 @@ def community_smells_detector(
     google_api_key: Optional[str] = None,
     batch_months: float = 9999,
     start_date: Optional[str] = None,
+    run_id: Optional[str] = None,
+    window_months: Optional[int] = None,
 ) -> None:  # Specify the return type
 
     pdf_results = {}
@@ -54,6 +74,18 @@ def community_smells_detector(
             pat=pat,
             google_key=google_api_key,
             start_date=start_date,
+            run_id=run_id,
+            window_months=window_months,
+            centrality_mode=CENTRALITY_MODE,
+            centrality_exact_node_limit=CENTRALITY_EXACT_NODE_LIMIT,
+            centrality_pivots=CENTRALITY_PIVOTS,
+            centrality_workers=CENTRALITY_WORKERS,
+            perspective_url=PERSPECTIVE_URL,
+            perspective_qps=PERSPECTIVE_QPS,
+            perspective_concurrency=PERSPECTIVE_CONCURRENCY,
+            perspective_model_version=PERSPECTIVE_MODEL_VERSION,
+            perspective_offline=PERSPECTIVE_OFFLINE,
+            toxicity_backend=TOXICITY_BACKEND,
         )
 
         logger.info(f"Received a new request for {repo_url}.")
@@ -65,7 +97,9 @@ def community_smells_detector(
         logger.debug(f"Max Distance: {0}")
         logger.debug(f"PAT: {pat}")
         logger.debug(f"Google Key: {google_api_key}")
-        logger.debug(f"Start Date: {start_date}")
+        logger.debug(f"Start Date: {config.start_date}")
+        logger.debug(f"Window: {window_months} months")
+        logger.debug(f"Run ID: {run_id}")
 
         # Prepare folders
         if os.path.exists(config.results_path):
@@ -76,21 +110,88 @@ def community_smells_detector(
         # Get repository reference
         repo = get_repo(config, logger)
 
-        # Setup sentiment analysis
-        senti = sentistrength.PySentiStr()
-        senti.setSentiStrengthPath(
-            os.path.join(config.senti_strength_path, "SentiStrength.jar")
+        # Load what the previous analysis of this repository left behind
+        state = AnalysisState(
+            os.path.join(config.repository_path, "analysis_state"), logger
         )
-        senti.setSentiStrengthLanguageFolderPath(
-            os.path.join(config.senti_strength_path, "SentiStrength_Data")
+
+        # Setup sentiment analysis, the process is reused across runs and scores are cached
+        senti = CachedSentiStrength(
+            get_senti_server(config.senti_strength_path),
+            ScoreCache(
+                os.path.join(config.output_path, "cache", "sentiment.db"),
+                SENTIMENT_CACHE_MAX_ENTRIES,
+            ),
         )
 
+        # Toxicity scores are cached across runs too, so re-analyses don't spend the API quota again
+        if isinstance(config.toxicity, PerspectiveClient):
+            config.toxicity.cache = ScoreCache(
+                os.path.join(config.output_path, "cache", "toxicity.db"),
+                TOXICITY_CACHE_MAX_ENTRIES,
+            )
+
         # Prepare batch delta
         delta = relativedelta(months=+config.batch_months)
 
-        # Handle aliases
-        commits = list(replace_aliases(repo.iter_commits(), config, logger))
-        
+        # Fetch PRs, issues and releases side by side while the commits are walked,
+        # only PRs and issues updated since the previous analysis are requested
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            pr_future = executor.submit(
+                fetch_pr_nodes,
+                config.pat,
+                config.repository_owner,
+                config.repository_name,
+                logger,
+                state.updated_at["pullRequests"],
+            )
+            issue_future = executor.submit(
+                fetch_issue_nodes,
+                config.pat,
+                config.repository_owner,
+                config.repository_name,
+                logger,
+                state.updated_at["issues"],
+            )
+            release_future = executor.submit(fetch_release_nodes, config, logger)
+
+            # Walk only the commits added since the previous analysis, then handle aliases
+            commits = replace_table_aliases(
+                state.load_commits(repo, config.start_datetime()), config, logger
+            ).sorted_by_commit_date()
+
+            pr_nodes = state.merge_nodes("pullRequests", pr_future.result())
+            issue_nodes = state.merge_nodes("issues", issue_future.result())
+            release_nodes = release_future.result()
+
+        gql.get_client().log_timings(logger)
+
+        # Reuse the previous results when no batch changed
+        commit_batches, commit_batch_dates = split_commit_batches(commits, delta, config)
+        fingerprints = compute_batch_fingerprints(
+            commit_batches,
+            commit_batch_dates,
+            delta,
+            dict(pullRequests=pr_nodes, issues=issue_nodes),
+            describe_inputs(repo, config),
+        )
+        pdf_file_path = os.path.join(".", config.results_path, "smell_report.pdf")
+        if state.can_reuse(fingerprints):
+            logger.info("Nothing changed since the previous analysis, reusing its results.")
+            state.restore_result(result, pdf_file_path)
+            state.save()
+            return None
+
+        # Restore the batches that didn't change, only the others are analysed again
+        reused_batches = state.reusable_batches(fingerprints)
+        if len(reused_batches) > 0:
+            state.restore_batches(config.batch_outputs, reused_batches)
+            for batch_idx in reused_batches:
+                for name, value in config.batch_outputs.get(batch_idx, "metrics").items():
+                    config.metrics.set(batch_idx, name, value)
+
+        logger.info(f"Batches changed since the previous analysis: {state.changed_batches(fingerprints)}")
+        logger.info(f"Batches reused from the previous analysis: {reused_batches}")
 
         # Run analysis
         batch_dates, author_info_dict, days_active, results_meta, results_metrics = (
@@ -99,13 +200,15 @@ def community_smells_detector(
         pdf_results["Commit Analysis"] = [results_meta, results_metrics]
 
 
-        tag_res = tag_analysis(repo, delta, batch_dates, days_active, config, logger)
+        tag_res = tag_analysis(repo, commits, delta, batch_dates, days_active, config, logger)
 
         core_devs: List[List[Any]] = centrality.centrality_analysis(
             commits, delta, batch_dates, config, logger, result
         )
 
-        release_res = release_analysis(commits, config, delta, batch_dates, logger)
+        release_res = release_analysis(
+            commits, config, delta, batch_dates, logger, release_nodes
+        )
 
         (
             pr_participant_batches,
@@ -120,7 +223,8 @@ def community_smells_detector(
             delta,
             batch_dates,
             logger,
-            None
+            None,
+            pr_nodes,
         )
         pdf_results["PR Analysis"] = [results_meta2, results_metrics2]
         pdf_results["PR Comment Analysis"] = [results_meta3, results_metric3]
@@ -138,7 +242,8 @@ def community_smells_detector(
             delta,
             batch_dates,
             logger,
-            None
+            None,
+            issue_nodes,
         )
 
         pdf_results["Issue Analysis"] = [results_meta4, results_metrics4]
@@ -154,20 +259,19 @@ def community_smells_detector(
         metrics_cent = []
 
         for batch_idx, batch_date in enumerate(batch_dates):
-            # Get combined author lists
-            combined_authors_in_batch = (
-                pr_participant_batches[batch_idx] + issue_participant_batches[batch_idx]
-            )
-
-            # Build combined network
-            authors, meta, metric = centrality.build_grapql_network(
-                batch_idx,
-                combined_authors_in_batch,
-                "issuesAndPRsCentrality",
-                config,
-                logger,
-                None,
-            )
+            # Build combined network from the PR and issue networks
+            if config.batch_outputs.is_reused(batch_idx):
+                meta, metric = config.batch_outputs.get(batch_idx, "issuesAndPRsCentrality")
+            else:
+                authors, meta, metric = centrality.combine_grapql_networks(
+                    batch_idx,
+                    ["PRs", "Issues"],
+                    "issuesAndPRsCentrality",
+                    config,
+                    logger,
+                    None,
+                )
+                config.batch_outputs.put(batch_idx, "issuesAndPRsCentrality", (meta, metric))
             meta_cent.append(meta)
             metrics_cent.append(metric)
 
@@ -198,17 +302,30 @@ def community_smells_detector(
             )
             dev_res.append(meta_res)
 
-            smell_results = smell_detection(config, batch_idx, logger, result)
-            pdf_results["IssuesAndPRsCentrality Analysis"] = [meta_cent[0],metrics_cent[0]]
-            pdf_results["Dev Analysis"] =  dev_res
-            result.set_pdf_file_path(
-                pdf_file_path=os.path.join(".", config.results_path, "smell_report.pdf")
-            )
-            generate_pdf(
-                pdf_results=pdf_results,
-                smells_det=smell_results["smell_results"][1:],
-                pdf_file_path=result.pdf_file_path,
-            )
+        # every batch's metrics are complete, predict all of them in one go
+        smell_results = smell_detection(config, len(batch_dates), logger, result)
+        config.metrics.export(config.results_path, METRICS_EXPORT_FORMATS)
+
+        # Post-processing, the report covers all batches and is rendered once per run
+        pdf_results["IssuesAndPRsCentrality Analysis"] = [meta_cent[0],metrics_cent[0]]
+        pdf_results["Dev Analysis"] =  dev_res
+        result.set_pdf_file_path(pdf_file_path=pdf_file_path)
+        generate_pdf(
+            pdf_results=pdf_results,
+            smells_det=smell_results[-1]["smell_results"][1:],
+            pdf_file_path=result.pdf_file_path,
+        )
+
+        logger.info(
+            f"Sentiment cache hits: {senti.cache.hits}, misses: {senti.cache.misses}"
+        )
+
+        # Only a complete run moves the state forward, the final metrics of every batch
+        # are kept so an unchanged batch can be restored by the next analysis
+        for batch_idx in range(len(batch_dates)):
+            config.batch_outputs.put(batch_idx, "metrics", dict(config.metrics.get(batch_idx)))
+        state.store_result(result, fingerprints, config.batch_outputs)
+        state.save()
     except Exception as e:
 
         # Return the detailed error
@@ -218,9 +335,13 @@ def community_smells_detector(
             "traceback": traceback.format_exc(),
         }
     finally:
-        # Close repo to avoid resource leaks
-        if "repo" in locals():
-            del repo
+        # Let the next analysis of this repository use the state
+        if "state" in locals():
+            state.close()
+
+        # Close repo to avoid resource leaks, this also lets the cache evict it again
+        if "repo" in locals() and repo is not None:
+            close_repo(repo)
 
 
 
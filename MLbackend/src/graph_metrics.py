@@ -0,0 +1,108 @@
+from collections import Counter
+from logging import Logger
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import networkx as nx
+from networkx.algorithms.community import greedy_modularity_communities
+
+from MLbackend.src.centrality_engine import compute_centralities
+
+
+class GraphMetrics:
+
+    def __init__(
+        self,
+        G: nx.Graph,
+        author_items: Counter,
+        closeness: Dict[Any, float],
+        betweenness: Dict[Any, float],
+        centrality: Dict[Any, float],
+        density: float,
+        communities: List[Set[Any]],
+        centrality_mode: str,
+    ) -> None:
+        self.G: nx.Graph = G
+        self.author_items: Counter = author_items
+        self.closeness: Dict[Any, float] = closeness
+        self.betweenness: Dict[Any, float] = betweenness
+        self.centrality: Dict[Any, float] = centrality
+        self.density: float = density
+        self.communities: List[Set[Any]] = communities
+        self.centrality_mode: str = centrality_mode
+
+
+class GraphMetricsCache:
+
+    def __init__(
+        self, centrality_mode: str, exact_node_limit: int, pivots: int, workers: int
+    ) -> None:
+        self.centrality_mode: str = centrality_mode
+        self.exact_node_limit: int = exact_node_limit
+        self.pivots: int = pivots
+        self.workers: int = workers
+
+        # keyed by (batch index, graph kind), e.g. (0, "PRs")
+        self.graphs: Dict[Tuple[int, str], Tuple[nx.Graph, Counter]] = {}
+        self.metrics: Dict[Tuple[int, str], GraphMetrics] = {}
+
+    def add_graph(
+        self, batch_idx: int, kind: str, G: nx.Graph, author_items: Counter
+    ) -> None:
+        self.graphs[(batch_idx, kind)] = (G, author_items)
+        self.metrics.pop((batch_idx, kind), None)
+        return None
+
+    def compose(self, batch_idx: int, kind: str, kinds: List[str]) -> None:
+        # co-participation edges of the combined lists are exactly the union of each list's edges
+        G = nx.Graph()
+        author_items = Counter({})
+        for part_kind in kinds:
+            if (batch_idx, part_kind) not in self.graphs:
+                continue
+
+            part_G, part_author_items = self.graphs[(batch_idx, part_kind)]
+            G = nx.compose(G, part_G)
+            author_items.update(part_author_items)
+
+        return self.add_graph(batch_idx, kind, G, author_items)
+
+    def get(self, batch_idx: int, kind: str, logger: Logger) -> GraphMetrics:
+        metrics: Optional[GraphMetrics] = self.metrics.get((batch_idx, kind))
+        if metrics is None:
+            G, author_items = self.graphs[(batch_idx, kind)]
+            metrics = self.compute(G, author_items, kind, logger)
+            self.metrics[(batch_idx, kind)] = metrics
+
+        return metrics
+
+    def compute(
+        self, G: nx.Graph, author_items: Counter, kind: str, logger: Logger
+    ) -> GraphMetrics:
+        closeness, betweenness, centrality_mode = compute_centralities(
+            G,
+            self.centrality_mode,
+            self.exact_node_limit,
+            self.pivots,
+            self.workers,
+            logger,
+        )
+
+        try:
+            communities = [set(community) for community in greedy_modularity_communities(G)]
+        except ZeroDivisionError:
+            # not handled
+            logger.warning(
+                f"A zero division error occured while preparing graph for {kind}."
+            )
+            communities = []
+
+        return GraphMetrics(
+            G,
+            author_items,
+            closeness,
+            betweenness,
+            dict(nx.degree_centrality(G)),
+            nx.density(G),
+            communities,
+            centrality_mode,
+        )
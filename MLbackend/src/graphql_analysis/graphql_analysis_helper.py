@@ -1,9 +1,195 @@
+import hashlib
 import random
+import threading
 import time
 from logging import Logger
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from dateutil.parser import isoparse
 from requests import HTTPError
+from requests.adapters import HTTPAdapter
+
+GITHUB_GRAPHQL_URL: str = "https://api.github.com/graphql"
+
+# PRs, issues and releases are fetched side by side, one connection each
+CONNECTION_POOL_SIZE: int = 3
+MAX_RETRIES: int = 5
+BACKOFF_BASE_SECONDS: float = 1.0
+BACKOFF_MAX_SECONDS: float = 60.0
+
+# GitHub gave up on a query that took too long
+TIMEOUT_STATUS_CODES: Tuple[int, ...] = (502, 504)
+
+# added to every query so each response reports what is left of the hourly budget
+RATE_LIMIT_FIELDS: str = "rateLimit { cost remaining resetAt }"
+
+
+class GraphQLError(Exception):
+    """Raised when GitHub answers a query with errors and no data."""
+    pass
+
+
+class TokenBudget:
+    # what GitHub reported about the hourly budget of one PAT
+
+    def __init__(self) -> None:
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.last_cost: int = 1
+
+        # every stream using the PAT waits until this time once the budget is spent
+        # or GitHub asks us to slow down
+        self.resume_at: float = 0.0
+
+
+class GraphQLClient:
+
+    def __init__(
+        self,
+        url: str = GITHUB_GRAPHQL_URL,
+        pool_size: int = CONNECTION_POOL_SIZE,
+        max_retries: int = MAX_RETRIES,
+    ) -> None:
+        self.url: str = url
+        self.max_retries: int = max_retries
+
+        self.session: requests.Session = requests.Session()
+        self.session.mount(
+            "https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        )
+
+        self.timings: Dict[str, List[float]] = {}
+
+        # jobs of different users share the connections but not the budget of their PATs
+        self.budgets: Dict[str, TokenBudget] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def execute(
+        self,
+        pat: str,
+        query: str,
+        logger: Logger,
+        name: str = "query",
+        retry_timeouts: bool = True,
+    ) -> Any:
+        headers = {"Authorization": f"Bearer {pat}"}
+        query = add_rate_limit_fields(query)
+        budget = self.get_budget(pat)
+
+        for attempt in range(self.max_retries + 1):
+            self._wait(budget)
+
+            started_at = time.perf_counter()
+            response = self.session.post(self.url, json={"query": query}, headers=headers)
+            elapsed = time.perf_counter() - started_at
+
+            if response.status_code == 200:
+                data = get_response_data(response.json(), name, logger)
+                self._record(name, elapsed, data, budget, logger)
+                return data
+
+            wait_time = self._get_retry_wait(response, attempt, retry_timeouts)
+            if wait_time is None or attempt == self.max_retries:
+                break
+
+            logger.warning(
+                f"GraphQL {name} failed with code {response.status_code}, retrying in {wait_time:.1f} seconds."
+            )
+            self._pause(budget, wait_time)
+
+        logger.error(
+            f"Query execution failed with code {response.status_code}: {response.text}."
+        )
+
+        # Raising a more specific HTTPError with detailed information
+        raise HTTPError(
+            f"Query execution failed with code {response.status_code}: {response.text}",
+            response=response
+        )
+
+    def get_budget(self, pat: str) -> TokenBudget:
+        # keyed by a digest, so the PATs themselves aren't kept around
+        key = hashlib.sha256(pat.encode("utf-8")).hexdigest()
+        with self._lock:
+            return self.budgets.setdefault(key, TokenBudget())
+
+    def _record(
+        self, name: str, elapsed: float, data: Any, budget: TokenBudget, logger: Logger
+    ) -> None:
+        rate_limit = data.pop("rateLimit", None) if isinstance(data, dict) else None
+
+        with self._lock:
+            self.timings.setdefault(name, []).append(elapsed)
+            if rate_limit is not None:
+                budget.last_cost = max(1, rate_limit["cost"])
+                budget.remaining = rate_limit["remaining"]
+                budget.reset_at = isoparse(rate_limit["resetAt"]).timestamp()
+
+                # keep enough budget for the next request of every stream, otherwise wait for the reset
+                if budget.remaining < budget.last_cost * CONNECTION_POOL_SIZE:
+                    budget.resume_at = max(budget.resume_at, budget.reset_at)
+                    logger.warning(
+                        f"GraphQL budget is down to {budget.remaining}, pausing until {rate_limit['resetAt']}."
+                    )
+
+        logger.debug(
+            f"GraphQL {name} took {elapsed:.2f} seconds, cost {budget.last_cost}, {budget.remaining} remaining."
+        )
+        return None
+
+    def _get_retry_wait(
+        self, response: requests.Response, attempt: int, retry_timeouts: bool
+    ) -> Optional[float]:
+        # callers that can ask for less handle timeouts themselves, rate limits are still waited out
+        if not retry_timeouts and response.status_code in TIMEOUT_STATUS_CODES:
+            return None
+
+        rate_limit_wait = get_rate_limit_wait(response)
+        if rate_limit_wait > 0:
+            return rate_limit_wait
+
+        # secondary rate limits don't always send Retry-After, and 502s and 504s are GitHub timing out
+        if response.status_code in TIMEOUT_STATUS_CODES or (
+            response.status_code in (403, 429) and "secondary rate limit" in response.text.lower()
+        ):
+            return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+        return None
+
+    def _pause(self, budget: TokenBudget, wait_time: float) -> None:
+        with self._lock:
+            budget.resume_at = max(budget.resume_at, time.time() + wait_time)
+        return None
+
+    def _wait(self, budget: TokenBudget) -> None:
+        wait_time = budget.resume_at - time.time()
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return None
+
+    def log_timings(self, logger: Logger) -> None:
+        with self._lock:
+            for name, timings in self.timings.items():
+                logger.info(
+                    f"GraphQL {name}: {len(timings)} requests, {sum(timings):.2f} seconds in total, "
+                    f"{sum(timings) / len(timings):.2f} seconds on average."
+                )
+            self.timings = {}
+        return None
+
+
+_client: Optional[GraphQLClient] = None
+_client_lock: threading.Lock = threading.Lock()
+
+
+def get_client() -> GraphQLClient:
+    # one client per process so every stream shares the connection pool, budgets are kept per PAT
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GraphQLClient()
+        return _client
 
 
 def build_next_page_query(cursor: str):
@@ -12,28 +198,52 @@ def build_next_page_query(cursor: str):
     return ', after:"{0}"'.format(cursor)
 
 
-def run_graphql_request(pat: str, query: str, logger: Logger):
-    headers = {"Authorization": f"Bearer {pat}"}
+def add_rate_limit_fields(query: str) -> str:
+    if "rateLimit" in query:
+        return query
+
+    # the fields go next to the outermost selection
+    closing_brace = query.rindex("}")
+    return f"{query[:closing_brace]}    {RATE_LIMIT_FIELDS}\n{query[closing_brace:]}"
+
+
+def run_graphql_request(
+    pat: str,
+    query: str,
+    logger: Logger,
+    name: str = "query",
+    retry_timeouts: bool = True,
+):
+    return get_client().execute(pat, query, logger, name, retry_timeouts)
+
+
+def get_response_data(body: Dict[str, Any], name: str, logger: Logger) -> Any:
+    errors = body.get("errors") or []
+    messages = "; ".join(str(error.get("message", error)) for error in errors)
+    data = body.get("data")
+
+    if data is None:
+        logger.error(f"GraphQL {name} failed: {messages or 'no data returned'}.")
+        raise GraphQLError(f"GraphQL {name} failed: {messages or 'no data returned'}")
 
-    sleep_time = random.randint(0, 8)
-    time.sleep(sleep_time)
+    # partial results, e.g. a repository that doesn't exist, are left to the caller
+    if len(errors) > 0:
+        logger.warning(f"GraphQL {name} returned errors: {messages}.")
+    return data
 
-    request = requests.post(
-        "https://api.github.com/graphql", json={"query": query}, headers=headers
-    )
 
-    if request.status_code == 200:
-        return request.json()["data"]
+def get_rate_limit_wait(response: requests.Response) -> float:
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        return float(retry_after)
 
-    logger.error(
-        f"Query execution failed with code {request.status_code}: {request.text}."
-    )
+    # the budget is spent, nothing will succeed before the window resets
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        reset_at = response.headers.get("X-RateLimit-Reset")
+        if reset_at is not None:
+            return max(0.0, float(reset_at) - time.time())
 
-    # Raising a more specific HTTPError with detailed information
-    raise HTTPError(
-        f"Query execution failed with code {request.status_code}: {request.text}",
-        response=request
-    )
+    return 0.0
 
 
 def add_login(node, authors: list):
@@ -4,7 +4,6 @@ from datetime import datetime
 from logging import Logger
 from typing import Any, Dict, List, Optional
 
-import sentistrength
 from dateutil.parser import isoparse
 from dateutil.relativedelta import relativedelta
 
@@ -12,17 +11,19 @@ import MLbackend.src.centrality_analysis as centrality
 import MLbackend.src.graphql_analysis.graphql_analysis_helper as gql
 import MLbackend.src.stats_analysis as stats
 from MLbackend.src.configuration import Configuration
+from MLbackend.src.graphql_analysis.pagination import iter_entities
+from MLbackend.src.senti_server import CachedSentiStrength
 from MLbackend.src.utils import get_stats, get_comment_stats, create_analysis_batches
 from MLbackend.src.utils.result import Result
 
 def issue_analysis(
     config: Configuration,
-    senti: sentistrength.PySentiStr,
+    senti: CachedSentiStrength,
     delta: relativedelta,
     batch_dates: List[datetime],
     logger: Logger, 
-    result:Result | None
-
+    result:Result | None,
+    nodes: Optional[List[Dict[str, Any]]] = None,
 ):
 
     logger.info("Querying issue comments")
@@ -33,6 +34,7 @@ def issue_analysis(
         delta,
         batch_dates,
         logger,
+        nodes,
     )
 
     batch_participants = list()
@@ -43,6 +45,19 @@ def issue_analysis(
     results_metrics1 = []
 
     for batch_idx, batch in enumerate(batches):
+        if config.batch_outputs.is_reused(batch_idx):
+            # the batch didn't change since the previous analysis, its comments aren't needed again
+            participants, meta, metrics_data, meta1, metrics_data1 = config.batch_outputs.get(
+                batch_idx, "Issues"
+            )
+            batch_participants.append(participants)
+            batch_comments.append([])
+            results_meta.append(meta)
+            results_meta1.append(meta1)
+            results_metrics.append(metrics_data)
+            results_metrics1.append(metrics_data1)
+            continue
+
         generally_negative, issue_count, all_comments, participants, comment_lengths, issue_positive_comments, issue_negative_comments = get_stats(logger=logger, batch_idx=batch_idx, batch_participants=batch_participants, senti=senti, batch_comments=batch_comments, batch=batch, stat_type="Issue")
 
 
@@ -61,18 +76,12 @@ def issue_analysis(
         author, meta, metrics_data = centrality.build_grapql_network(batch_idx, participants, "Issues", config, logger, result)
 
         logger.info("Writing GraphQL analysis results")
-        with open(
-            os.path.join(config.results_path, f"results_{batch_idx}.csv"),
-            "a",
-            newline="",
-        ) as f:
-            w = csv.writer(f, delimiter=",")
-            w.writerow(["NumberIssues", len(batch)])
-            w.writerow(["NumberIssueComments", len(all_comments)])
-            w.writerow(["IssueCommentsPositive", comment_sentiments_positive])
-            w.writerow(["IssueCommentsNegative", comment_sentiments_negative])
-            w.writerow(["IssueCommentsNegativeRatio", generally_negative_ratio])
-            w.writerow(["IssueCommentsToxicityPercentage", toxicity_percentage])
+        config.metrics.set(batch_idx, "NumberIssues", len(batch))
+        config.metrics.set(batch_idx, "NumberIssueComments", len(all_comments))
+        config.metrics.set(batch_idx, "IssueCommentsPositive", comment_sentiments_positive)
+        config.metrics.set(batch_idx, "IssueCommentsNegative", comment_sentiments_negative)
+        config.metrics.set(batch_idx, "IssueCommentsNegativeRatio", generally_negative_ratio)
+        config.metrics.set(batch_idx, "IssueCommentsToxicityPercentage", toxicity_percentage)
 
         meta1 = [
             ["Metrics", "Issue"],
@@ -109,7 +118,7 @@ def issue_analysis(
             batch_idx,
             comment_lengths,
             "IssueCommentsLength",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -117,7 +126,7 @@ def issue_analysis(
             batch_idx,
             durations,
             "IssueDuration",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -125,7 +134,7 @@ def issue_analysis(
             batch_idx,
             [len(issue["comments"]) for issue in batch],
             "IssueCommentsCount",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -133,7 +142,7 @@ def issue_analysis(
             batch_idx,
             comment_sentiments,
             "IssueCommentSentiments",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -141,7 +150,7 @@ def issue_analysis(
             batch_idx,
             [len(set(issue["participants"])) for issue in batch],
             "IssueParticipantCount",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -149,7 +158,7 @@ def issue_analysis(
             batch_idx,
             issue_positive_comments,
             "IssueCountPositiveComments",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -157,11 +166,17 @@ def issue_analysis(
             batch_idx,
             issue_negative_comments,
             "IssueCountNegativeComments",
-            config.results_path,
+            config.metrics,
             logger,
         )
         metrics_data1 = [("Metric", "Count", "Mean", "Stdev")]
         metrics_data1.extend([issue_len, issue_dur, issue_com, sent, part, pos, neg])
+        config.batch_outputs.put(
+            batch_idx,
+            "Issues",
+            (batch_participants[batch_idx], meta, metrics_data, meta1, metrics_data1),
+        )
+
         results_meta.append(meta)
         results_meta1.append(meta1)
         results_metrics.append(metrics_data)
@@ -187,85 +202,99 @@ def issue_request(
     delta: relativedelta,
     batch_dates: List[datetime],
     logger: Logger,
+    nodes: Optional[List[Dict[str, Any]]] = None,
 ) -> list[list[dict[str, Any]]]:
 
-    query = build_issue_request_query(owner=owner, name=name, cursor=None)
+    # callers that keep earlier issues around pass them in instead of fetching everything
+    if nodes is None:
+        nodes = fetch_issue_nodes(pat, owner, name, logger)
 
     batches_pre: Dict[datetime, List[Dict[str, Any]]] = {
         date: [] for date in batch_dates
     }
     current_time: datetime = datetime.now(batch_dates[-1].tzinfo)
 
-    no_next_page: bool = False
+    # Add all nodes that are required
+    for node in nodes:
 
-    while not no_next_page:
+        created_at: datetime = isoparse(node["createdAt"])
+        closed_at: datetime = (
+            current_time if node["closedAt"] is None else isoparse(node["closedAt"])
+        )
 
-        # Get chunk of page
-        result = gql.run_graphql_request(pat=pat, query=query, logger=logger)
+        # Get all the authors
+        authors: List[str] = list()
+        for user_node in node["participants"]["nodes"]:
+            gql.add_login(node=user_node, authors=authors)
 
-        # Get all the nodes in the result
-        try:
-            nodes = result["repository"]["issues"]["nodes"]
-        except TypeError:
-            # There are no PRs in this repository
-            logger.error("There are no Issues for this repository")
-            break
-
-        # Add all nodes that are required
-        for node in nodes:
-
-            created_at: datetime = isoparse(node["createdAt"])
-            closed_at: datetime = (
-                current_time if node["closedAt"] is None else isoparse(node["closedAt"])
-            )
+        # Create the issue dictionary
+        issue: Dict[str, Any] = {
+            "number": node["number"],
+            "created_at": created_at,
+            "closed_at": closed_at,
+            "comments": [
+                comment["bodyText"] for comment in node["comments"]["nodes"]
+            ],
+            "participants": authors,
+        }
 
-            # Get all the authors
-            authors: List[str] = list()
-            for user_node in node["participants"]["nodes"]:
-                gql.add_login(node=user_node, authors=authors)
-
-            # Create the issue dictionary
-            issue: Dict[str, Any] = {
-                "number": node["number"],
-                "created_at": created_at,
-                "closed_at": closed_at,
-                "comments": [
-                    comment["bodyText"] for comment in node["comments"]["nodes"]
-                ],
-                "participants": authors,
-            }
-
-            batches_pre = create_analysis_batches(batches_pre=batches_pre, created_at=created_at, delta=delta, entity=issue, current_time=current_time)
-
-        # Check for next page
-        page_info = result["repository"]["issues"]["pageInfo"]
-        if not page_info["hasNextPage"]:
-            no_next_page = True
-        else:
-            cursor = page_info["endCursor"]
-            query = build_issue_request_query(owner=owner, name=name, cursor=cursor)
+        batches_pre = create_analysis_batches(batches_pre=batches_pre, created_at=created_at, delta=delta, entity=issue, current_time=current_time)
 
     return list(batches_pre.values())
 
 
-def build_issue_request_query(owner: str, name: str, cursor: str | None):
+def fetch_issue_nodes(
+    pat: str,
+    owner: str,
+    name: str,
+    logger: Logger,
+    since: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+
+    # only nodes updated after `since` are fetched, each with all of its participants and comments
+    return list(
+        iter_entities(
+            pat,
+            logger,
+            "issues",
+            "Issue",
+            lambda cursor, page_size: build_issue_request_query(
+                owner=owner, name=name, cursor=cursor, page_size=page_size
+            ),
+            "There are no Issues for this repository",
+            since,
+        )
+    )
+
+
+def build_issue_request_query(owner: str, name: str, cursor: str | None, page_size: int = 100):
     return """{{
         repository(owner: "{0}", name: "{1}") {{
-            issues(first: 100{2}) {{
+            issues(first: {3}, orderBy: {{field: UPDATED_AT, direction: DESC}}{2}) {{
                 pageInfo {{
                     hasNextPage
                     endCursor
                 }}
                 nodes {{
+                    id
                     number
                     createdAt
+                    updatedAt
                     closedAt
                     participants(first: 100) {{
+                        pageInfo {{
+                            endCursor
+                            hasNextPage
+                        }}
                         nodes {{
                             login
                         }}
                     }}
                     comments(first: 100) {{
+                        pageInfo {{
+                            endCursor
+                            hasNextPage
+                        }}
                         nodes {{
                             bodyText
                         }}
@@ -274,5 +303,5 @@ def build_issue_request_query(owner: str, name: str, cursor: str | None):
             }}
         }}
     }}""".format(
-        owner, name, gql.build_next_page_query(cursor)
+        owner, name, gql.build_next_page_query(cursor), page_size
     )
@@ -0,0 +1,172 @@
+import time
+from logging import Logger
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from requests import HTTPError
+
+import MLbackend.src.graphql_analysis.graphql_analysis_helper as gql
+
+MAX_PAGE_SIZE: int = 100
+MIN_PAGE_SIZE: int = 5
+
+# pages slower than this are halved, pages much faster are doubled again
+TARGET_PAGE_SECONDS: float = 10.0
+
+# how many follow-up connections are requested in one aliased query
+NESTED_BATCH_SIZE: int = 20
+
+# the nested connections that are followed past their first page and what to select on them
+NESTED_SELECTIONS: Dict[str, str] = {
+    "participants": "login",
+    "comments": "bodyText",
+}
+
+
+class PageSizer:
+
+    def __init__(self, max_size: int = MAX_PAGE_SIZE, min_size: int = MIN_PAGE_SIZE) -> None:
+        self.max_size: int = max_size
+        self.min_size: int = min_size
+        self.size: int = max_size
+
+    def can_shrink(self) -> bool:
+        return self.size > self.min_size
+
+    def shrink(self) -> None:
+        self.size = max(self.min_size, self.size // 2)
+
+    def record(self, elapsed: float) -> None:
+        # every top-level node carries its nested connections, so the cost grows with the page size
+        if elapsed > TARGET_PAGE_SECONDS:
+            self.shrink()
+        elif elapsed < TARGET_PAGE_SECONDS / 4:
+            self.size = min(self.max_size, self.size * 2)
+
+
+def iter_entities(
+    pat: str,
+    logger: Logger,
+    connection: str,
+    type_name: str,
+    build_query: Callable[[Optional[str], int], str],
+    missing_message: str,
+    since: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+
+    sizer = PageSizer()
+    cursor = None
+
+    while True:
+
+        # Get a chunk of page, timeouts are answered with a smaller page instead of a retry,
+        # rate limits are still waited out by the client
+        started_at = time.perf_counter()
+        try:
+            result = gql.run_graphql_request(
+                pat,
+                build_query(cursor, sizer.size),
+                logger,
+                connection,
+                retry_timeouts=not sizer.can_shrink(),
+            )
+        except HTTPError as e:
+            if is_timeout(e) and sizer.can_shrink():
+                sizer.shrink()
+                logger.warning(f"Fetching {connection} timed out, retrying with pages of {sizer.size}.")
+                continue
+            raise
+        sizer.record(time.perf_counter() - started_at)
+
+        # Get all the nodes in the result
+        try:
+            page = result["repository"][connection]
+        except TypeError:
+            logger.error(missing_message)
+            return
+
+        nodes = []
+        reached_since = False
+        for node in page["nodes"]:
+            # nodes come most recently updated first, the rest were fetched by an earlier run
+            if since is not None and node["updatedAt"] < since:
+                reached_since = True
+                break
+            nodes.append(node)
+
+        complete_nested_connections(pat, nodes, type_name, logger)
+        yield from nodes
+
+        # check for next page
+        if reached_since or not page["pageInfo"]["hasNextPage"]:
+            return
+
+        cursor = page["pageInfo"]["endCursor"]
+
+
+def complete_nested_connections(
+    pat: str, nodes: List[Dict[str, Any]], type_name: str, logger: Logger
+) -> None:
+    pending = [
+        (node, field)
+        for node in nodes
+        for field in NESTED_SELECTIONS
+        if has_next_page(node, field)
+    ]
+
+    while len(pending) > 0:
+        batch = pending[:NESTED_BATCH_SIZE]
+        pending = pending[NESTED_BATCH_SIZE:]
+
+        result = gql.run_graphql_request(
+            pat, build_nested_query(batch, type_name), logger, f"{type_name} threads"
+        )
+
+        for idx, (node, field) in enumerate(batch):
+            remote_node = result.get(f"n{idx}")
+            if remote_node is None:
+                # the entity was deleted in the meantime, keep what was fetched so far
+                node[field]["pageInfo"]["hasNextPage"] = False
+                continue
+
+            connection = remote_node[field]
+            node[field]["nodes"].extend(connection["nodes"])
+            node[field]["pageInfo"] = connection["pageInfo"]
+            if connection["pageInfo"]["hasNextPage"]:
+                pending.append((node, field))
+
+    return None
+
+
+def has_next_page(node: Dict[str, Any], field: str) -> bool:
+    return node.get(field, {}).get("pageInfo", {}).get("hasNextPage", False)
+
+
+def build_nested_query(batch: List[Tuple[Dict[str, Any], str]], type_name: str) -> str:
+    aliases = [
+        """n{0}: node(id: "{1}") {{
+            ... on {2} {{
+                {3}(first: 100, after: "{4}") {{
+                    pageInfo {{
+                        endCursor
+                        hasNextPage
+                    }}
+                    nodes {{
+                        {5}
+                    }}
+                }}
+            }}
+        }}""".format(
+            idx,
+            node["id"],
+            type_name,
+            field,
+            node[field]["pageInfo"]["endCursor"],
+            NESTED_SELECTIONS[field],
+        )
+        for idx, (node, field) in enumerate(batch)
+    ]
+    return "{{\n        {0}\n    }}".format("\n        ".join(aliases))
+
+
+def is_timeout(error: HTTPError) -> bool:
+    return error.response is not None and error.response.status_code in gql.TIMEOUT_STATUS_CODES
@@ -4,7 +4,6 @@ from datetime import datetime
 from logging import Logger
 from typing import Any, Dict, List, Optional
 
-import sentistrength
 from dateutil.parser import isoparse
 from dateutil.relativedelta import relativedelta
 
@@ -12,17 +11,20 @@ import MLbackend.src.centrality_analysis as centrality
 import MLbackend.src.graphql_analysis.graphql_analysis_helper as gql
 import MLbackend.src.stats_analysis as stats
 from MLbackend.src.configuration import Configuration
+from MLbackend.src.graphql_analysis.pagination import iter_entities
+from MLbackend.src.senti_server import CachedSentiStrength
 from MLbackend.src.utils import get_stats, get_comment_stats, create_analysis_batches
 from MLbackend.src.utils.result import Result
 
 
 def pr_analysis(
     config: Configuration,
-    senti: sentistrength.PySentiStr,
+    senti: CachedSentiStrength,
     delta: relativedelta,
     batch_dates: List[datetime],
     logger: Logger,
     result: Result | None,
+    nodes: Optional[List[Dict[str, Any]]] = None,
 ) -> tuple[
     list[Any], list[Any], Any, Any, list[list[str] | list[str | Any] | list[str | int] | list[str | float | int | Any]],
     list[tuple[str, str, str, str] | Any]]:
@@ -35,6 +37,7 @@ def pr_analysis(
         delta,
         batch_dates,
         logger,
+        nodes,
     )
 
     batch_participants = list()
@@ -45,6 +48,19 @@ def pr_analysis(
     results_metrics1 = []
 
     for batch_idx, batch in enumerate(batches):
+        if config.batch_outputs.is_reused(batch_idx):
+            # the batch didn't change since the previous analysis, its comments aren't needed again
+            participants, meta, metrics_data, meta1, metrics_data1 = config.batch_outputs.get(
+                batch_idx, "PRs"
+            )
+            batch_participants.append(participants)
+            batch_comments.append([])
+            results_meta.append(meta)
+            results_meta1.append(meta1)
+            results_metrics.append(metrics_data)
+            results_metrics1.append(metrics_data1)
+            continue
+
         generally_negative, pr_count, all_comments, participants, comment_lengths, pr_positive_comments, pr_negative_comments = get_stats(
             stat_type="PR", logger=logger, batch_idx=batch_idx, batch_participants=batch_participants, senti=senti, batch_comments=batch_comments, batch=batch)
 
@@ -62,18 +78,12 @@ def pr_analysis(
         author, meta, metrics_data = centrality.build_grapql_network(batch_idx, participants, "PRs", config, logger, result)
 
         logger.info("Writing results of PR analysis to CSVs.")
-        with open(
-            os.path.join(config.results_path, f"results_{batch_idx}.csv"),
-            "a",
-            newline="",
-        ) as f:
-            w = csv.writer(f, delimiter=",")
-            w.writerow(["NumberPRs", pr_count])
-            w.writerow(["NumberPRComments", len(all_comments)])
-            w.writerow(["PRCommentsPositive", comment_sentiments_positive])
-            w.writerow(["PRCommentsNegative", comment_sentiments_negative])
-            w.writerow(["PRCommentsNegativeRatio", generally_negative_ratio])
-            w.writerow(["PRCommentsToxicityPercentage", toxicity_percentage])
+        config.metrics.set(batch_idx, "NumberPRs", pr_count)
+        config.metrics.set(batch_idx, "NumberPRComments", len(all_comments))
+        config.metrics.set(batch_idx, "PRCommentsPositive", comment_sentiments_positive)
+        config.metrics.set(batch_idx, "PRCommentsNegative", comment_sentiments_negative)
+        config.metrics.set(batch_idx, "PRCommentsNegativeRatio", generally_negative_ratio)
+        config.metrics.set(batch_idx, "PRCommentsToxicityPercentage", toxicity_percentage)
 
         meta1 = [
             ["Metric", "Value"],
@@ -110,7 +120,7 @@ def pr_analysis(
             batch_idx,
             comment_lengths,
             "PRCommentsLength",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -118,7 +128,7 @@ def pr_analysis(
             batch_idx,
             durations,
             "PRDuration",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -126,7 +136,7 @@ def pr_analysis(
             batch_idx,
             [len(pr["comments"]) for pr in batch],
             "PRCommentsCount",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -134,7 +144,7 @@ def pr_analysis(
             batch_idx,
             [pr["commit_count"] for pr in batch],
             "PRCommitsCount",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -142,7 +152,7 @@ def pr_analysis(
             batch_idx,
             comment_sentiments,
             "PRCommentSentiments",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -150,7 +160,7 @@ def pr_analysis(
             batch_idx,
             [len(set(pr["participants"])) for pr in batch],
             "PRParticipantsCount",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -158,7 +168,7 @@ def pr_analysis(
             batch_idx,
             pr_positive_comments,
             "PRCountPositiveComments",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -166,7 +176,7 @@ def pr_analysis(
             batch_idx,
             pr_negative_comments,
             "PRCountNegativeComments",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -174,6 +184,11 @@ def pr_analysis(
         metrics_data1.extend(
             [len_com, pr_dur, pr_com_c, pr_com, pr_com_sent, pr_part, pr_pos, pr_neg]
         )
+        config.batch_outputs.put(
+            batch_idx,
+            "PRs",
+            (batch_participants[batch_idx], meta, metrics_data, meta1, metrics_data1),
+        )
 
         results_meta.append(meta)
         results_meta1.append(meta1)
@@ -197,79 +212,89 @@ def pr_request(
     delta: relativedelta,
     batch_dates: List[datetime],
     logger: Logger,
+    nodes: Optional[List[Dict[str, Any]]] = None,
 ) -> List[List[Dict[str, Any]]]:
 
-    query = build_pr_request_query(owner=owner, name=name, cursor=None)
+    # callers that keep earlier PRs around pass them in instead of fetching everything
+    if nodes is None:
+        nodes = fetch_pr_nodes(pat, owner, name, logger)
 
     # prepare batches
     batches_pre: Dict[datetime, List[Dict[str, Any]]] = {
         date: [] for date in batch_dates
     }
     current_time: datetime = datetime.now(batch_dates[-1].tzinfo)
-    no_next_page: bool = False
 
-    while not no_next_page:
+    # Add all nodes that are required
+    for node in nodes:
+        created_at = isoparse(node["createdAt"])
+        closed_at = (
+            current_time if node["closedAt"] is None else isoparse(node["closedAt"])
+        )
 
-        # Get a chunk of page
-        result = gql.run_graphql_request(pat, query, logger)
+        authors: List[str] = list()
+        for user_node in node["participants"]["nodes"]:
+            gql.add_login(node=user_node, authors=authors)
 
-        # Get all the nodes in the result
-        try:
-            nodes = result["repository"]["pullRequests"]["nodes"]
-        except TypeError:
-            # There are no PRs in this repository
-            logger.error("There are no PRs for this repository")
-            break
-
-        # Add all nodes that are required
-        for node in nodes:
-            created_at = isoparse(node["createdAt"])
-            closed_at = (
-                current_time if node["closedAt"] is None else isoparse(node["closedAt"])
-            )
+        pr: Dict[str, Any] = {
+            "number": node["number"],
+            "created_at": created_at,
+            "closed_at": closed_at,
+            "comments": [
+                comment["bodyText"] for comment in node["comments"]["nodes"]
+            ],
+            "commit_count": node["commits"]["totalCount"],
+            "participants": authors,
+        }
 
-            authors: List[str] = list()
-            for user_node in node["participants"]["nodes"]:
-                gql.add_login(node=user_node, authors=authors)
-
-            pr: Dict[str, Any] = {
-                "number": node["number"],
-                "created_at": created_at,
-                "closed_at": closed_at,
-                "comments": [
-                    comment["bodyText"] for comment in node["comments"]["nodes"]
-                ],
-                "commit_count": node["commits"]["totalCount"],
-                "participants": authors,
-            }
-
-            batches_pre = create_analysis_batches(batches_pre=batches_pre, created_at=created_at, delta=delta, entity=pr, current_time=current_time)
-
-        # check for next page
-        page_info = result["repository"]["pullRequests"]["pageInfo"]
-        if not page_info["hasNextPage"]:
-            # There is no next page to query
-            no_next_page = True
-        else:
-            cursor = page_info["endCursor"]
-            query = build_pr_request_query(owner=owner, name=name, cursor=cursor)
+        batches_pre = create_analysis_batches(batches_pre=batches_pre, created_at=created_at, delta=delta, entity=pr, current_time=current_time)
 
     return list(batches_pre.values())
 
 
-def build_pr_request_query(owner: str, name: str, cursor: str | None):
+def fetch_pr_nodes(
+    pat: str,
+    owner: str,
+    name: str,
+    logger: Logger,
+    since: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+
+    # only nodes updated after `since` are fetched, each with all of its participants and comments
+    return list(
+        iter_entities(
+            pat,
+            logger,
+            "pullRequests",
+            "PullRequest",
+            lambda cursor, page_size: build_pr_request_query(
+                owner=owner, name=name, cursor=cursor, page_size=page_size
+            ),
+            "There are no PRs for this repository",
+            since,
+        )
+    )
+
+
+def build_pr_request_query(owner: str, name: str, cursor: str | None, page_size: int = 100):
     return """{{
         repository(owner: "{0}", name: "{1}") {{
-            pullRequests(first:100{2}) {{
+            pullRequests(first:{3}, orderBy: {{field: UPDATED_AT, direction: DESC}}{2}) {{
                 pageInfo {{
                     endCursor
                     hasNextPage
                 }}
                 nodes {{
+                    id
                     number
                     createdAt
+                    updatedAt
                     closedAt
                     participants(first: 100) {{
+                        pageInfo {{
+                            endCursor
+                            hasNextPage
+                        }}
                         nodes {{
                             login
                         }}
@@ -278,6 +303,10 @@ def build_pr_request_query(owner: str, name: str, cursor: str | None):
                         totalCount
                     }}
                     comments(first: 100) {{
+                        pageInfo {{
+                            endCursor
+                            hasNextPage
+                        }}
                         nodes {{
                             bodyText
                         }}
@@ -287,5 +316,5 @@ def build_pr_request_query(owner: str, name: str, cursor: str | None):
         }}
     }}
     """.format(
-        owner, name, gql.build_next_page_query(cursor)
+        owner, name, gql.build_next_page_query(cursor), page_size
     )
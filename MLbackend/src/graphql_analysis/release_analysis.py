@@ -2,35 +2,41 @@ import csv
 import os
 from datetime import datetime
 from logging import Logger
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Optional, Union
 
-import git
+import numpy as np
 from dateutil.parser import isoparse
 from dateutil.relativedelta import relativedelta
 
 import MLbackend.src.graphql_analysis.graphql_analysis_helper as gql
 import MLbackend.src.stats_analysis as stats
+from MLbackend.src.commit_record import CommitRecord
+from MLbackend.src.commit_table import CommitTable
 from MLbackend.src.configuration import Configuration
 
 
 def release_analysis(
-    all_commits: List[git.Commit],
+    all_commits: Union[CommitTable, List[CommitRecord]],
     config: Configuration,
     delta: relativedelta,
     batch_dates: List[datetime],
     logger: Logger,
+    nodes: Optional[List[Dict[str, Any]]] = None,
 ) -> dict[Any, dict[str, int | Any]] | None:
 
     # sort commits by ascending commit date
-    all_commits.sort(key=lambda c: c.committed_datetime)
+    all_commits = CommitTable.of(all_commits).sorted_by_commit_date()
+    committed_dates = all_commits.committed_dates
 
     logger.info("Querying releases")
-    batches = release_request(config, delta, batch_dates, logger)
+    batches = release_request(config, delta, batch_dates, logger, nodes)
 
     if not batches:
         logger.warning("No batches found.")
         return  # Exit the function if no batches are found
 
+    # commits already counted for an earlier release are skipped
+    first_commit_idx = 0
     for batch_idx, batch in enumerate(batches):
 
         releases = batch["releases"]
@@ -38,38 +44,30 @@ def release_analysis(
         release_commits_count = {}
 
         for i, release in enumerate(releases):
-            release_commits = list()
             release_date = release["createdAt"]
 
             # try add author to set
             release_authors.add(release["author"])
 
-            if i == 0:
-
-                # this is the first release, get all commits prior to release created date
-                for commit in all_commits:
-                    if commit.committed_datetime < release_date:
-                        release_commits.append(commit)
-                    else:
-                        break
-
-            else:
-
-                # get in-between commit count
+            # the first release gets all commits prior to its created date,
+            # the others the commits in between them and the previous release
+            last_commit_idx = max(
+                first_commit_idx,
+                int(np.searchsorted(committed_dates, release_date.timestamp(), side="left")),
+            )
+            if i > 0 and first_commit_idx < len(all_commits):
                 prev_release_date = releases[i - 1]["createdAt"]
-                for commit in all_commits:
-                    if (
-                            prev_release_date <= commit.committed_datetime < release_date
-                    ):
-                        release_commits.append(commit)
-                    else:
-                        break
+                if committed_dates[first_commit_idx] < prev_release_date.timestamp():
+                    last_commit_idx = first_commit_idx
 
-            # remove all counted commits from list to improve iteration speed
-            all_commits = all_commits[len(release_commits) :]
+            release_commits = all_commits[first_commit_idx:last_commit_idx]
+            first_commit_idx = last_commit_idx
 
             # calculate authors per release
-            commit_authors = set(commit.author.email for commit in release_commits)
+            commit_authors = set(
+                release_commits.authors[code].email
+                for code in np.unique(release_commits.author_codes)
+            )
 
             # add results
             release_commits_count[release["name"]] = dict(
@@ -87,12 +85,8 @@ def release_analysis(
         }
 
         logger.info("Writing results for analysis of releases to CSVs.")
-        with open(
-            os.path.join(config.results_path, f"results_{batch_idx}.csv"), "a", newline=""
-        ) as f:
-            w = csv.writer(f, delimiter=",")
-            w.writerow(["NumberReleases", batch["releaseCount"]])
-            w.writerow(["NumberReleaseAuthors", len(release_authors)])
+        config.metrics.set(batch_idx, "NumberReleases", batch["releaseCount"])
+        config.metrics.set(batch_idx, "NumberReleaseAuthors", len(release_authors))
 
         with open(
             os.path.join(config.metricsPath, f"releases_{batch_idx}.csv"),
@@ -115,7 +109,7 @@ def release_analysis(
             batch_idx,
             [value["authorsCount"] for key, value in release_commits_count.items()],
             "ReleaseAuthorCount",
-            config.results_path,
+            config.metrics,
             logger,
         )
 
@@ -123,7 +117,7 @@ def release_analysis(
             batch_idx,
             [value["commitsCount"] for key, value in release_commits_count.items()],
             "ReleaseCommitCount",
-            config.results_path,
+            config.metrics,
             logger,
         )
         return release_commits_count
@@ -134,10 +128,11 @@ def release_request(
     delta: relativedelta,
     batch_dates: List[datetime],
     logger: Logger,
+    nodes: Optional[List[Dict[str, Any]]] = None,
 ):
-    query = build_release_request_query(
-        config.repository_owner, config.repository_name, None
-    )
+    # releases may already have been fetched alongside PRs and issues
+    if nodes is None:
+        nodes = fetch_release_nodes(config, logger)
 
     # prepare batches
     batches = []
@@ -145,45 +140,57 @@ def release_request(
     batch_start_date = None
     batch_end_date = None
 
+    # parse
+    for node in nodes:
+
+        created_at = isoparse(node["createdAt"])
+
+        if batch_end_date is None or (
+            created_at > batch_end_date and len(batches) < len(batch_dates) - 1
+        ):
+
+            if batch is not None:
+                batches.append(batch)
+
+            batch_start_date = batch_dates[len(batches)]
+            batch_end_date = batch_start_date + delta
+
+            batch = {"releaseCount": 0, "releases": []}
+
+        batch["releaseCount"] += 1
+        batch["releases"].append(
+            dict(
+                name=node["name"],
+                createdAt=created_at,
+                author=node["author"]["login"],
+            )
+        )
+
+    if batch is not None:
+        batches.append(batch)
+
+    return batches
+
+
+def fetch_release_nodes(config: Configuration, logger: Logger) -> List[Dict[str, Any]]:
+    query = build_release_request_query(
+        config.repository_owner, config.repository_name, None
+    )
+    nodes: List[Dict[str, Any]] = []
+
     while True:
 
         # get page of releases
-        result = gql.run_graphql_request(config.pat, query, logger)
+        result = gql.run_graphql_request(config.pat, query, logger, "releases")
 
         # extract nodes
         try:
-            nodes = result["repository"]["releases"]["nodes"]
+            nodes.extend(result["repository"]["releases"]["nodes"])
         except TypeError:
             # There are no releases present
             logger.error("There are no releases for this repository")
             break
 
-        # parse
-        for node in nodes:
-
-            created_at = isoparse(node["createdAt"])
-
-            if batch_end_date is None or (
-                created_at > batch_end_date and len(batches) < len(batch_dates) - 1
-            ):
-
-                if batch is not None:
-                    batches.append(batch)
-
-                batch_start_date = batch_dates[len(batches)]
-                batch_end_date = batch_start_date + delta
-
-                batch = {"releaseCount": 0, "releases": []}
-
-            batch["releaseCount"] += 1
-            batch["releases"].append(
-                dict(
-                    name=node["name"],
-                    createdAt=created_at,
-                    author=node["author"]["login"],
-                )
-            )
-
         # check for next page
         page_info = result["repository"]["releases"]["pageInfo"]
 
@@ -195,10 +202,7 @@ def release_request(
             config.repository_owner, config.repository_name, cursor
         )
 
-    if batch is not None:
-        batches.append(batch)
-
-    return batches
+    return nodes
 
 
 def build_release_request_query(owner: str, name: str, cursor: str):
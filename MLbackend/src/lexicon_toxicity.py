@@ -0,0 +1,65 @@
+import csv
+import os
+import time
+from logging import Logger
+from typing import Iterable, List, Optional
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+from MLbackend.src.model_registry import MODELS_PATH
+
+TOXICITY_LEXICON_PATH: str = os.path.join(MODELS_PATH, "toxicity_lexicon.csv")
+
+# a comment needs more than this much weight to score above 0.5, one strong insult is enough,
+# a single mild word ("stupid bug", "this sucks") is not
+LEXICON_BIAS: float = 3.0
+
+# loaded once per process like the smell models
+LEXICON_MODEL: Optional["LexiconToxicityModel"] = None
+
+
+class LexiconToxicityModel:
+    # scores comments on the CPU from weighted terms and phrases, a comment's toxicity is the
+    # logistic of the summed weights of the terms it contains, so it reads like a Perspective score
+
+    def __init__(self, lexicon_path: str) -> None:
+        with open(lexicon_path, newline="", encoding="utf-8") as file:
+            rows = list(csv.DictReader(file))
+
+        terms = [row["term"].lower() for row in rows]
+        self.weights: np.ndarray = np.array([float(row["weight"]) for row in rows])
+
+        # phrases are matched as word n-grams, each term counts once per comment
+        max_words = max(len(term.split()) for term in terms)
+        self.vectorizer: CountVectorizer = CountVectorizer(
+            vocabulary=terms,
+            ngram_range=(1, max_words),
+            token_pattern=r"(?u)\b\w+\b",
+            binary=True,
+        )
+
+    def is_available(self) -> bool:
+        return True
+
+    def score_many(self, comments: Iterable[str], logger: Logger) -> List[float]:
+        comments = list(comments)
+        if len(comments) == 0:
+            return []
+
+        started_at = time.perf_counter()
+        weights = self.vectorizer.transform(comments) @ self.weights
+        toxicities = 1 / (1 + np.exp(LEXICON_BIAS - weights))
+
+        logger.info(
+            f"Scored toxicity of {len(comments)} comments locally "
+            f"in {(time.perf_counter() - started_at) * 1000:.1f} ms"
+        )
+        return toxicities.tolist()
+
+
+def get_lexicon_model() -> LexiconToxicityModel:
+    global LEXICON_MODEL
+    if LEXICON_MODEL is None:
+        LEXICON_MODEL = LexiconToxicityModel(TOXICITY_LEXICON_PATH)
+    return LEXICON_MODEL
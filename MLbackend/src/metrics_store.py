@@ -0,0 +1,78 @@
+import csv
+import os
+from numbers import Integral, Real
+from typing import Dict, List, Sequence, Union
+
+import pandas as pd
+
+MetricValue = Union[int, float, str]
+
+CSV: str = "csv"
+PARQUET: str = "parquet"
+EXPORT_FORMATS: List[str] = [CSV, PARQUET]
+
+
+class MetricsStore:
+    # the results of every batch of a run, the analyses write here and smell detection
+    # reads from here, results_{idx}.csv is only written once at the end of the run
+
+    def __init__(self) -> None:
+        self.batches: List[Dict[str, MetricValue]] = []
+
+    def set(self, batch_idx: int, name: str, value: object) -> None:
+        while len(self.batches) <= batch_idx:
+            self.batches.append({})
+
+        self.batches[batch_idx][name] = to_metric_value(value)
+        return None
+
+    def get(self, batch_idx: int) -> Dict[str, MetricValue]:
+        if batch_idx >= len(self.batches):
+            return {}
+        return self.batches[batch_idx]
+
+    def export(self, results_path: str, formats: Sequence[str]) -> None:
+        for export_format in formats:
+            if export_format == CSV:
+                self.export_csv(results_path)
+            elif export_format == PARQUET:
+                self.export_parquet(results_path)
+            else:
+                raise ValueError(
+                    f"Unknown metrics export format {export_format}. "
+                    f"It should be one of {', '.join(EXPORT_FORMATS)}."
+                )
+        return None
+
+    def export_csv(self, results_path: str) -> None:
+        for batch_idx, metrics in enumerate(self.batches):
+            with open(
+                os.path.join(results_path, f"results_{batch_idx}.csv"), "w", newline=""
+            ) as f:
+                csv.writer(f, delimiter=",").writerows(metrics.items())
+        return None
+
+    def export_parquet(self, results_path: str) -> None:
+        # one long table for all batches, needs pyarrow or fastparquet installed
+        rows = [
+            (batch_idx, name, str(value))
+            for batch_idx, metrics in enumerate(self.batches)
+            for name, value in metrics.items()
+        ]
+        pd.DataFrame(rows, columns=["batch", "metric", "value"]).to_parquet(
+            os.path.join(results_path, "results.parquet"), index=False
+        )
+        return None
+
+
+def to_metric_value(value: object) -> MetricValue:
+    # numpy scalars become plain numbers, anything else is kept as the text the csv would hold
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, Integral):
+        return int(value)
+    if isinstance(value, Real):
+        return float(value)
+    return str(value)
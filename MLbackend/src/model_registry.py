@@ -0,0 +1,130 @@
+import os
+import time
+from logging import Logger
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from joblib import load
+
+SMELLS: List[str] = ["OSE", "BCE", "PDE", "SV", "OS", "SD", "RS", "TF", "UI", "TC"]
+
+MODELS_PATH: str = os.path.join(os.path.dirname(__file__), "..", "models")
+
+# the names the models were trained with, in the order build_metrics_list produces the metrics
+FEATURE_CODES: List[str] = [
+    "NoD",
+    "NAD",
+    "NCD",
+    "SDC",
+    "NoCD",
+    "PCD",
+    "NSD",
+    "PSD",
+    "NPR",
+    "SAPR",
+    "ANAP",
+    "NIS",
+    "SDAI",
+    "ANAI",
+    "GDC",
+    "SDD",
+    "GBC",
+    "GCC",
+    "ND",
+    "NC",
+    "ACC",
+    "SCC",
+    "ADC",
+    "SDoC",
+    "TZ",
+    "ACZ",
+    "SCZ",
+    "ADZ",
+    "SDZ",
+    "NR",
+    "PCR",
+    "SCR",
+    "FN",
+    "ADPR",
+    "ADI",
+    "BFN",
+    "TFN",
+    "TFC",
+    "ANCPR",
+    "SCPR",
+    "NCI",
+    "ANCI",
+    "SDCI",
+    "RTCPR",
+    "RTCI",
+    "RPCPR",
+    "RPCI",
+    "RINC",
+    "RNSPRC",
+    "ACCL",
+]
+
+# loaded once per process, every job handled by a worker shares it
+MODEL_REGISTRY: Optional["ModelRegistry"] = None
+
+
+class ModelRegistry:
+
+    def __init__(self, models_path: str, metric_names: Sequence[str], logger: Logger) -> None:
+        self.logger: Logger = logger
+        self.metric_names: List[str] = list(metric_names)
+        self.models: Dict[str, object] = {}
+        self.predict_seconds: float = 0.0
+
+        for smell in SMELLS:
+            # the models are stored uncompressed, so their arrays are mapped instead of copied
+            model = load(os.path.join(models_path, f"{smell}.joblib"), mmap_mode="r")
+            validate_schema(smell, model, self.metric_names)
+            self.models[smell] = model
+
+        logger.info(f"Loaded {len(self.models)} smell models from {models_path}")
+
+    def predict(self, metrics: List[List[float]]) -> Dict[str, np.ndarray]:
+        # one row per batch, every model predicts all batches in a single call
+        features = pd.DataFrame(
+            np.asarray(metrics, dtype=float).reshape(-1, len(self.metric_names)),
+            columns=FEATURE_CODES,
+        )
+
+        started_at = time.perf_counter()
+        predictions = {smell: model.predict(features) for smell, model in self.models.items()}
+        self.predict_seconds = time.perf_counter() - started_at
+
+        self.logger.info(
+            f"Predicted {len(self.models)} smells for {len(features)} batches "
+            f"in {self.predict_seconds * 1000:.1f} ms"
+        )
+        return predictions
+
+
+def validate_schema(smell: str, model: object, metric_names: List[str]) -> None:
+    if len(metric_names) != len(FEATURE_CODES):
+        raise ValueError(
+            f"{len(metric_names)} metrics are built for smell detection, "
+            f"but {len(FEATURE_CODES)} model features are known."
+        )
+
+    if model.n_features_in_ != len(metric_names):
+        raise ValueError(
+            f"Smell model {smell} expects {model.n_features_in_} features, "
+            f"but {len(metric_names)} metrics are built for it."
+        )
+
+    feature_names = getattr(model, "feature_names_in_", None)
+    if feature_names is not None and list(feature_names) != FEATURE_CODES:
+        raise ValueError(f"Smell model {smell} was trained on different or reordered features.")
+
+    return None
+
+
+def get_model_registry(metric_names: Sequence[str], logger: Logger) -> ModelRegistry:
+    global MODEL_REGISTRY
+    if MODEL_REGISTRY is None:
+        MODEL_REGISTRY = ModelRegistry(MODELS_PATH, metric_names, logger)
+    return MODEL_REGISTRY
@@ -1,13 +1,20 @@
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from io import BytesIO
 from logging import Logger
 from typing import Any, List, Tuple
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.styles import StyleSheet1, getSampleStyleSheet
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
 
 from MLbackend.config import LOGGER
 
+RENDERED_REPORTS_MAX_ENTRIES: int = 32
+RENDERED_REPORTS: "OrderedDict[str, bytes]" = OrderedDict()
+
 smells = {
     "OSE": "Organizational Silo Effect: Isolated subgroups lead to poor communication, wasted resources, and duplicated code.",
     "BCE": "Black-cloud Effect: Information overload due to limited collaboration and a lack of experts, causing knowledge gaps.",
@@ -23,11 +30,41 @@ smells = {
 
 
 def generate_pdf(pdf_results, smells_det, pdf_file_path):
-    document = SimpleDocTemplate(str(pdf_file_path), pagesize=letter)
+    # the report of a run is rendered once, after all of its batches are analysed
+    try:
+        report = render_report(pdf_results, smells_det)
+    except Exception as e:
+        LOGGER.error(f"Failed to build PDF: {e}")
+        return None
+
+    with open(pdf_file_path, "wb") as file:
+        file.write(report)
+    return None
+
+
+def render_report(pdf_results, smells_det) -> bytes:
+    # repeated builds for the same results, e.g. re-analyses without changes, reuse the bytes
+    key = hashlib.sha256(repr((pdf_results, smells_det)).encode("utf-8")).hexdigest()
+    report = RENDERED_REPORTS.get(key)
+    if report is not None:
+        RENDERED_REPORTS.move_to_end(key)
+        return report
+
+    buffer = BytesIO()
+    document = SimpleDocTemplate(buffer, pagesize=letter)
+    document.build(build_content(pdf_results, smells_det))
+    report = buffer.getvalue()
+
+    RENDERED_REPORTS[key] = report
+    if len(RENDERED_REPORTS) > RENDERED_REPORTS_MAX_ENTRIES:
+        RENDERED_REPORTS.popitem(last=False)
+    return report
+
 
+def build_content(pdf_results, smells_det) -> List[Any]:
     content = []
 
-    styles = getSampleStyleSheet()
+    styles = report_styles()
     title_style = styles["Title"]
     normal_style = styles["Normal"]
 
@@ -46,17 +83,7 @@ def generate_pdf(pdf_results, smells_det, pdf_file_path):
             )
             content.append(paragraph)
 
-    table_style = TableStyle(
-        [
-            ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-            ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-            ("GRID", (0, 0), (-1, -1), 1, colors.black),
-        ]
-    )
+    table_style = report_table_style()
 
     for i, result in pdf_results.items():
         content.append(Paragraph(f"<br/><b>{i} :</b>", styles["Heading2"]))
@@ -79,7 +106,25 @@ def generate_pdf(pdf_results, smells_det, pdf_file_path):
             commit_table = Table(commit_table_data)
             commit_table.setStyle(table_style)
             content.append(commit_table)
-    try:
-        document.build(content)
-    except Exception as e:
-        LOGGER.error(f"Failed to build PDF: {e}")
+
+    return content
+
+
+@lru_cache(maxsize=None)
+def report_styles() -> StyleSheet1:
+    return getSampleStyleSheet()
+
+
+@lru_cache(maxsize=None)
+def report_table_style() -> TableStyle:
+    return TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+            ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+            ("GRID", (0, 0), (-1, -1), 1, colors.black),
+        ]
+    )
@@ -0,0 +1,174 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging import Logger
+from typing import Dict, Iterable, List, Optional
+
+import requests
+from requests import RequestException
+from requests.adapters import HTTPAdapter
+
+from MLbackend.config import PERSPECTIVE_MODEL_VERSION
+from MLbackend.src.score_cache import ScoreCache, hash_text
+
+# rate limited requests are retried a few times before the analysis gives up
+RATE_LIMIT_RETRIES: int = 5
+
+TOXICITY_CACHE_MAX_ENTRIES: int = 1_000_000
+
+
+class ToxicityAnalysisError(Exception):
+    """Custom exception for errors occurring during toxicity analysis."""
+    pass
+
+
+class TokenBucket:
+    # hands out `rate` tokens per second and never holds more than `capacity` of them,
+    # so requests run as soon as the quota allows instead of waiting for minute boundaries
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.tokens: float = capacity
+        self.updated_at: float = time.monotonic()
+        self.lock: threading.Lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return None
+                wait_seconds = (1 - self.tokens) / self.rate
+
+            time.sleep(wait_seconds)
+
+
+class PerspectiveClient:
+    # scores are kept per text, so identical comments in any PR or issue batch of a run
+    # are only sent once, with a cache they are also reused by later runs.
+    # offline, only cached scores are used and nothing is sent
+
+    def __init__(
+        self,
+        url: str,
+        key: Optional[str],
+        qps: float,
+        concurrency: int,
+        model_version: str = PERSPECTIVE_MODEL_VERSION,
+        offline: bool = False,
+        cache: Optional[ScoreCache] = None,
+    ) -> None:
+        self.url: str = url
+        self.key: Optional[str] = key
+        self.concurrency: int = max(1, concurrency)
+        self.bucket: TokenBucket = TokenBucket(qps, max(1.0, qps))
+        self.model_version: str = model_version
+        self.offline: bool = offline
+        self.cache: Optional[ScoreCache] = cache
+        self.scores: Dict[str, float] = {}
+
+        # one pooled connection per concurrent request
+        self.session: requests.Session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def is_available(self) -> bool:
+        # offline, toxicity is computed from the scores earlier runs cached
+        return self.key is not None or self.offline
+
+    def score_many(self, comments: Iterable[str], logger: Logger) -> List[float]:
+        # comments without a score, only possible offline, are left out
+        comments = list(comments)
+        unscored = [comment for comment in dict.fromkeys(comments) if comment not in self.scores]
+        if self.cache is not None and len(unscored) > 0:
+            unscored = self.load_cached(unscored)
+
+        if self.offline:
+            if len(unscored) > 0:
+                logger.warning(
+                    f"Offline, skipping {len(unscored)} comments without a cached toxicity score"
+                )
+        elif len(unscored) > 0:
+            logger.info(
+                f"Scoring toxicity of {len(unscored)} unique comments, "
+                f"expecting around {len(unscored) / self.bucket.rate:.0f} second(s)"
+            )
+
+            computed = {}
+            try:
+                with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                    for comment, toxicity in zip(
+                        unscored, executor.map(lambda text: self.score(text, logger), unscored)
+                    ):
+                        self.scores[comment] = toxicity
+                        computed[hash_text(comment)] = dict(
+                            toxicity=toxicity, model_version=self.model_version
+                        )
+            finally:
+                # keep what the quota was already spent on, even if a later request failed
+                if self.cache is not None:
+                    self.cache.put_many(computed)
+
+        return [self.scores[comment] for comment in comments if comment in self.scores]
+
+    def load_cached(self, comments: List[str]) -> List[str]:
+        keys = {comment: hash_text(comment) for comment in comments}
+        cached = self.cache.get_many(keys.values())
+
+        missing = []
+        for comment, key in keys.items():
+            entry = cached.get(key)
+            if entry is not None and entry["model_version"] == self.model_version:
+                self.scores[comment] = entry["toxicity"]
+            else:
+                missing.append(comment)
+        return missing
+
+    def score(self, comment: str, logger: Logger) -> float:
+        data_dict = {
+            "comment": {"text": comment},
+            "languages": ["en"],
+            "requestedAttributes": {"TOXICITY": {}},
+        }
+
+        try:
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                self.bucket.acquire()
+                response = self.session.post(url=self.url, params=dict(key=self.key), json=data_dict)
+                if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                    break
+
+                # the quota is shared with other jobs, back off and wait for the bucket again
+                logger.warning("Perspective rate limit reached, retrying")
+                time.sleep(2**attempt)
+
+            response.raise_for_status()  # Raise an HTTPError if the response was unsuccessful
+            parsed_response = response.json()
+
+            return float(
+                parsed_response["attributeScores"]["TOXICITY"]["summaryScore"]["value"]
+            )
+
+        except RequestException as req_err:
+            logger.error(f"Request error: {req_err}")
+            raise ToxicityAnalysisError(f"Request error: {req_err}") from req_err
+
+        except KeyError as key_err:
+            logger.error("Response parsing error: Missing expected keys.")
+            raise ToxicityAnalysisError("Response parsing error: Missing expected keys.") from key_err
+
+        except ValueError as val_err:
+            logger.error("Invalid toxicity value in response.")
+            raise ToxicityAnalysisError("Invalid toxicity value in response.") from val_err
+
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            raise ToxicityAnalysisError(f"Unexpected error: {e}") from e
@@ -1,12 +1,10 @@
-import csv
-import os
 from logging import Logger
 from typing import Any, List, Tuple
 
-import convokit
-
 import MLbackend.src.stats_analysis as stats
+from MLbackend.config import POLITENESS_BATCH_SIZE, POLITENESS_PROCESSES
 from MLbackend.src.configuration import Configuration
+from MLbackend.src.politeness_engine import get_politeness_engine
 from MLbackend.src.utils.result import Result
 
 
@@ -39,6 +37,10 @@ def calculate_accl(
 
     accls = []
     for batch_idx, batch in enumerate(pr_comment_batches):
+        if config.batch_outputs.is_reused(batch_idx):
+            # restored along with the rest of the batch's metrics
+            accls.append(config.metrics.get(batch_idx)["ACCL"])
+            continue
 
         pr_comment_lengths = list([len(c) for c in batch])
         issue_comment_batch = list([len(c) for c in issue_comment_batches[batch_idx]])
@@ -52,13 +54,7 @@ def calculate_accl(
         accls.append(accl)
 
         # output results
-        with open(
-            os.path.join(config.results_path, f"results_{batch_idx}.csv"),
-            "a",
-            newline="",
-        ) as f:
-            w = csv.writer(f, delimiter=",")
-            w.writerow(["ACCL", accl])
+        config.metrics.set(batch_idx, "ACCL", accl)
     return accls[0]
 
 
@@ -66,55 +62,20 @@ def calculate_rpc(
     config, output_prefix, comment_batches, logger: Logger
 ) -> Tuple[str, float]:
     logger.info(f"Calculating Relative positive count for {output_prefix}s.")
+
+    # spaCy is loaded once per process and all batches are parsed together
+    engine = get_politeness_engine(POLITENESS_BATCH_SIZE, POLITENESS_PROCESSES, logger)
+    positive_marker_counts = engine.positive_marker_counts(comment_batches, logger)
+
     rpcs = []
-    for batch_idx, batch in enumerate(comment_batches):
+    for batch_idx, positive_marker_count in enumerate(positive_marker_counts):
+        if config.batch_outputs.is_reused(batch_idx):
+            # reused batches have no comments, their count is restored with their metrics
+            rpcs.append((output_prefix, config.metrics.get(batch_idx)[f"RPC{output_prefix}"]))
+            continue
 
-        # analyze batch
-        positive_marker_count = get_results(batch) if len(batch) > 0 else 0.0
         rpcs.append((output_prefix, positive_marker_count))
 
         # output results
-        with open(
-            os.path.join(config.results_path, f"results_{batch_idx}.csv"),
-            "a",
-            newline="",
-        ) as f:
-            w = csv.writer(f, delimiter=",")
-            w.writerow([f"RPC{output_prefix}", positive_marker_count])
+        config.metrics.set(batch_idx, f"RPC{output_prefix}", positive_marker_count)
     return rpcs[0]
-
-
-def get_results(comments: list) -> float:
-
-    # define default speaker
-    speaker = convokit.Speaker(id="default")
-
-    # build utterance list
-    utterances = list(
-        [
-            convokit.Utterance(id=str(idx), speaker=speaker, text=comment)
-            for idx, comment in enumerate(comments)
-        ]
-    )
-
-    # build corpus
-    corpus = convokit.Corpus(utterances=utterances)
-
-    # parse
-    parser = convokit.TextParser(verbosity=0)
-    corpus = parser.transform(corpus)
-
-    # extract politeness features
-    politeness = convokit.PolitenessStrategies()
-    corpus = politeness.transform(corpus, markers=True)
-    features = corpus.get_utterances_dataframe()
-
-    # get positive politeness marker count
-    positive_marker_count = sum(
-        [
-            feature["feature_politeness_==HASPOSITIVE=="]
-            for feature in features["meta.politeness_strategies"]
-        ]
-    )
-
-    return positive_marker_count
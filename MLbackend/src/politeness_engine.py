@@ -0,0 +1,104 @@
+import time
+from itertools import islice
+from logging import Logger
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import spacy
+from convokit.politeness_collections.politeness_api.features.politeness_strategies import \
+    get_politeness_strategy_features
+from spacy.language import Language
+from spacy.tokens import Doc, Token
+
+SPACY_MODEL: str = "en_core_web_sm"
+
+# politeness strategies only read the tokens, tags and dependency parse
+UNUSED_COMPONENTS: List[str] = ["ner", "lemmatizer"]
+
+# starting worker processes only pays off for larger runs
+MULTIPROCESS_MIN_COMMENTS: int = 2000
+
+# loaded once per process, every job handled by a worker shares it
+POLITENESS_ENGINE: Optional["PolitenessEngine"] = None
+
+
+class PolitenessEngine:
+
+    def __init__(self, nlp: Language, batch_size: int, n_process: int) -> None:
+        self.nlp: Language = nlp
+        self.batch_size: int = batch_size
+        self.n_process: int = max(1, n_process)
+
+    def parse_stream(self, comments: Iterable[str], comment_count: int) -> Iterator[Doc]:
+        n_process = self.n_process if comment_count >= MULTIPROCESS_MIN_COMMENTS else 1
+        return self.nlp.pipe(
+            (comment.strip() for comment in comments),
+            batch_size=self.batch_size,
+            n_process=n_process,
+        )
+
+    def positive_marker_counts(
+        self, comment_batches: Sequence[Sequence[str]], logger: Logger
+    ) -> List[float]:
+        # the comments of every batch are parsed in one stream and each doc is counted
+        # as it arrives, no parses, corpus or dataframe are kept around
+        comment_count = sum(len(batch) for batch in comment_batches)
+        if comment_count == 0:
+            return [0.0 for _ in comment_batches]
+
+        started_at = time.perf_counter()
+        docs = self.parse_stream(
+            (comment for batch in comment_batches for comment in batch), comment_count
+        )
+
+        counts = []
+        for batch in comment_batches:
+            if len(batch) == 0:
+                counts.append(0.0)
+                continue
+            counts.append(sum(has_positive_marker(doc) for doc in islice(docs, len(batch))))
+
+        elapsed = time.perf_counter() - started_at
+        logger.info(
+            f"Counted politeness markers of {comment_count} comments in {elapsed:.1f}s "
+            f"({comment_count / max(elapsed, 1e-9):.0f} comments/s)"
+        )
+        return counts
+
+
+def has_positive_marker(doc: Doc) -> int:
+    # what PolitenessStrategies extracts for a parsed utterance, the strategies match lowercase tokens
+    parses = [sentence["toks"] for sentence in doc_to_parse(doc)]
+    for tokens in parses:
+        for token in tokens:
+            token["tok"] = token["tok"].lower()
+
+    features, _ = get_politeness_strategy_features(parses)
+    return features["feature_politeness_==HASPOSITIVE=="]
+
+
+def doc_to_parse(doc: Doc) -> List[Dict[str, Any]]:
+    # the format convokit's TextParser stores, token indices are relative to their sentence
+    return [
+        {
+            "rt": sentence.root.i - sentence.start,
+            "toks": [token_to_parse(token, sentence.start) for token in sentence],
+        }
+        for sentence in doc.sents
+    ]
+
+
+def token_to_parse(token: Token, offset: int) -> Dict[str, Any]:
+    parsed = {"tok": token.text, "tag": token.tag_, "dep": token.dep_}
+    if token.head.i != token.i:
+        parsed["up"] = token.head.i - offset
+    parsed["dn"] = [child.i - offset for child in token.children]
+    return parsed
+
+
+def get_politeness_engine(batch_size: int, n_process: int, logger: Logger) -> PolitenessEngine:
+    global POLITENESS_ENGINE
+    if POLITENESS_ENGINE is None:
+        nlp = spacy.load(SPACY_MODEL, exclude=UNUSED_COMPONENTS)
+        logger.info(f"Loaded {SPACY_MODEL} with {', '.join(nlp.pipe_names)}")
+        POLITENESS_ENGINE = PolitenessEngine(nlp, batch_size, n_process)
+    return POLITENESS_ENGINE
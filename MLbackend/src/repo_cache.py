@@ -0,0 +1,251 @@
+import base64
+import fcntl
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from logging import Logger
+from typing import List, Optional
+
+import git
+from dateutil.parser import isoparse
+
+# a mirror fetched this recently by another job is used as it is
+REFRESH_INTERVAL_SECONDS: float = 60
+
+
+class RepoCache:
+    # bare, blobless mirrors shared by every analysis, the analyses only read commits and tags.
+    # every mirror has two lock files: jobs reading it hold "<name>.lock" shared and eviction
+    # takes it exclusively, "<name>.fetch.lock" lets only one job clone or fetch at a time
+
+    def __init__(self, cache_path: str, max_bytes: int, logger: Logger) -> None:
+        self.cache_path: str = cache_path
+        self.max_bytes: int = max_bytes
+        self.logger: Logger = logger
+
+    def mirror_path(self, owner: str, name: str) -> str:
+        return os.path.join(self.cache_path, owner, f"{name}.git")
+
+    def acquire(
+        self,
+        owner: str,
+        name: str,
+        repository_url: str,
+        pat: Optional[str],
+        since: Optional[datetime] = None,
+    ) -> git.Repo:
+        mirror_path = self.mirror_path(owner, name)
+        os.makedirs(os.path.dirname(mirror_path), exist_ok=True)
+
+        # held until release, so the mirror isn't evicted while it is analysed
+        use_lock = open(lock_path(mirror_path), "a")
+        fcntl.flock(use_lock, fcntl.LOCK_SH)
+        os.utime(use_lock.name)
+
+        try:
+            with open(lock_path(mirror_path, "fetch"), "a") as fetch_lock:
+                fcntl.flock(fetch_lock, fcntl.LOCK_EX)
+                if not os.path.exists(mirror_path):
+                    clone_mirror(repository_url, mirror_path, pat, since, self.logger)
+                elif not reaches_back(mirror_path, since):
+                    deepen_mirror(mirror_path, pat, since, self.logger)
+                elif is_stale(mirror_path):
+                    fetch_mirror(mirror_path, pat, self.logger)
+
+            repo = git.Repo(mirror_path, odbt=git.GitCmdObjectDB)
+        except Exception:
+            use_lock.close()
+            raise
+
+        # every acquisition holds its own lock, releasing one never unlocks another job's copy
+        repo.use_lock = use_lock
+        self.evict(keep=mirror_path)
+        return repo
+
+    def evict(self, keep: str) -> None:
+        # least recently used mirrors go first until the cache fits its budget again
+        mirrors = list_mirrors(self.cache_path)
+        sizes = {mirror_path: directory_size(mirror_path) for mirror_path in mirrors}
+        total_bytes = sum(sizes.values())
+
+        for mirror_path in mirrors:
+            if total_bytes <= self.max_bytes:
+                break
+            if mirror_path == keep:
+                continue
+
+            with open(lock_path(mirror_path), "a") as use_lock:
+                try:
+                    fcntl.flock(use_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # another job is reading it right now
+                    continue
+
+                shutil.rmtree(mirror_path, ignore_errors=True)
+                total_bytes -= sizes[mirror_path]
+                self.logger.info(f"Evicted cached repository {mirror_path}")
+
+        return None
+
+
+def release_repo(repo: git.Repo) -> None:
+    repo.close()
+    use_lock = getattr(repo, "use_lock", None)
+    if use_lock is not None:
+        use_lock.close()
+        repo.use_lock = None
+    return None
+
+
+def clone_mirror(
+    repository_url: str,
+    mirror_path: str,
+    pat: Optional[str],
+    since: Optional[datetime],
+    logger: Logger,
+) -> None:
+    logger.info(f"Cloning {repository_url} into the repository cache")
+
+    # analyses with a start date only need the history after it
+    shallow_options = {} if since is None else dict(shallow_since=since.isoformat())
+
+    # clone next to the target and move it in, so a failed clone never looks like a mirror
+    temp_path = tempfile.mkdtemp(dir=os.path.dirname(mirror_path), suffix=".tmp")
+    try:
+        authenticated_git(pat).clone(
+            repository_url, temp_path, bare=True, filter="blob:none", **shallow_options
+        )
+        os.replace(temp_path, mirror_path)
+    finally:
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+    # a bare clone keeps no fetch refspec, every update should mirror branches and tags
+    repo = git.Repo(mirror_path)
+    with repo.config_writer() as writer:
+        writer.set_value('remote "origin"', "fetch", "+refs/heads/*:refs/heads/*")
+        if since is not None:
+            writer.set_value("smells", "shallowSince", since.isoformat())
+    repo.close()
+    return None
+
+
+def deepen_mirror(
+    mirror_path: str, pat: Optional[str], since: Optional[datetime], logger: Logger
+) -> None:
+    # a later analysis needs more history than earlier ones fetched
+    repo = git.Repo(mirror_path)
+    if since is None:
+        shallow_options = dict(unshallow=True)
+    else:
+        shallow_options = dict(shallow_since=since.isoformat())
+
+    try:
+        authenticated_git(pat, mirror_path).fetch(
+            "origin", tags=True, force=True, filter="blob:none", **shallow_options
+        )
+        with repo.config_writer() as writer:
+            if since is None:
+                writer.remove_option("smells", "shallowSince")
+            else:
+                writer.set_value("smells", "shallowSince", since.isoformat())
+        logger.info(f"Extended cached repository history back to {since or 'the first commit'}")
+    finally:
+        repo.close()
+
+    return None
+
+
+def reaches_back(mirror_path: str, since: Optional[datetime]) -> bool:
+    # full clones reach back to the first commit, shallow ones to the date they were cut at
+    if not os.path.exists(os.path.join(mirror_path, "shallow")):
+        return True
+
+    repo = git.Repo(mirror_path)
+    try:
+        shallow_since = repo.config_reader().get_value("smells", "shallowSince", None)
+    finally:
+        repo.close()
+
+    if shallow_since is None or since is None:
+        return False
+    return isoparse(shallow_since) <= since
+
+
+def fetch_mirror(mirror_path: str, pat: Optional[str], logger: Logger) -> None:
+    repo = git.Repo(mirror_path)
+    try:
+        authenticated_git(pat, mirror_path).fetch(
+            "origin", tags=True, force=True, prune=True, filter="blob:none"
+        )
+        logger.info(f"Updated cached repository to {repo.head.commit.hexsha}")
+    except git.exc.GitCommandError as e:
+        logger.warning(
+            f"Failed to update cached repository, analysing the local copy: {e.stderr.strip()}"
+        )
+    finally:
+        repo.close()
+
+    return None
+
+
+def authenticated_git(pat: Optional[str], working_dir: Optional[str] = None) -> git.Git:
+    # the token is passed per command, never written into the remote url or the mirror's config
+    command = git.Git(working_dir)
+    if not pat:
+        return command
+
+    credentials = base64.b64encode(f"x-access-token:{pat}".encode("utf-8")).decode("ascii")
+    return command(c=f"http.extraHeader=Authorization: Basic {credentials}")
+
+
+def is_stale(mirror_path: str) -> bool:
+    fetch_head_path = os.path.join(mirror_path, "FETCH_HEAD")
+    if not os.path.exists(fetch_head_path):
+        return True
+
+    return time.time() - os.path.getmtime(fetch_head_path) > REFRESH_INTERVAL_SECONDS
+
+
+def list_mirrors(cache_path: str) -> List[str]:
+    # oldest use first, the use lock's modification time is the last time a job acquired it
+    mirrors = []
+    if not os.path.isdir(cache_path):
+        return mirrors
+
+    for owner in os.listdir(cache_path):
+        owner_path = os.path.join(cache_path, owner)
+        if not os.path.isdir(owner_path):
+            continue
+
+        for entry in os.listdir(owner_path):
+            mirror_path = os.path.join(owner_path, entry)
+            if entry.endswith(".git") and os.path.isdir(mirror_path):
+                mirrors.append(mirror_path)
+
+    return sorted(mirrors, key=last_used)
+
+
+def last_used(mirror_path: str) -> float:
+    use_lock_path = lock_path(mirror_path)
+    if os.path.exists(use_lock_path):
+        return os.path.getmtime(use_lock_path)
+    return os.path.getmtime(mirror_path)
+
+
+def lock_path(mirror_path: str, kind: Optional[str] = None) -> str:
+    # "owner/name.git" is locked through "owner/name.lock" and "owner/name.fetch.lock"
+    base_path = mirror_path[: -len(".git")]
+    return f"{base_path}.lock" if kind is None else f"{base_path}.{kind}.lock"
+
+
+def directory_size(path: str) -> int:
+    size = 0
+    for root, _, files in os.walk(path):
+        for file_name in files:
+            try:
+                size += os.lstat(os.path.join(root, file_name)).st_size
+            except OSError:
+                pass
+    return size
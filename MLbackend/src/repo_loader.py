@@ -1,40 +1,45 @@
 import os
 from logging import Logger
+from typing import Optional
 
 import git
 
+from MLbackend.config import REPO_CACHE_MAX_BYTES
 from MLbackend.src.configuration import Configuration
+from MLbackend.src.repo_cache import RepoCache, release_repo
 
 
-def get_repo(config: Configuration, logger: Logger):
-    repo_path = os.path.join(
-        config.repository_path,
-        "{}.{}".format(config.repository_owner, config.repository_name),
-    )
-
+def get_repo(config: Configuration, logger: Logger) -> Optional[git.Repo]:
     # Reference from https://docs.readthedocs.io/en/stable/guides/private-python-packages.html
     pat = config.pat or os.getenv("GITHUB_TOKEN")
 
-    repo_url = config.repository_url.replace("https://", f"https://{pat}@")
+    # repositories are kept as shared mirrors, hand them back with close_repo once analysed
+    cache = RepoCache(
+        os.path.join(config.output_path, "cache", "repositories"),
+        REPO_CACHE_MAX_BYTES,
+        logger,
+    )
 
     repo = None
     try:
-        if not os.path.exists(repo_path):
-            logger.info(f"Repository path does not exist. Cloning from {repo_url}")
-            repo = git.Repo.clone_from(
-                repo_url,
-                repo_path,
-                odbt=git.GitCmdObjectDB,
-            )
-            logger.info(f"Cloned repository from {repo_url}")
-        else:
-            repo = git.Repo(repo_path, odbt=git.GitCmdObjectDB)
-            logger.info(f"Repository already cloned from {repo_url}")
+        repo = cache.acquire(
+            config.repository_owner,
+            config.repository_name,
+            config.repository_url,
+            pat,
+            config.start_datetime(),
+        )
+        logger.info(f"Using cached repository for {config.repository_url}")
     except git.exc.GitCommandError as e:
-        logger.error(f"Failed to clone or open repository: {e}")
+        # the command line carries the token, only log what git said
+        logger.error(f"Failed to clone or open repository: {e.stderr.strip()}")
         return None
     except Exception as e:
         logger.error(f"An unexpected error occurred: {e}")
         return None
 
     return repo
+
+
+def close_repo(repo: git.Repo) -> None:
+    return release_repo(repo)
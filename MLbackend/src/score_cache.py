@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator
+
+# stays below SQLite's bound parameter limit on older builds
+QUERY_CHUNK_SIZE: int = 500
+
+
+class ScoreCache:
+
+    def __init__(self, db_path: str, max_entries: int) -> None:
+        self.db_path: str = db_path
+        self.max_entries: int = max_entries
+        self.hits: int = 0
+        self.misses: int = 0
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connection() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS scores (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS scores_last_used ON scores (last_used)"
+            )
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(set(keys))
+        found = {}
+
+        with self._connection() as connection:
+            for start in range(0, len(keys), QUERY_CHUNK_SIZE):
+                chunk = keys[start : start + QUERY_CHUNK_SIZE]
+                rows = connection.execute(
+                    f"SELECT key, value FROM scores WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+
+            # refresh recency so frequently seen texts survive eviction
+            now = time.time()
+            connection.executemany(
+                "UPDATE scores SET last_used = ? WHERE key = ?",
+                [(now, key) for key in found],
+            )
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, Any]) -> None:
+        if len(items) == 0:
+            return None
+
+        now = time.time()
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO scores (key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+                [(key, json.dumps(value), now, now) for key, value in items.items()],
+            )
+
+            # evict the least recently used entries once the cap is exceeded
+            (count,) = connection.execute("SELECT COUNT(*) FROM scores").fetchone()
+            if count > self.max_entries:
+                connection.execute(
+                    "DELETE FROM scores WHERE key IN (SELECT key FROM scores ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+        return None
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
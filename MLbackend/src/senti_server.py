@@ -0,0 +1,189 @@
+import atexit
+import os
+import subprocess
+import threading
+from typing import Dict, List, Sequence, Tuple, Union
+
+from MLbackend.config import LOGGER
+from MLbackend.src.score_cache import ScoreCache, hash_text
+
+# keeps each round trip's output well below the pipe buffer so neither side blocks
+CHUNK_SIZE: int = 1000
+
+SENTIMENT_CACHE_MAX_ENTRIES: int = 1_000_000
+
+
+class SentiStrengthError(Exception):
+    """Raised when the SentiStrength process fails or answers unexpectedly."""
+    pass
+
+
+class SentiStrengthServer:
+
+    def __init__(self, senti_strength_path: str, language_folder_path: str) -> None:
+        self.senti_strength_path: str = senti_strength_path
+        self.language_folder_path: str = language_folder_path
+        if not self.language_folder_path.endswith("/"):
+            self.language_folder_path += "/"
+
+        self._process: subprocess.Popen | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _build_command(self) -> List[str]:
+        # stdin mode classifies one text per line until the pipe is closed
+        return [
+            "java",
+            "-jar",
+            self.senti_strength_path,
+            "stdin",
+            "sentidata",
+            self.language_folder_path,
+            "trinary",
+        ]
+
+    def _ensure_started(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            LOGGER.info("Starting SentiStrength process")
+            self._process = subprocess.Popen(
+                self._build_command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                bufsize=1,
+            )
+        return self._process
+
+    def close(self) -> None:
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                self._process.stdin.close()
+                try:
+                    self._process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+            self._process = None
+
+    def get_trinary_scores(self, texts: Sequence[str]) -> List[Tuple[int, int, int]]:
+        scores = []
+        with self._lock:
+            for start in range(0, len(texts), CHUNK_SIZE):
+                scores.extend(self._score_chunk(texts[start : start + CHUNK_SIZE]))
+        return scores
+
+    def _score_chunk(self, texts: Sequence[str]) -> List[Tuple[int, int, int]]:
+        process = self._ensure_started()
+        lines = "".join(f"{encode_text(text)}\n" for text in texts)
+
+        try:
+            process.stdin.write(lines)
+            process.stdin.flush()
+            outputs = [process.stdout.readline() for _ in texts]
+        except (BrokenPipeError, OSError) as e:
+            self._process = None
+            raise SentiStrengthError(f"SentiStrength process stopped: {e}") from e
+
+        scores = []
+        for output in outputs:
+            values = output.split()
+            if len(values) < 3:
+                # the stream is out of step now, so the process has to be restarted
+                process.kill()
+                self._process = None
+                raise SentiStrengthError(f"Unexpected SentiStrength output: {output!r}")
+            scores.append((int(values[0]), int(values[1]), int(values[2])))
+
+        return scores
+
+    def getSentiment(
+        self, df_text: Union[str, Sequence[str]], score: str = "scale"
+    ) -> List[Union[int, Tuple[int, ...]]]:
+        # same interface as sentistrength.PySentiStr so callers can use either
+        texts = [df_text] if isinstance(df_text, str) else list(df_text)
+        if len(texts) == 0:
+            return []
+
+        return convert_scores(self.get_trinary_scores(texts), score)
+
+
+class CachedSentiStrength:
+
+    def __init__(self, server: SentiStrengthServer, cache: ScoreCache) -> None:
+        self.server: SentiStrengthServer = server
+        self.cache: ScoreCache = cache
+
+    def getSentiment(
+        self, df_text: Union[str, Sequence[str]], score: str = "scale"
+    ) -> List[Union[int, Tuple[int, ...]]]:
+        texts = [df_text] if isinstance(df_text, str) else list(df_text)
+        if len(texts) == 0:
+            return []
+
+        # key on the text as SentiStrength receives it, so equal inputs share a score
+        keys = [hash_text(encode_text(text)) for text in texts]
+        scores = self.cache.get_many(keys)
+        hit_count = len(scores)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in scores:
+                missing.setdefault(key, text)
+
+        if len(missing) > 0:
+            missing_scores = self.server.get_trinary_scores(list(missing.values()))
+            computed = dict(zip(missing.keys(), missing_scores))
+            self.cache.put_many(computed)
+            scores.update(computed)
+
+        LOGGER.debug(
+            f"Sentiment cache: {hit_count} hits, {len(missing)} misses "
+            f"({self.cache.hits} hits, {self.cache.misses} misses in total)"
+        )
+        return convert_scores([tuple(scores[key]) for key in keys], score)
+
+
+def encode_text(text: str) -> str:
+    # mirrors PySentiStr, newlines would split a text and spaces are sent as '+'
+    return text.replace("\n", "").replace("\r", "").replace(" ", "+")
+
+
+def convert_scores(
+    scores: List[Tuple[int, int, int]], score: str
+) -> List[Union[int, Tuple[int, ...]]]:
+    if score == "scale":
+        return [positive + negative for positive, negative, _ in scores]
+    elif score == "binary":
+        return [1 if positive >= abs(negative) else -1 for positive, negative, _ in scores]
+    elif score == "trinary":
+        return list(scores)
+    elif score == "dual":
+        return [(positive, negative) for positive, negative, _ in scores]
+
+    raise ValueError(
+        f"Unknown score type {score}. It should be one of scale, binary, trinary or dual."
+    )
+
+
+_servers: Dict[str, SentiStrengthServer] = {}
+_servers_lock: threading.Lock = threading.Lock()
+
+
+def get_senti_server(senti_strength_path: str) -> SentiStrengthServer:
+    # one JVM per process, shared by every analysis and every job the process runs
+    senti_strength_path = os.path.abspath(senti_strength_path)
+    with _servers_lock:
+        if senti_strength_path not in _servers:
+            _servers[senti_strength_path] = SentiStrengthServer(
+                os.path.join(senti_strength_path, "SentiStrength.jar"),
+                os.path.join(senti_strength_path, "SentiStrength_Data"),
+            )
+        return _servers[senti_strength_path]
+
+
+@atexit.register
+def close_senti_servers() -> None:
+    with _servers_lock:
+        for server in _servers.values():
+            server.close()
+        _servers.clear()
@@ -1,53 +1,98 @@
-import csv
-import os
 import warnings
 from logging import Logger
-from typing import List, Dict
-
-from joblib import load
+from typing import Any, Dict, List
 
 from MLbackend.src.configuration import Configuration
+from MLbackend.src.metrics_store import MetricValue
+from MLbackend.src.model_registry import SMELLS, get_model_registry
 from MLbackend.src.utils.result import Result
 
 warnings.filterwarnings("ignore")
 
+# names to extract from the batch results, in the order the models expect them
+METRIC_NAMES: List[str] = [
+    "AuthorCount",
+    "DaysActive",
+    "CommitCount",
+    "AuthorCommitCount_stdev",
+    "commitCentrality_NumberHighCentralityAuthors",
+    "commitCentrality_PercentageHighCentralityAuthors",
+    "SponsoredAuthorCount",
+    "PercentageSponsoredAuthors",
+    "NumberPRs",
+    "PRParticipantsCount_stdev",
+    "PRParticipantsCount_mean",
+    "NumberIssues",
+    "IssueParticipantCount_stdev",
+    "IssueCountPositiveComments_mean",
+    "commitCentrality_Centrality_count",
+    "commitCentrality_Centrality_stdev",
+    "commitCentrality_Betweenness_count",
+    "commitCentrality_Closeness_count",
+    "commitCentrality_Density",
+    "commitCentrality_CommunityAuthorCount_count",
+    "commitCentrality_CommunityAuthorItemCount_mean",
+    "commitCentrality_CommunityAuthorItemCount_stdev",
+    "commitCentrality_CommunityAuthorCount_mean",
+    "commitCentrality_CommunityAuthorCount_stdev",
+    "TimezoneCount",
+    "TimezoneCommitCount_mean",
+    "TimezoneCommitCount_stdev",
+    "TimezoneAuthorCount_mean",
+    "TimezoneAuthorCount_stdev",
+    "NumberReleases",
+    "ReleaseCommitCount_mean",
+    "ReleaseCommitCount_stdev",
+    "FN",
+    "PRDuration_mean",
+    "IssueDuration_mean",
+    "BusFactorNumber",
+    "commitCentrality_TFN",
+    "commitCentrality_TFC",
+    "PRCommentsCount_mean",
+    "PRCommitsCount_mean",
+    "NumberIssueComments",
+    "IssueCommentsCount_mean",
+    "IssueCommentsCount_stdev",
+    "PRCommentsToxicityPercentage",
+    "IssueCommentsToxicityPercentage",
+    "RPCPR",
+    "RPCIssue",
+    "IssueCountNegativeComments_mean",
+    "PRCountNegativeComments_mean",
+    "ACCL",
+]
+
+
+def smell_detection(
+    config: Configuration, batch_count: int, logger: Logger, result: Result
+) -> List[Dict[str, Any]]:
+
+    # every batch's finalized results, as the analyses stored them
+    batch_results = [config.metrics.get(batch_idx) for batch_idx in range(batch_count)]
+    metrics = [build_metrics_list(results, logger)[0] for results in batch_results]
+
+    # detect smells of all batches at once with the models this process already loaded
+    models = get_model_registry(METRIC_NAMES, logger)
+    raw_smells = models.predict(metrics)
+
+    smell_results = []
+    for batch_idx, results in enumerate(batch_results):
+        detected_smells = [smell for smell in SMELLS if raw_smells[smell][batch_idx] == 1]
+        for smell in detected_smells:
+            result.add_smell(batch_idx=batch_idx, smell=smell)
 
-def smell_detection(config: Configuration, batch_idx: int, logger: Logger, result: Result) -> Dict[str, float]:
-
-    # prepare results holder for easy mapping
-    results = {}
-
-    # open finalized results for reading
-    project_csv_path = os.path.join(config.results_path, f"results_{batch_idx}.csv")
-    with open(project_csv_path, newline="") as csv_file:
-        rows = csv.reader(csv_file, delimiter=",")
-
-        # parse into a dictionary
-        for row in rows:
-            results[row[0]] = row[1]
-
-    metrics = build_metrics_list(results, logger)
-
-    # load all models
-    smells = ["OSE", "BCE", "PDE", "SV", "OS", "SD", "RS", "TF", "UI", "TC"]
-    all_models = {}
+        config.metrics.set(batch_idx, "SmellPredictionSeconds", models.predict_seconds)
+        smell_results.append(batch_smell_results(results, detected_smells, result))
 
-    for smell in smells:
-        model_path = os.path.abspath("MLbackend/models/{}.joblib".format(smell))
-        all_models[smell] = load(model_path)
+    return smell_results
 
-    # detect smells
 
-    raw_smells = {
-        smell_name: smell_model.predict(metrics)
-        for smell_name, smell_model in all_models.items()
-    }
-    detected_smells = [smell for smell in smells if raw_smells[smell][0] == 1]
-    for smell in smells:
-        if raw_smells[smell][0] == 1:
-            result.add_smell(batch_idx=batch_idx, smell=smell)
+def batch_smell_results(
+    results: Dict[str, MetricValue], detected_smells: List[str], result: Result
+) -> Dict[str, Any]:
 
-        # Prepare additional values
+    # Prepare additional values
     additional_metrics = {"commit_count": results.get("commit_count", 0), "days_active": results.get("days_active", 0),
                           "FirstCommitDate": results.get("FirstCommitDate", ""),
                           "LastCommitDate": results.get("LastCommitDate", ""),
@@ -78,63 +123,10 @@ def smell_detection(config: Configuration, batch_idx: int, logger: Logger, resul
 
 def build_metrics_list(results: dict, logger: Logger) -> List[List[float]]:
 
-    # declare names to extract from the results file in the right order
-    names: List[str] = [
-        "AuthorCount",
-        "DaysActive",
-        "CommitCount",
-        "AuthorCommitCount_stdev",
-        "commitCentrality_NumberHighCentralityAuthors",
-        "commitCentrality_PercentageHighCentralityAuthors",
-        "SponsoredAuthorCount",
-        "PercentageSponsoredAuthors",
-        "NumberPRs",
-        "PRParticipantsCount_stdev",
-        "PRParticipantsCount_mean",
-        "NumberIssues",
-        "IssueParticipantCount_stdev",
-        "IssueCountPositiveComments_mean",
-        "commitCentrality_Centrality_count",
-        "commitCentrality_Centrality_stdev",
-        "commitCentrality_Betweenness_count",
-        "commitCentrality_Closeness_count",
-        "commitCentrality_Density",
-        "commitCentrality_CommunityAuthorCount_count",
-        "commitCentrality_CommunityAuthorItemCount_mean",
-        "commitCentrality_CommunityAuthorItemCount_stdev",
-        "commitCentrality_CommunityAuthorCount_mean",
-        "commitCentrality_CommunityAuthorCount_stdev",
-        "TimezoneCount",
-        "TimezoneCommitCount_mean",
-        "TimezoneCommitCount_stdev",
-        "TimezoneAuthorCount_mean",
-        "TimezoneAuthorCount_stdev",
-        "NumberReleases",
-        "ReleaseCommitCount_mean",
-        "ReleaseCommitCount_stdev",
-        "FN",
-        "PRDuration_mean",
-        "IssueDuration_mean",
-        "BusFactorNumber",
-        "commitCentrality_TFN",
-        "commitCentrality_TFC",
-        "PRCommentsCount_mean",
-        "PRCommitsCount_mean",
-        "NumberIssueComments",
-        "IssueCommentsCount_mean",
-        "IssueCommentsCount_stdev",
-        "PRCommentsToxicityPercentage",
-        "IssueCommentsToxicityPercentage",
-        "RPCPR",
-        "RPCIssue",
-        "IssueCountNegativeComments_mean",
-        "PRCountNegativeComments_mean",
-        "ACCL",
-    ]
 
     # build key/value list
     metrics: List[float] = []
-    for name in names:
+    for name in METRIC_NAMES:
 
         # default value if key isn't present or the value is blank
         result: float = results.get(name) or 0
@@ -1,8 +1,7 @@
-import csv
-import os
 from logging import Logger
 from statistics import StatisticsError, mean, stdev
 
+from MLbackend.src.metrics_store import MetricsStore
 from MLbackend.src.utils.result import Result
 
 
@@ -10,7 +9,7 @@ def output_statistics(
     idx: int,
     data: list,
     metric: str,
-    output_dir: str,
+    metrics: MetricsStore,
     logger: Logger,
     result: Result = None,
 ):
@@ -23,11 +22,8 @@ def output_statistics(
     stats = calculate_stats(data, logger)
 
     # output
-    with open(os.path.join(output_dir, f"results_{idx}.csv"), "a", newline="") as f:
-        w = csv.writer(f, delimiter=",")
-
-        for key in stats:
-            output_value(w, metric, key, stats)
+    for key in stats:
+        output_value(metrics, idx, metric, key, stats)
 
     if result:
         result.add_metric_data(
@@ -60,7 +56,7 @@ def calculate_stats(data, logger: Logger):
     return stats
 
 
-def output_value(w, metric: str, name: str, dict: dict):
+def output_value(metrics: MetricsStore, idx: int, metric: str, name: str, dict: dict):
     value = dict[name]
     name = "{0}_{1}".format(metric, name)
-    w.writerow([name, value])
+    metrics.set(idx, name, value)
@@ -2,17 +2,20 @@ import csv
 import datetime
 import os
 from logging import Logger
-from typing import List, Any
+from typing import Any, List, Optional, Tuple
 
 import git
+import numpy as np
 from dateutil.relativedelta import relativedelta
 
+from MLbackend.src.commit_table import CommitTable
 from MLbackend.src.configuration import Configuration
 from MLbackend.src.stats_analysis import output_statistics
 
 
 def tag_analysis(
     repo: git.Repo,
+    commits: CommitTable,
     delta: relativedelta,
     batch_dates: List[datetime.datetime],
     days_active: List[int],
@@ -25,17 +28,25 @@ def tag_analysis(
     logger.info("Sorting tags")
     tags = sorted(repo.tags, key=get_tagged_date)
 
+    # tags are counted on the commit table instead of walking the repository once per tag
+    commit_rows = {hexsha: idx for idx, hexsha in enumerate(commits.hexshas())}
+    parents = commits.parent_indices()
+
     # get tag list
     if len(tags) > 0:
         last_tag = None
         for tag in tags:
-            commit_count = 0
-            if last_tag is None:
-                commit_count = len(list(tag.commit.iter_items(repo, tag.commit)))
+            since = None
+            if last_tag is not None:
+                since = start_of_day(get_tagged_date(last_tag))
+
+            tag_commit_idx = commit_rows.get(tag.commit.hexsha)
+            if tag_commit_idx is None:
+                # the tag isn't part of the analysed history, so only git knows its commits
+                commit_count = count_tag_commits(repo, tag, since)
             else:
-                since_str = format_date(get_tagged_date(last_tag))
-                commit_count = len(
-                    list(tag.commit.iter_items(repo, tag.commit, after=since_str))
+                commit_count = count_reachable_commits(
+                    tag_commit_idx, parents, commits.committed_dates, since
                 )
 
             tag_info.append(
@@ -81,20 +92,12 @@ def output_tags(
         logger.warning(f"Number of days active is 0 for tag at date {tag_info}.")
 
     # output non-tabular results
-    with open(
-        os.path.join(config.results_path, f"results_{idx}.csv"), "a", newline=""
-    ) as f:
-        w = csv.writer(f, delimiter=",")
-        w.writerow(["Tag Count", len(tag_info)])
+    config.metrics.set(idx, "Tag Count", len(tag_info))
 
     # output tag info
     logger.info("Outputting CSVs with tag information.")
 
-    with open(
-        os.path.join(config.results_path, f"results_{idx}.csv"), "a", newline=""
-    ) as f:
-        w = csv.writer(f, delimiter=",")
-        w.writerow(["FN", fn])
+    config.metrics.set(idx, "FN", fn)
 
     with open(
         os.path.join(config.metricsPath, f"tags_{idx}.csv"), "a", newline=""
@@ -108,12 +111,52 @@ def output_tags(
         idx,
         [tag["commit_count"] for tag in tag_info],
         "TagCommitCount",
-        config.results_path,
+        config.metrics,
         logger,
     )
     return [tag["commit_count"] for tag in tag_info]
 
 
+def count_reachable_commits(
+    commit_idx: int,
+    parents: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    committed_dates: np.ndarray,
+    since: Optional[datetime.datetime],
+) -> int:
+    # like git's --after, the walk stops at commits from before the previous tag's day
+    parent_starts, parent_ends, parent_idxs = parents
+    since_timestamp = None if since is None else since.timestamp()
+
+    seen = {commit_idx}
+    pending = [commit_idx]
+    commit_count = 0
+    while pending:
+        idx = pending.pop()
+        if since_timestamp is not None and committed_dates[idx] < since_timestamp:
+            continue
+
+        commit_count += 1
+        for parent_idx in parent_idxs[parent_starts[idx] : parent_ends[idx]].tolist():
+            if parent_idx not in seen:
+                seen.add(parent_idx)
+                pending.append(parent_idx)
+
+    return commit_count
+
+
+def count_tag_commits(
+    repo: git.Repo, tag: git.TagReference, since: Optional[datetime.datetime]
+) -> int:
+    if since is None:
+        return len(list(tag.commit.iter_items(repo, tag.commit)))
+
+    return len(list(tag.commit.iter_items(repo, tag.commit, after=since.isoformat())))
+
+
+def start_of_day(value: datetime.datetime) -> datetime.datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
 def get_tagged_date(tag):
     date = None
 
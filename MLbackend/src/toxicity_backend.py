@@ -0,0 +1,45 @@
+from logging import Logger
+from typing import Iterable, List, Optional, Protocol, Union
+
+from MLbackend.src.lexicon_toxicity import (LexiconToxicityModel,
+                                            get_lexicon_model)
+from MLbackend.src.perspective_client import PerspectiveClient
+
+PERSPECTIVE: str = "perspective"
+LEXICON: str = "lexicon"
+TOXICITY_BACKENDS: List[str] = [PERSPECTIVE, LEXICON]
+
+
+class ToxicityBackend(Protocol):
+    # scores comments between 0 and 1, comments scoring 0.5 or more count as toxic
+
+    def is_available(self) -> bool:
+        ...
+
+    def score_many(self, comments: Iterable[str], logger: Logger) -> List[float]:
+        ...
+
+
+def create_toxicity_backend(
+    backend: str,
+    perspective_url: str,
+    google_key: Optional[str],
+    perspective_qps: float,
+    perspective_concurrency: int,
+    perspective_model_version: str,
+    perspective_offline: bool,
+) -> Union[PerspectiveClient, LexiconToxicityModel]:
+    if backend == LEXICON:
+        return get_lexicon_model()
+
+    if backend == PERSPECTIVE:
+        return PerspectiveClient(
+            perspective_url,
+            google_key,
+            perspective_qps,
+            perspective_concurrency,
+            perspective_model_version,
+            perspective_offline,
+        )
+
+    raise ValueError(f"Unknown toxicity backend {backend}, expected one of {TOXICITY_BACKENDS}.")
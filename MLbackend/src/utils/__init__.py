@@ -1,6 +1,5 @@
 import math
 import sys
-import threading
 from datetime import datetime
 from logging import Logger
 from typing import Optional
@@ -26,31 +25,6 @@ def iter_len(obj: iter):
     return sum(1 for _ in obj)
 
 
-def analyze_sentiments(
-    senti, comments, positive_comments, negative_comments, generally_negative, semaphore
-):
-    with semaphore:
-        comment_sentiments = (
-            senti.getSentiment(comments, score="scale")
-            if len(comments) > 1
-            else senti.getSentiment(comments[0])
-        )
-
-        comment_sentiments_positive = sum(
-            1 for _ in filter(lambda value: value >= 1, comment_sentiments)
-        )
-        comment_sentiments_negative = sum(
-            1 for _ in filter(lambda value: value <= -1, comment_sentiments)
-        )
-
-        lock = threading.Lock()
-        with lock:
-            positive_comments.append(comment_sentiments_positive)
-            negative_comments.append(comment_sentiments_negative)
-
-            if comment_sentiments_negative / len(comments) > 0.5:
-                generally_negative.append(True)
-
 def get_stats(stat_type: str, logger: Logger, batch_idx: int, batch, batch_participants, senti, batch_comments):
     logger.info(f"Analyzing {stat_type} batch #{batch_idx}")
 
@@ -66,8 +40,7 @@ def get_stats(stat_type: str, logger: Logger, batch_idx: int, batch, batch_parti
     negative_comments = list()
     generally_negative = list()
 
-    semaphore = threading.Semaphore(15)
-    threads = []
+    entity_comment_counts = list()
 
     for pr in batch:
 
@@ -108,26 +81,23 @@ def get_stats(stat_type: str, logger: Logger, batch_idx: int, batch, batch_parti
             continue
 
         all_comments.extend(comments)
+        entity_comment_counts.append(len(comments))
 
-        thread = threading.Thread(
-            target=analyze_sentiments,
-            args=(
-                senti,
-                comments,
-                positive_comments,
-                negative_comments,
-                generally_negative,
-                semaphore,
-            ),
-        )
-        threads.append(thread)
+    # score the whole batch in one round trip and split the scores back per entity
+    comment_sentiments = senti.getSentiment(all_comments, score="scale")
+    offset = 0
+    for comment_count in entity_comment_counts:
+        entity_sentiments = comment_sentiments[offset : offset + comment_count]
+        offset += comment_count
 
+        entity_sentiments_positive = sum(1 for value in entity_sentiments if value >= 1)
+        entity_sentiments_negative = sum(1 for value in entity_sentiments if value <= -1)
 
-    for thread in threads:
-        thread.start()
+        positive_comments.append(entity_sentiments_positive)
+        negative_comments.append(entity_sentiments_negative)
 
-    for thread in threads:
-        thread.join()
+        if entity_sentiments_negative / comment_count > 0.5:
+            generally_negative.append(True)
 
     # save comments
     batch_comments.append(all_comments)
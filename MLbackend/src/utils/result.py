@@ -3,6 +3,19 @@ from logging import Logger
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
+# the values commit analysis keeps per batch, in the order it adds them
+BATCH_FIELDS: List[str] = [
+    "_timezone_counts",
+    "_commit_count",
+    "_author_counts",
+    "_sponsored_author_counts",
+    "_percentage_sponsored_authors",
+    "_first_commit_dates",
+    "_last_commit_dates",
+    "_days_active",
+    "_metric_datas",
+]
+
 
 class Result:
 
@@ -30,6 +43,35 @@ class Result:
     def set_smell_results(self, smell_results) -> None:
         self.smell_results = smell_results
 
+    def snapshot(self) -> Dict[str, Any]:
+        # everything but the logger, so a finished result can be stored and restored later
+        return {key: value for key, value in self.__dict__.items() if key != "logger"}
+
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        self.__dict__.update(snapshot)
+        self.logger.info("All values of Result are restored from a previous analysis")
+        return None
+
+    def batch_snapshot(self, batch_idx: int) -> Dict[str, Any]:
+        # a batch without metric data has no entry in _metric_datas
+        return {
+            field: getattr(self, field)[batch_idx]
+            for field in BATCH_FIELDS
+            if batch_idx < len(getattr(self, field))
+        }
+
+    def restore_batch(self, batch_idx: int, snapshot: Dict[str, Any]) -> None:
+        if batch_idx >= len(self._batch_dates):
+            self.logger.error(
+                f"Mismatch between batch size of {len(self._batch_dates)} and restored batch of {batch_idx + 1}"
+            )
+            raise ValueError(
+                f"The index provided for the batch {batch_idx} is greater than length of batch dates {len(self._batch_dates)}!!"
+            )
+        for field, value in snapshot.items():
+            getattr(self, field).insert(batch_idx, value)
+        return None
+
     @property
     def commit_count(self) -> List[int]:
         return self._commit_count
@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import MagicMock, patch, mock_open
 from MLbackend.src.alias_worker import replace_aliases
+from MLbackend.src.commit_record import CommitRecord
 
 
 class MockConfiguration:
@@ -62,6 +63,23 @@ class TestReplaceAliases(unittest.TestCase):
 
         self.assertEqual(actual_emails, ["email1@example.com"])
 
+    @patch(
+        "builtins.open",
+        new_callable=mock_open,
+        read_data="alias1:\n  - email1@example.com\n",
+    )
+    @patch("os.path.exists", return_value=True)
+    def test_commit_records(self, mock_exists, mock_open):
+        commits = [
+            CommitRecord("a" * 40, "Dev", "email1@example.com", 0, 0, 0, 0, "first"),
+            CommitRecord("b" * 40, "Dev", "email1@example.com", 0, 0, 0, 0, "second"),
+        ]
+        result = list(replace_aliases(commits, self.mock_config, self.mock_logger))
+        actual_emails = [commit.author.email for commit in result]
+
+        self.assertEqual(actual_emails, ["alias1", "alias1"])
+        self.assertFalse(hasattr(result[0], "__dict__"))
+
     def test_empty_commits_list(self):
         result = list(replace_aliases([], self.mock_config, self.mock_logger))
         self.assertEqual(result, [])
@@ -0,0 +1,270 @@
+import threading
+from datetime import datetime, timezone
+from logging import Logger
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+import git
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from MLbackend.src.analysis_state import (AnalysisState,
+                                          compute_batch_fingerprints,
+                                          describe_inputs)
+from MLbackend.src.batch_outputs import BatchOutputs
+from MLbackend.src.commit_record import CommitRecord
+from MLbackend.src.commit_table import CommitTable, read_commit_log
+from MLbackend.src.configuration import Configuration
+from MLbackend.src.toxicity_backend import LEXICON, PERSPECTIVE
+from MLbackend.src.utils.result import Result
+
+
+def add_commit(repo: git.Repo, message: str) -> git.Commit:
+    file_path = Path(repo.working_tree_dir, "history.txt")
+    with open(file_path, "a") as file:
+        file.write(f"{message}\n")
+    repo.index.add([str(file_path)])
+    return repo.index.commit(
+        message,
+        author=git.Actor("Dev", "dev@example.com"),
+        committer=git.Actor("Dev", "dev@example.com"),
+    )
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> git.Repo:
+    repo = git.Repo.init(tmp_path / "repo")
+    add_commit(repo, "first")
+    add_commit(repo, "second")
+    return repo
+
+
+def test_onlyNewCommitsAreWalked(tmp_path: Path, repo: git.Repo) -> None:
+    state = AnalysisState(str(tmp_path / "state"), MagicMock(spec=Logger))
+    assert len(state.load_commits(repo)) == 2
+    state.save()
+    state.close()
+
+    new_commit = add_commit(repo, "third")
+    state = AnalysisState(str(tmp_path / "state"), MagicMock(spec=Logger))
+    previous_head = state.head_sha
+    with patch(
+        "MLbackend.src.analysis_state.read_commit_log", wraps=read_commit_log
+    ) as mock_read_commit_log:
+        commits = state.load_commits(repo)
+
+    mock_read_commit_log.assert_called_once_with(
+        repo, f"{previous_head}..{new_commit.hexsha}", None
+    )
+    records = list(commits)
+    assert [record.message.strip() for record in records] == ["third", "second", "first"]
+    assert records[0].committed_datetime == new_commit.committed_datetime
+    assert records[0].authored_datetime == new_commit.authored_datetime
+    assert commits.parent_hexshas(0) == [new_commit.parents[0].hexsha]
+
+    return None
+
+
+def test_rewrittenHistoryIsWalkedAgain(tmp_path: Path, repo: git.Repo) -> None:
+    state = AnalysisState(str(tmp_path / "state"), MagicMock(spec=Logger))
+    state.load_commits(repo)
+    state.save()
+    state.close()
+
+    repo.git.reset("--hard", "HEAD~1")
+    add_commit(repo, "rewritten")
+    state = AnalysisState(str(tmp_path / "state"), MagicMock(spec=Logger))
+
+    records = state.load_commits(repo)
+
+    assert [record.message.strip() for record in records] == ["rewritten", "first"]
+
+    return None
+
+
+def test_earlierStartDateIsWalkedAgain(tmp_path: Path) -> None:
+    repo = git.Repo.init(tmp_path / "repo")
+    first_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    second_date = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    for message, date in [("first", first_date), ("second", second_date)]:
+        repo.index.commit(
+            message,
+            author=git.Actor("Dev", "dev@example.com"),
+            committer=git.Actor("Dev", "dev@example.com"),
+            author_date=date.strftime("%Y-%m-%dT%H:%M:%S"),
+            commit_date=date.strftime("%Y-%m-%dT%H:%M:%S"),
+        )
+
+    state = AnalysisState(str(tmp_path / "state"), MagicMock(spec=Logger))
+    assert len(state.load_commits(repo, second_date)) == 1
+
+    with patch(
+        "MLbackend.src.analysis_state.read_commit_log", wraps=read_commit_log
+    ) as mock_read_commit_log:
+        assert len(state.load_commits(repo, second_date + relativedelta(days=1))) == 1
+        mock_read_commit_log.assert_not_called()
+
+        assert len(state.load_commits(repo, first_date)) == 2
+        mock_read_commit_log.assert_called_once_with(repo, since=first_date)
+
+    assert state.since == first_date.isoformat()
+
+    return None
+
+
+def test_nodesAreMergedByNumber(tmp_path: Path) -> None:
+    state = AnalysisState(str(tmp_path / "state"), MagicMock(spec=Logger))
+    state.merge_nodes(
+        "issues",
+        [
+            {"number": 2, "updatedAt": "2024-02-01T00:00:00Z"},
+            {"number": 1, "updatedAt": "2024-01-01T00:00:00Z"},
+        ],
+    )
+
+    nodes = state.merge_nodes("issues", [{"number": 2, "updatedAt": "2024-03-01T00:00:00Z"}])
+
+    assert nodes == [
+        {"number": 1, "updatedAt": "2024-01-01T00:00:00Z"},
+        {"number": 2, "updatedAt": "2024-03-01T00:00:00Z"},
+    ]
+    assert state.updated_at["issues"] == "2024-03-01T00:00:00Z"
+
+    return None
+
+
+def test_onlyTouchedBatchesChangeFingerprint() -> None:
+    delta = relativedelta(months=+1)
+    batch_dates = [
+        datetime(2024, 1, 1, tzinfo=timezone.utc),
+        datetime(2024, 2, 1, tzinfo=timezone.utc),
+    ]
+    commit_batches = [
+        CommitTable.from_records([CommitRecord("a" * 40, "Dev", "dev@example.com", 0, 0, 0, 0, "first")]),
+        CommitTable.from_records([CommitRecord("b" * 40, "Dev", "dev@example.com", 0, 0, 0, 0, "second")]),
+    ]
+    issue = {"number": 1, "createdAt": "2024-02-10T00:00:00Z", "updatedAt": "2024-02-10T00:00:00Z"}
+
+    before = compute_batch_fingerprints(commit_batches, batch_dates, delta, dict(issues=[issue]), [])
+    issue["updatedAt"] = "2024-05-01T00:00:00Z"
+    after = compute_batch_fingerprints(commit_batches, batch_dates, delta, dict(issues=[issue]), [])
+
+    assert before[0] == after[0]
+    assert before[1] != after[1]
+    assert before[2] == after[2]
+
+    return None
+
+
+@pytest.mark.parametrize(
+    "fingerprints, expected_batches",
+    [
+        (["a", "b", "c", "extra"], [0, 1, 2]),
+        (["a", "x", "c", "extra"], [0, 2]),
+        # PRs and issues outside of every batch belong to the last batch
+        (["a", "b", "c", "other"], [0, 1]),
+        # a new batch also takes over the PRs and issues the previous last batch had
+        (["a", "b", "c", "d", "extra"], [0, 1]),
+    ],
+)
+def test_onlyUnchangedBatchesAreReused(
+    tmp_path: Path, fingerprints: List[str], expected_batches: List[int]
+) -> None:
+    state = AnalysisState(str(tmp_path / "state"), MagicMock(spec=Logger))
+    assert state.reusable_batches(fingerprints) == []
+
+    outputs = BatchOutputs()
+    for idx in range(3):
+        outputs.put(idx, "metrics", {"commit_count": idx})
+    result = MagicMock(spec=Result)
+    result.pdf_file_path = str(tmp_path / "smell_report.pdf")
+    result.snapshot.return_value = {}
+    (tmp_path / "smell_report.pdf").write_bytes(b"%PDF")
+    state.store_result(result, ["a", "b", "c", "extra"], outputs)
+
+    reused_batches = state.reusable_batches(fingerprints)
+    restored = BatchOutputs()
+    state.restore_batches(restored, reused_batches)
+
+    assert reused_batches == expected_batches
+    assert [restored.is_reused(idx) for idx in range(3)] == [idx in expected_batches for idx in range(3)]
+    assert restored.get(0, "metrics") == {"commit_count": 0}
+    assert state.can_reuse(["a", "b", "c", "extra"])
+    assert state.can_reuse(fingerprints) == (fingerprints == ["a", "b", "c", "extra"])
+    state.close()
+
+    return None
+
+
+def test_secondAnalysisWaitsForTheFirst(tmp_path: Path) -> None:
+    first = AnalysisState(str(tmp_path / "state"), MagicMock(spec=Logger))
+    first.batch_fingerprints = ["a", "extra"]
+    second_states = []
+
+    thread = threading.Thread(
+        target=lambda: second_states.append(
+            AnalysisState(str(tmp_path / "state"), MagicMock(spec=Logger))
+        )
+    )
+    thread.start()
+    thread.join(timeout=0.5)
+    assert thread.is_alive()
+
+    first.save()
+    first.close()
+    thread.join(timeout=5)
+
+    assert second_states[0].batch_fingerprints == ["a", "extra"]
+    assert not any(path.name.endswith(".tmp") for path in (tmp_path / "state").iterdir())
+    second_states[0].close()
+
+    return None
+
+
+def store_outputs(state: AnalysisState, tmp_path: Path, fingerprints: List[str]) -> None:
+    outputs = BatchOutputs()
+    outputs.put(0, "metrics", {"commit_count": 1})
+    result = MagicMock(spec=Result)
+    result.pdf_file_path = str(tmp_path / "smell_report.pdf")
+    result.snapshot.return_value = {}
+    (tmp_path / "smell_report.pdf").write_bytes(b"%PDF")
+    state.store_result(result, fingerprints, outputs)
+    return None
+
+
+@pytest.mark.parametrize(
+    "changed_settings",
+    [
+        dict(toxicity_backend=LEXICON),
+        dict(toxicity_backend=PERSPECTIVE, perspective_model_version="TOXICITY/de"),
+        dict(toxicity_backend=PERSPECTIVE, perspective_offline=True),
+    ],
+)
+def test_changedScoringInvalidatesReuse(
+    tmp_path: Path, repo: git.Repo, changed_settings: Dict[str, Any]
+) -> None:
+    def fingerprint(**settings: Any) -> List[str]:
+        config = Configuration(
+            "https://github.com/owner/repo", 1, str(tmp_path), "", 0, "", "", None, **settings
+        )
+        return compute_batch_fingerprints(
+            [CommitTable.from_records([])],
+            [datetime(2024, 1, 1, tzinfo=timezone.utc)],
+            relativedelta(months=+1),
+            {},
+            describe_inputs(repo, config),
+        )
+
+    state = AnalysisState(str(tmp_path / "state"), MagicMock(spec=Logger))
+    before = fingerprint(toxicity_backend=PERSPECTIVE)
+    store_outputs(state, tmp_path, before)
+    after = fingerprint(**changed_settings)
+
+    assert state.can_reuse(before)
+    assert state.reusable_batches(before) == [0]
+    assert not state.can_reuse(after)
+    assert state.reusable_batches(after) == []
+    state.close()
+
+    return None
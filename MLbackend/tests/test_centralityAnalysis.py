@@ -0,0 +1,114 @@
+import time
+from datetime import datetime, timezone
+from logging import Logger
+from unittest.mock import MagicMock, patch
+
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from MLbackend.benchmarks.benchmark_centrality import (
+    find_related_authors_pairwise, find_related_participants_rescan,
+    generate_commits, generate_threads)
+from MLbackend.src.centrality_analysis import (centrality_analysis,
+                                               find_related_authors,
+                                               find_related_participants)
+from MLbackend.src.commit_record import CommitRecord
+from MLbackend.src.commit_table import CommitTable
+from MLbackend.src.configuration import Configuration
+from MLbackend.src.utils.result import Result
+
+
+@pytest.fixture
+def local_timezone(monkeypatch):
+    # commit windows are computed on local dates, so cover a zone with daylight saving changes
+    monkeypatch.setenv("TZ", "America/Halifax")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_sweepMatchesPairwiseScan(local_timezone, seed: int) -> None:
+    commits = generate_commits(400, author_count=15, days=2 * 365, seed=seed)
+
+    assert find_related_authors(commits) == find_related_authors_pairwise(list(commits))
+
+    return None
+
+
+def test_windowEdgesAreInclusiveAcrossMonthEnds(local_timezone) -> None:
+    def commit(author: str, date: datetime) -> CommitRecord:
+        timestamp = int(date.timestamp())
+        return CommitRecord("0" * 40, author, f"{author}@example.com", timestamp, 0, timestamp, 0, "")
+
+    commits = [
+        commit("a", datetime(2024, 3, 31, 12)),
+        commit("b", datetime(2024, 2, 29, 12)),
+        commit("c", datetime(2024, 2, 29, 11, 59)),
+        commit("d", datetime(2024, 4, 30, 12)),
+    ]
+
+    related_authors, author_commits = find_related_authors(CommitTable.from_records(commits))
+
+    assert related_authors == find_related_authors_pairwise(commits)[0]
+    assert related_authors["a@example.com"] == {"b@example.com", "d@example.com"}
+    assert author_commits["a@example.com"] == 1
+
+    return None
+
+
+def test_noCommitsGiveNoAuthors() -> None:
+    assert find_related_authors(CommitTable.from_records([])) == ({}, {})
+
+    return None
+
+
+@pytest.mark.parametrize("mode", ["pairs", "sparse", "auto"])
+def test_coParticipationMatchesRescan(mode: str) -> None:
+    threads = generate_threads(150, author_count=40, max_participants=8)
+    threads.append(["solo", "solo"])
+    threads.append([])
+
+    assert find_related_participants(threads, mode) == find_related_participants_rescan(threads)
+
+    return None
+
+
+def test_unknownCoParticipationModeRaises() -> None:
+    with pytest.raises(ValueError):
+        find_related_participants([["a", "b"]], "dense")
+
+    return None
+
+
+def test_reusedBatchesAreNotAnalysedAgain() -> None:
+    config = Configuration("https://github.com/owner/repo", 1, "", "", 0, "", "", None)
+    config.batch_outputs.reuse({0: {"centrality": (["a@example.com"], ["meta"], ["metric"])}}, [0])
+    result = MagicMock(spec=Result)
+    batch_dates = [
+        datetime(2024, 1, 1, tzinfo=timezone.utc),
+        datetime(2024, 2, 1, tzinfo=timezone.utc),
+    ]
+
+    with patch(
+        "MLbackend.src.centrality_analysis.process_batch",
+        return_value=(["b@example.com"], ["new meta"], ["new metric"]),
+    ) as mock_process_batch:
+        core_devs, meta, metric = centrality_analysis(
+            CommitTable.from_records([]),
+            relativedelta(months=+1),
+            batch_dates,
+            config,
+            MagicMock(spec=Logger),
+            result,
+        )
+
+    assert mock_process_batch.call_count == 1
+    assert mock_process_batch.call_args.args[0] == 1
+    assert core_devs == [["a@example.com"], ["b@example.com"]]
+    assert (meta, metric) == (["meta"], ["metric"])
+    result.add_core_dev.assert_called_once_with("a@example.com")
+    assert config.batch_outputs.get(1, "centrality") == (["b@example.com"], ["new meta"], ["new metric"])
+
+    return None
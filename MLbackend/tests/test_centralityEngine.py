@@ -0,0 +1,68 @@
+from logging import Logger
+from unittest.mock import MagicMock
+
+import networkx as nx
+import pytest
+
+from MLbackend.src.centrality_engine import compute_centralities
+
+
+@pytest.fixture
+def graph() -> nx.Graph:
+    G = nx.connected_watts_strogatz_graph(120, 6, 0.2, seed=1)
+    # a second component and an isolated author, like teams that never overlap
+    G.add_edges_from([(200, 201), (201, 202)])
+    G.add_node(300)
+    return nx.relabel_nodes(G, {node: f"dev{node}@example.com" for node in G})
+
+
+def test_parallelMatchesExact(graph: nx.Graph) -> None:
+    expected_closeness = nx.closeness_centrality(graph)
+    expected_betweenness = nx.betweenness_centrality(graph)
+
+    closeness, betweenness, mode = compute_centralities(
+        graph, "parallel", 1000, 256, 3, MagicMock(spec=Logger)
+    )
+
+    assert mode == "parallel"
+    assert list(closeness) == list(graph)
+    assert closeness == pytest.approx(expected_closeness)
+    assert betweenness == pytest.approx(expected_betweenness)
+
+    return None
+
+
+def test_autoSamplesLargeGraphs(graph: nx.Graph) -> None:
+    expected_closeness = nx.closeness_centrality(graph)
+
+    first = compute_centralities(graph, "auto", 50, 60, 1, MagicMock(spec=Logger))
+    second = compute_centralities(graph, "auto", 50, 60, 1, MagicMock(spec=Logger))
+
+    assert first[2] == "approximate"
+    assert first == second
+    assert first[0]["dev300@example.com"] == 0.0
+    assert first[0]["dev201@example.com"] == pytest.approx(
+        expected_closeness["dev201@example.com"]
+    )
+    assert first[0] == pytest.approx(expected_closeness, rel=0.2)
+
+    return None
+
+
+def test_smallGraphsStayExact(graph: nx.Graph) -> None:
+    closeness, betweenness, mode = compute_centralities(
+        graph, "auto", 1000, 60, 1, MagicMock(spec=Logger)
+    )
+
+    assert mode == "exact"
+    assert closeness == nx.closeness_centrality(graph)
+    assert betweenness == nx.betweenness_centrality(graph)
+
+    return None
+
+
+def test_unknownCentralityModeRaises(graph: nx.Graph) -> None:
+    with pytest.raises(ValueError):
+        compute_centralities(graph, "fast", 1000, 256, 1, MagicMock(spec=Logger))
+
+    return None
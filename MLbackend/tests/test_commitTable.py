@@ -0,0 +1,115 @@
+from pathlib import Path
+
+import git
+import numpy as np
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from MLbackend.src.commit_analysis import split_commit_batches
+from MLbackend.src.commit_record import CommitRecord
+from MLbackend.src.commit_table import CommitTable, read_commit_log
+from MLbackend.src.configuration import Configuration
+from MLbackend.src.tag_analysis import count_reachable_commits
+
+
+def add_commit(repo: git.Repo, message: str, date: str, email: str = "dev@example.com") -> git.Commit:
+    file_path = Path(repo.working_tree_dir, f"{message.split()[0]}.txt")
+    with open(file_path, "a", encoding="utf-8") as file:
+        file.write(f"{message}\n")
+    repo.index.add([str(file_path)])
+    return repo.index.commit(
+        message,
+        author=git.Actor("Dev", email),
+        committer=git.Actor("Dev", email),
+        author_date=date,
+        commit_date=date,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> git.Repo:
+    repo = git.Repo.init(tmp_path / "repo")
+    with repo.config_writer() as writer:
+        writer.set_value("user", "name", "Dev")
+        writer.set_value("user", "email", "dev@example.com")
+    add_commit(repo, "first", "2024-01-01T10:00:00+0200")
+    add_commit(repo, "zweiter Commit – ünïcode\n\nwith a body", "2024-01-20T10:00:00-0330")
+    base = repo.head.commit
+    repo.create_tag("v1")
+
+    branch = repo.create_head("feature", base)
+    branch.checkout()
+    add_commit(repo, "feature", "2024-03-05T10:00:00+0000", "other@example.com")
+    repo.heads.master.checkout()
+    add_commit(repo, "third", "2024-03-01T10:00:00+0000")
+    merge_date = "2024-03-10T10:00:00+0000"
+    repo.git.merge(
+        "feature",
+        "--no-ff",
+        "-m",
+        "merge feature",
+        env=dict(GIT_AUTHOR_DATE=merge_date, GIT_COMMITTER_DATE=merge_date),
+    )
+    repo.create_tag("v2")
+    return repo
+
+
+def test_logStreamMatchesGitPython(repo: git.Repo) -> None:
+    table = read_commit_log(repo)
+
+    expected = [CommitRecord.from_commit(commit) for commit in repo.iter_commits()]
+    assert [record.hexsha for record in table] == [record.hexsha for record in expected]
+    for record, expected_record in zip(table, expected):
+        assert record.to_row()[:-1] == expected_record.to_row()[:-1]
+        assert record.message.strip() == expected_record.message.strip()
+        assert record.committed_datetime == expected_record.committed_datetime
+    assert [table.parent_hexshas(idx) for idx in range(len(table))] == [
+        [parent.hexsha for parent in commit.parents] for commit in repo.iter_commits()
+    ]
+
+    return None
+
+
+def test_rowsAndSlicesKeepTheirCommits(repo: git.Repo) -> None:
+    table = read_commit_log(repo)
+
+    restored = CommitTable.from_rows(table.to_rows())
+    combined = CommitTable.concat([table[:2], table[2:]])
+    reordered = table.sorted_by_commit_date()
+
+    assert restored.to_rows() == table.to_rows()
+    assert combined.to_rows() == table.to_rows()
+    assert np.all(np.diff(reordered.committed_dates) >= 0)
+    assert sorted(reordered.hexshas()) == sorted(table.hexshas())
+
+    return None
+
+
+def test_batchesFollowTheCommitDates(repo: git.Repo) -> None:
+    config = Configuration("https://github.com/owner/repo", 1, "", "", 0, "", "", None)
+
+    batches, batch_dates = split_commit_batches(read_commit_log(repo), relativedelta(months=+1), config)
+
+    assert [[record.message.split("\n")[0] for record in batch] for batch in batches] == [
+        ["first", "zweiter Commit – ünïcode"],
+        ["third", "feature", "merge feature"],
+    ]
+    assert batch_dates[0] == list(repo.iter_commits())[-1].committed_datetime
+
+    config.start_date = "2024-02-01"
+    batches, batch_dates = split_commit_batches(read_commit_log(repo), relativedelta(months=+1), config)
+    assert [len(batch) for batch in batches] == [3]
+
+    return None
+
+
+def test_tagCommitsAreCountedOnTheTable(repo: git.Repo) -> None:
+    table = read_commit_log(repo)
+    rows = {hexsha: idx for idx, hexsha in enumerate(table.hexshas())}
+    parents = table.parent_indices()
+
+    for tag in repo.tags:
+        count = count_reachable_commits(rows[tag.commit.hexsha], parents, table.committed_dates, None)
+        assert count == len(list(repo.iter_commits(tag.commit)))
+
+    return None
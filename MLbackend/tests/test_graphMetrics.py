@@ -0,0 +1,55 @@
+from logging import Logger
+from unittest.mock import MagicMock, patch
+
+import networkx as nx
+import pytest
+
+from MLbackend.benchmarks.benchmark_centrality import generate_threads
+from MLbackend.src.centrality_analysis import (build_graph,
+                                               find_related_participants)
+from MLbackend.src.graph_metrics import GraphMetricsCache
+
+
+def add_threads(cache: GraphMetricsCache, kind: str, threads) -> None:
+    all_related_authors, author_items = find_related_participants(threads)
+    cache.add_graph(0, kind, build_graph(all_related_authors), author_items)
+
+    return None
+
+
+def test_composedNetworkMatchesCombinedLists() -> None:
+    pr_threads = generate_threads(60, author_count=30, max_participants=6, seed=1)
+    issue_threads = generate_threads(60, author_count=40, max_participants=6, seed=2)
+    cache = GraphMetricsCache("exact", 1000, 256, 1)
+    add_threads(cache, "PRs", pr_threads)
+    add_threads(cache, "Issues", issue_threads)
+    add_threads(cache, "expected", pr_threads + issue_threads)
+
+    cache.compose(0, "combined", ["PRs", "Issues"])
+
+    combined = cache.get(0, "combined", MagicMock(spec=Logger))
+    expected = cache.get(0, "expected", MagicMock(spec=Logger))
+    assert set(combined.G) == set(expected.G)
+    assert nx.utils.edges_equal(combined.G.edges, expected.G.edges)
+    assert combined.author_items == expected.author_items
+    assert combined.closeness == pytest.approx(expected.closeness)
+    assert combined.betweenness == pytest.approx(expected.betweenness)
+    assert combined.centrality == expected.centrality
+    assert sorted(map(sorted, combined.communities)) == sorted(map(sorted, expected.communities))
+
+    return None
+
+
+@patch("MLbackend.src.graph_metrics.compute_centralities")
+def test_metricsAreComputedOncePerBatchAndKind(mock_compute_centralities) -> None:
+    mock_compute_centralities.return_value = ({}, {}, "exact")
+    cache = GraphMetricsCache("exact", 1000, 256, 1)
+    add_threads(cache, "PRs", [["dev1", "dev2"]])
+
+    first = cache.get(0, "PRs", MagicMock(spec=Logger))
+    second = cache.get(0, "PRs", MagicMock(spec=Logger))
+
+    assert first is second
+    mock_compute_centralities.assert_called_once()
+
+    return None
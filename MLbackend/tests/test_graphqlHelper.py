@@ -0,0 +1,175 @@
+import time
+from logging import Logger
+from typing import Dict
+from unittest.mock import MagicMock, patch
+
+import pytest
+from requests import HTTPError
+
+import MLbackend.src.graphql_analysis.graphql_analysis_helper as gql
+from MLbackend.src.graphql_analysis.pr_analysis import build_pr_request_query
+
+
+def build_response(status_code: int, headers: Dict[str, str], data=None, text="") -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers
+    response.text = text
+    response.json.return_value = {"data": data}
+    return response
+
+
+@pytest.fixture
+def client() -> gql.GraphQLClient:
+    client = gql.GraphQLClient()
+    client.session = MagicMock()
+    return client
+
+
+@patch("MLbackend.src.graphql_analysis.graphql_analysis_helper.time.sleep")
+def test_rateLimitedRequestIsRetriedAfterPause(mock_sleep, client: gql.GraphQLClient) -> None:
+    client.session.post.side_effect = [
+        build_response(403, {"Retry-After": "30"}),
+        build_response(200, {}, {"repository": None}),
+    ]
+
+    data = client.execute("test_pat", "{ viewer { login } }", MagicMock(spec=Logger))
+
+    assert data == {"repository": None}
+    assert client.session.post.call_count == 2
+    mock_sleep.assert_called_once()
+    assert 29 <= mock_sleep.call_args.args[0] <= 30
+
+    return None
+
+
+@patch("MLbackend.src.graphql_analysis.graphql_analysis_helper.time.sleep")
+def test_badGatewayIsRetriedWithBackoff(mock_sleep, client: gql.GraphQLClient) -> None:
+    client.session.post.side_effect = [
+        build_response(502, {}),
+        build_response(502, {}),
+        build_response(200, {}, {"repository": None}),
+    ]
+
+    client.execute("test_pat", "{ viewer { login } }", MagicMock(spec=Logger))
+
+    assert client.session.post.call_count == 3
+
+    return None
+
+
+@patch("MLbackend.src.graphql_analysis.graphql_analysis_helper.time.sleep")
+def test_onlyTimeoutsSkipRetries(mock_sleep, client: gql.GraphQLClient) -> None:
+    client.session.post.side_effect = [
+        build_response(429, {"Retry-After": "5"}),
+        build_response(403, {}, text="You have exceeded a secondary rate limit."),
+        build_response(504, {}),
+    ]
+
+    with pytest.raises(HTTPError):
+        client.execute(
+            "test_pat", "{ viewer { login } }", MagicMock(spec=Logger), retry_timeouts=False
+        )
+
+    # rate limits are still waited out, the timeout is left to the caller
+    assert client.session.post.call_count == 3
+    assert mock_sleep.call_count == 2
+
+    return None
+
+
+def test_otherFailuresRaiseImmediately(client: gql.GraphQLClient) -> None:
+    client.session.post.return_value = build_response(401, {}, text="Bad credentials")
+
+    with pytest.raises(HTTPError):
+        client.execute("test_pat", "{ viewer { login } }", MagicMock(spec=Logger))
+
+    client.session.post.assert_called_once()
+
+    return None
+
+
+@patch("MLbackend.src.graphql_analysis.graphql_analysis_helper.time.sleep")
+def test_lowBudgetPausesUntilReset(mock_sleep, client: gql.GraphQLClient) -> None:
+    reset_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 120))
+    client.session.post.return_value = build_response(
+        200, {}, {"repository": None, "rateLimit": {"cost": 1, "remaining": 2, "resetAt": reset_at}}
+    )
+
+    first = client.execute("test_pat", "{ viewer { login } }", MagicMock(spec=Logger), "viewer")
+    mock_sleep.assert_not_called()
+    client.execute("test_pat", "{ viewer { login } }", MagicMock(spec=Logger), "viewer")
+
+    assert first == {"repository": None}
+    assert 110 <= mock_sleep.call_args.args[0] <= 120
+    assert len(client.timings["viewer"]) == 2
+
+    return None
+
+
+@patch("MLbackend.src.graphql_analysis.graphql_analysis_helper.time.sleep")
+def test_exhaustedTokenDoesNotPauseOtherTokens(mock_sleep, client: gql.GraphQLClient) -> None:
+    reset_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 120))
+    client.session.post.return_value = build_response(
+        200, {}, {"repository": None, "rateLimit": {"cost": 1, "remaining": 0, "resetAt": reset_at}}
+    )
+
+    client.execute("first_pat", "{ viewer { login } }", MagicMock(spec=Logger))
+    client.execute("second_pat", "{ viewer { login } }", MagicMock(spec=Logger))
+    mock_sleep.assert_not_called()
+
+    client.execute("first_pat", "{ viewer { login } }", MagicMock(spec=Logger))
+    mock_sleep.assert_called_once()
+    assert len(client.budgets) == 2
+    assert "first_pat" not in client.budgets
+
+    return None
+
+
+def test_errorsWithoutDataRaise(client: gql.GraphQLClient) -> None:
+    response = build_response(200, {})
+    response.json.return_value = {
+        "data": None,
+        "errors": [{"message": "Parse error on \"}\" (RCURLY)"}],
+    }
+    client.session.post.return_value = response
+
+    with pytest.raises(gql.GraphQLError, match="Parse error"):
+        client.execute("test_pat", "{ viewer { login } }", MagicMock(spec=Logger))
+
+    return None
+
+
+def test_errorsWithPartialDataAreReturned(client: gql.GraphQLClient) -> None:
+    response = build_response(200, {})
+    response.json.return_value = {
+        "data": {"repository": None},
+        "errors": [{"type": "NOT_FOUND", "message": "Could not resolve to a Repository."}],
+    }
+    client.session.post.return_value = response
+    logger = MagicMock(spec=Logger)
+
+    assert client.execute("test_pat", "{ viewer { login } }", logger) == {"repository": None}
+    logger.warning.assert_called_once()
+
+    return None
+
+
+def test_rateLimitFieldsAreAddedToQueries() -> None:
+    query = gql.add_rate_limit_fields(build_pr_request_query("owner", "name", None))
+
+    assert query.count("rateLimit { cost remaining resetAt }") == 1
+    assert query.index("rateLimit") > query.rindex("pullRequests")
+    assert query.rstrip().endswith("}")
+
+    return None
+
+
+def test_exhaustedBudgetWaitsUntilReset() -> None:
+    response = build_response(
+        200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 60)}
+    )
+
+    assert 58 <= gql.get_rate_limit_wait(response) <= 60
+
+    return None
@@ -0,0 +1,86 @@
+from logging import Logger
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from MLbackend.job_queue import (FAILED, FINISHED, QUEUED, RUNNING, JobQueue,
+                                 run_job)
+
+
+@pytest.fixture
+def job_queue(tmp_path: Path) -> JobQueue:
+    return JobQueue(tmp_path / "jobs.db", MagicMock(spec=Logger))
+
+
+def test_submittedJobIsQueued(job_queue: JobQueue) -> None:
+    job_id = job_queue.submit({"url": "https://github.com/owner/name"})
+
+    job = job_queue.get(job_id)
+
+    assert job["status"] == QUEUED
+    assert job["result"] is None
+    assert job["started_at"] is None
+
+    return None
+
+
+def test_claimReturnsJobsInSubmissionOrder(job_queue: JobQueue) -> None:
+    first_id = job_queue.submit({"url": "first"})
+    second_id = job_queue.submit({"url": "second"})
+
+    first = job_queue.claim(worker_pid=1)
+    second = job_queue.claim(worker_pid=1)
+
+    assert first == {"id": first_id, "payload": {"url": "first"}}
+    assert second == {"id": second_id, "payload": {"url": "second"}}
+    assert job_queue.get(first_id)["status"] == RUNNING
+    assert job_queue.claim(worker_pid=1) is None
+
+    return None
+
+
+def test_runJobStoresHandlerResult(job_queue: JobQueue) -> None:
+    job_id = job_queue.submit({"url": "https://github.com/owner/name"})
+    job = job_queue.claim(worker_pid=1)
+
+    run_job(job_queue, job, lambda job_id, payload: {"repo": payload["url"]})
+
+    stored = job_queue.get(job_id)
+    assert stored["status"] == FINISHED
+    assert stored["result"] == {"repo": "https://github.com/owner/name"}
+    assert stored["finished_at"] is not None
+
+    return None
+
+
+def test_runJobRecordsHandlerFailure(job_queue: JobQueue) -> None:
+    job_id = job_queue.submit({"url": "https://github.com/owner/name"})
+    job = job_queue.claim(worker_pid=1)
+
+    def failing_handler(job_id, payload):
+        raise LookupError("No data found, Please try again later")
+
+    run_job(job_queue, job, failing_handler)
+
+    stored = job_queue.get(job_id)
+    assert stored["status"] == FAILED
+    assert stored["error"] == "No data found, Please try again later"
+
+    return None
+
+
+def test_orphanedJobsAreRequeued(job_queue: JobQueue) -> None:
+    job_id = job_queue.submit({"url": "https://github.com/owner/name"})
+    job_queue.claim(worker_pid=2**22 + 1)
+
+    assert job_queue.requeue_orphaned() == 1
+    assert job_queue.get(job_id)["status"] == QUEUED
+
+    return None
+
+
+def test_unknownJobReturnsNone(job_queue: JobQueue) -> None:
+    assert job_queue.get("missing") is None
+
+    return None
@@ -0,0 +1,52 @@
+from logging import Logger
+from unittest.mock import MagicMock
+
+import pytest
+
+from MLbackend.src.configuration import Configuration
+from MLbackend.src.lexicon_toxicity import (TOXICITY_LEXICON_PATH,
+                                            LexiconToxicityModel)
+from MLbackend.src.perspective_analysis import get_toxicity_percentage
+from MLbackend.src.toxicity_backend import LEXICON
+
+
+def test_lexiconScoresInsultsAsToxic() -> None:
+    model = LexiconToxicityModel(TOXICITY_LEXICON_PATH)
+
+    toxicities = model.score_many(
+        [
+            "Thanks, looks good to me!",
+            "This stupid bug again",
+            "you are an idiot",
+            "Shut up and read the docs",
+            "",
+        ],
+        MagicMock(spec=Logger),
+    )
+
+    assert [toxicity >= 0.5 for toxicity in toxicities] == [False, False, True, True, False]
+    assert all(0 < toxicity < 1 for toxicity in toxicities)
+    assert model.score_many([], MagicMock(spec=Logger)) == []
+
+    return None
+
+
+def test_lexiconBackendNeedsNoKey() -> None:
+    config = Configuration(
+        "https://github.com/owner/repo", 1, "", "", 0, "", "", None, toxicity_backend=LEXICON
+    )
+    config.google_key = None
+
+    comments = ["what a moron", "merged, thanks"] * 5000
+    assert get_toxicity_percentage(config, comments, MagicMock(spec=Logger)) == 0.5
+
+    return None
+
+
+def test_unknownBackendIsRejected() -> None:
+    with pytest.raises(ValueError):
+        Configuration(
+            "https://github.com/owner/repo", 1, "", "", 0, "", "", None, toxicity_backend="bert"
+        )
+
+    return None
@@ -0,0 +1,118 @@
+import socketserver
+import threading
+from email import message_from_bytes, policy
+from logging import Logger
+from pathlib import Path
+from typing import Iterator, List
+from unittest.mock import MagicMock
+
+import pytest
+
+from MLbackend.mail_outbox import (FAILED, PENDING, SEND_LEASE_SECONDS,
+                                   SENDING, SENT, MailOutbox, SmtpSettings,
+                                   deliver_due)
+
+
+class DebuggingSmtpHandler(socketserver.StreamRequestHandler):
+    # just enough SMTP to accept mails and remember them, like a local debugging server
+
+    def handle(self) -> None:
+        self.server.connections += 1
+        self.reply("220 localhost")
+        while True:
+            line = self.rfile.readline().decode("ascii").strip()
+            command = line.split(" ")[0].upper()
+            if command in ("EHLO", "HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b""
+                for data_line in iter(self.rfile.readline, b".\r\n"):
+                    data += data_line
+                self.server.messages.append(message_from_bytes(data, policy=policy.default))
+                self.reply("250 OK")
+            else:
+                self.reply("221 Bye")
+                return
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+
+@pytest.fixture
+def smtp_server() -> Iterator[socketserver.ThreadingTCPServer]:
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), DebuggingSmtpHandler)
+    server.messages: List = []
+    server.connections = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def local_settings(port: int) -> SmtpSettings:
+    return SmtpSettings("127.0.0.1", port, None, None, False, "smells@example.com", timeout=5)
+
+
+def test_queuedMailsAreSentOverOneConnection(tmp_path: Path, smtp_server) -> None:
+    report_path = tmp_path / "smell_report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 report")
+    outbox = MailOutbox(tmp_path / "outbox.db", MagicMock(spec=Logger))
+    mail_ids = [
+        outbox.enqueue(recipient, "Report", "Hey", "smell_report.pdf", str(report_path))
+        for recipient in ["a@example.com", "b@example.com"]
+    ]
+    report_path.unlink()
+
+    assert deliver_due(outbox, local_settings(smtp_server.server_address[1])) == 2
+
+    assert smtp_server.connections == 1
+    assert [message["To"] for message in smtp_server.messages] == ["a@example.com", "b@example.com"]
+    attachment = next(smtp_server.messages[0].iter_attachments())
+    assert attachment.get_filename() == "smell_report.pdf"
+    assert attachment.get_content() == b"%PDF-1.4 report"
+    assert [outbox.get(mail_id)["status"] for mail_id in mail_ids] == [SENT, SENT]
+    assert deliver_due(outbox, local_settings(smtp_server.server_address[1])) == 0
+
+    return None
+
+
+def test_failedMailsAreRetriedWithBackoff(tmp_path: Path, smtp_server) -> None:
+    outbox = MailOutbox(tmp_path / "outbox.db", MagicMock(spec=Logger))
+    mail_id = outbox.enqueue("a@example.com", "Report", "Hey")
+
+    # nothing listens on the server's port once it is closed
+    unreachable = local_settings(smtp_server.server_address[1])
+    smtp_server.shutdown()
+    smtp_server.server_close()
+    assert deliver_due(outbox, unreachable) == 0
+
+    mail = outbox.get(mail_id)
+    assert mail["status"] == PENDING and mail["attempts"] == 1
+    assert outbox.claim_due(10) == []
+    assert len(outbox.claim_due(10, now=float("inf"))) == 1
+
+    for _ in range(10):
+        outbox.mark_failed(mail_id, "still down")
+    assert outbox.get(mail_id)["status"] == FAILED
+
+    return None
+
+
+def test_dueMailsAreClaimedByOneSender(tmp_path: Path) -> None:
+    first_sender = MailOutbox(tmp_path / "outbox.db", MagicMock(spec=Logger))
+    second_sender = MailOutbox(tmp_path / "outbox.db", MagicMock(spec=Logger))
+    mail_id = first_sender.enqueue("a@example.com", "Report", "Hey")
+
+    claimed = first_sender.claim_due(10)
+
+    assert [mail["id"] for mail in claimed] == [mail_id]
+    assert first_sender.get(mail_id)["status"] == SENDING
+    assert second_sender.claim_due(10) == []
+
+    # the first sender never reported back, so the lease runs out
+    expired_at = claimed[0]["created_at"] + SEND_LEASE_SECONDS + 1
+    assert [mail["id"] for mail in second_sender.claim_due(10, now=expired_at)] == [mail_id]
+
+    return None
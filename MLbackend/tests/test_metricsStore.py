@@ -0,0 +1,41 @@
+import csv
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from MLbackend.src.metrics_store import MetricsStore
+
+
+def test_valuesAreStoredTyped() -> None:
+    metrics = MetricsStore()
+    metrics.set(1, "AuthorCount", np.int64(3))
+    metrics.set(1, "Density", np.float64(0.5))
+    metrics.set(1, "LastCommitDate", "2024-01-01")
+    metrics.set(1, "Stdev", None)
+    metrics.set(1, "AuthorCount", 4)
+
+    assert metrics.get(0) == {}
+    assert metrics.get(1) == dict(AuthorCount=4, Density=0.5, LastCommitDate="2024-01-01", Stdev="")
+    assert type(metrics.get(1)["Density"]) is float
+    assert metrics.get(5) == {}
+
+    return None
+
+
+def test_csvExportMatchesBatchResults(tmp_path: Path) -> None:
+    metrics = MetricsStore()
+    metrics.set(0, "NumberPRs", 2)
+    metrics.set(1, "NumberPRs", 5)
+    metrics.set(1, "PRDuration_mean", 1.5)
+
+    metrics.export(str(tmp_path), ["csv"])
+
+    with open(tmp_path / "results_1.csv", newline="") as file:
+        assert list(csv.reader(file)) == [["NumberPRs", "5"], ["PRDuration_mean", "1.5"]]
+    assert (tmp_path / "results_0.csv").exists()
+
+    with pytest.raises(ValueError):
+        metrics.export(str(tmp_path), ["xlsx"])
+
+    return None
@@ -0,0 +1,66 @@
+from datetime import datetime
+from logging import Logger
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from MLbackend.src.configuration import Configuration
+from MLbackend.src.model_registry import (MODELS_PATH, SMELLS, ModelRegistry,
+                                          get_model_registry)
+from MLbackend.src.smell_detection import METRIC_NAMES, smell_detection
+from MLbackend.src.utils.result import Result
+
+
+def test_batchesArePredictedTogether() -> None:
+    registry = ModelRegistry(MODELS_PATH, METRIC_NAMES, MagicMock(spec=Logger))
+    metrics = np.random.default_rng(7).uniform(0, 50, (3, len(METRIC_NAMES))).tolist()
+
+    predictions = registry.predict(metrics)
+
+    assert list(predictions) == SMELLS
+    for smell in SMELLS:
+        assert len(predictions[smell]) == 3
+        for batch_idx in range(3):
+            assert predictions[smell][batch_idx] == registry.predict([metrics[batch_idx]])[smell][0]
+    assert registry.predict_seconds > 0
+
+    return None
+
+
+def test_mismatchedSchemaIsRejected() -> None:
+    with pytest.raises(ValueError):
+        ModelRegistry(MODELS_PATH, METRIC_NAMES[:-1], MagicMock(spec=Logger))
+
+    return None
+
+
+def test_smellsAreDetectedForEveryBatch(tmp_path: Path) -> None:
+    config = Configuration(
+        "https://github.com/owner/repo", 1, str(tmp_path), "", 0, "", "", None
+    )
+    for batch_idx in range(2):
+        config.metrics.set(batch_idx, "LastCommitDate", f"2024-0{batch_idx + 1}-01")
+        for name in METRIC_NAMES:
+            config.metrics.set(batch_idx, name, batch_idx * 10 + 1)
+
+    result = Result(logger=MagicMock(spec=Logger))
+    result.add_batch_dates([datetime(2024, 1, 1), datetime(2024, 2, 1)])
+    registry = get_model_registry(METRIC_NAMES, MagicMock(spec=Logger))
+    expected = registry.predict(
+        [[1.0] * len(METRIC_NAMES), [11.0] * len(METRIC_NAMES)]
+    )
+
+    smell_results = smell_detection(config, 2, MagicMock(spec=Logger), result)
+
+    assert len(smell_results) == 2
+    for batch_idx, batch_results in enumerate(smell_results):
+        assert batch_results["detected_smells"] == [
+            smell for smell in SMELLS if expected[smell][batch_idx] == 1
+        ]
+        assert batch_results["smell_results"][0] == f"2024-0{batch_idx + 1}-01"
+    assert result.smell_results is smell_results[-1]
+    assert config.metrics.get(1)["SmellPredictionSeconds"] > 0
+
+    return None
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_PATH: Path = Path(__file__).resolve().parents[2]
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "MLbackend.src.configuration",
+        "MLbackend.src.perspective_client",
+        "MLbackend.src.smell_detection",
+        "MLbackend.src.toxicity_backend",
+    ],
+)
+def test_moduleImportsOnItsOwn(module: str) -> None:
+    # a fresh interpreter, so no other import can hide a circular one
+    completed = subprocess.run(
+        [sys.executable, "-c", f"import {module}"],
+        cwd=ROOT_PATH,
+        capture_output=True,
+        text=True,
+    )
+
+    assert completed.returncode == 0, completed.stderr
+
+    return None
@@ -0,0 +1,97 @@
+from logging import Logger
+from unittest.mock import MagicMock, patch
+
+import pytest
+from requests import HTTPError
+
+from MLbackend.src.graphql_analysis.pagination import (
+    PageSizer, complete_nested_connections, iter_entities)
+
+
+def build_connection(nodes, end_cursor=None):
+    return {
+        "pageInfo": {"endCursor": end_cursor, "hasNextPage": end_cursor is not None},
+        "nodes": nodes,
+    }
+
+
+@patch("MLbackend.src.graphql_analysis.graphql_analysis_helper.run_graphql_request")
+def test_longThreadsAreFollowedInAliasedQueries(mock_run_graphql_request) -> None:
+    node = {
+        "id": "PR_1",
+        "number": 1,
+        "participants": build_connection([{"login": "dev1"}], "p1"),
+        "comments": build_connection([{"bodyText": "first"}], "c1"),
+    }
+    mock_run_graphql_request.side_effect = [
+        {
+            "n0": {"participants": build_connection([{"login": "dev2"}])},
+            "n1": {"comments": build_connection([{"bodyText": "second"}], "c2")},
+        },
+        {"n0": {"comments": build_connection([{"bodyText": "third"}])}},
+    ]
+
+    complete_nested_connections("test_pat", [node], "PullRequest", MagicMock(spec=Logger))
+
+    assert [user["login"] for user in node["participants"]["nodes"]] == ["dev1", "dev2"]
+    assert [comment["bodyText"] for comment in node["comments"]["nodes"]] == [
+        "first",
+        "second",
+        "third",
+    ]
+    first_query = mock_run_graphql_request.call_args_list[0].args[1]
+    assert 'n0: node(id: "PR_1")' in first_query
+    assert 'participants(first: 100, after: "p1")' in first_query
+    assert 'comments(first: 100, after: "c1")' in first_query
+    assert 'after: "c2"' in mock_run_graphql_request.call_args_list[1].args[1]
+
+    return None
+
+
+@patch("MLbackend.src.graphql_analysis.graphql_analysis_helper.run_graphql_request")
+def test_timeoutsShrinkThePage(mock_run_graphql_request) -> None:
+    timeout = HTTPError("Bad gateway", response=MagicMock(status_code=502))
+    mock_run_graphql_request.side_effect = [
+        timeout,
+        {"repository": {"issues": build_connection([{"id": "I_1", "number": 1}])}},
+    ]
+    build_query = MagicMock(return_value="query")
+
+    nodes = list(
+        iter_entities("test_pat", MagicMock(spec=Logger), "issues", "Issue", build_query, "No issues")
+    )
+
+    assert nodes == [{"id": "I_1", "number": 1}]
+    assert [call.args[1] for call in build_query.call_args_list] == [100, 50]
+    assert all(
+        call.kwargs["retry_timeouts"] is False for call in mock_run_graphql_request.call_args_list
+    )
+
+    return None
+
+
+@patch("MLbackend.src.graphql_analysis.graphql_analysis_helper.run_graphql_request")
+def test_otherFailuresAreRaised(mock_run_graphql_request) -> None:
+    mock_run_graphql_request.side_effect = HTTPError(
+        "Unauthorized", response=MagicMock(status_code=401)
+    )
+
+    with pytest.raises(HTTPError):
+        list(iter_entities("test_pat", MagicMock(spec=Logger), "issues", "Issue", MagicMock(), "No issues"))
+
+    mock_run_graphql_request.assert_called_once()
+
+    return None
+
+
+def test_pageSizeFollowsResponseTime() -> None:
+    sizer = PageSizer(max_size=100, min_size=5)
+
+    sizer.record(30.0)
+    sizer.record(30.0)
+    assert sizer.size == 25
+
+    sizer.record(0.5)
+    assert sizer.size == 50
+
+    return None
@@ -0,0 +1,34 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from reportlab.platypus import SimpleDocTemplate
+
+from MLbackend.src.pdf_generation import RENDERED_REPORTS, generate_pdf
+
+PDF_RESULTS = {
+    "Commit Analysis": [
+        [["Metrics", "Value"], ["commit_count", 12]],
+        [("Metric", "Count", "Mean", "Stdev"), ("AuthorActiveDays", 3, "4.0000", "1.0000")],
+    ],
+    "Politeness Analysis": [[["ACCL", 7.5]]],
+}
+
+
+def test_reportIsRenderedOncePerResults(tmp_path: Path) -> None:
+    RENDERED_REPORTS.clear()
+    first_path = tmp_path / "first.pdf"
+    second_path = tmp_path / "second.pdf"
+
+    generate_pdf(PDF_RESULTS, ["OSE"], first_path)
+    with patch.object(SimpleDocTemplate, "build") as mock_build:
+        generate_pdf(PDF_RESULTS, ["OSE"], second_path)
+
+    mock_build.assert_not_called()
+    assert first_path.read_bytes().startswith(b"%PDF")
+    assert second_path.read_bytes() == first_path.read_bytes()
+
+    generate_pdf(PDF_RESULTS, ["OSE", "TC"], second_path)
+    assert second_path.read_bytes() != first_path.read_bytes()
+    assert len(RENDERED_REPORTS) == 2
+
+    return None
@@ -0,0 +1,162 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import Logger
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import MagicMock
+
+import pytest
+
+from MLbackend.src.configuration import Configuration
+from MLbackend.src.perspective_analysis import get_toxicity_percentage
+from MLbackend.src.perspective_client import (PerspectiveClient, TokenBucket,
+                                              ToxicityAnalysisError)
+from MLbackend.src.score_cache import ScoreCache
+
+
+class StubPerspectiveHandler(BaseHTTPRequestHandler):
+    # scores comments containing "idiot" as toxic, like a very strict Perspective API
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        text = body["comment"]["text"]
+        with self.server.lock:
+            self.server.texts.append(text)
+            self.server.keys.append(self.path.split("key=")[-1])
+
+        if text == "broken":
+            self.send_response(500)
+            self.end_headers()
+            return None
+
+        toxicity = 0.9 if "idiot" in text else 0.1
+        response = {"attributeScores": {"TOXICITY": {"summaryScore": {"value": toxicity}}}}
+        payload = json.dumps(response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        return None
+
+    def log_message(self, format: str, *args) -> None:
+        return None
+
+
+@pytest.fixture
+def perspective_server() -> Iterator[ThreadingHTTPServer]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubPerspectiveHandler)
+    server.texts = []
+    server.keys = []
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_repeatedCommentsAreScoredOnce(perspective_server) -> None:
+    url = f"http://127.0.0.1:{perspective_server.server_address[1]}/v1alpha1/comments:analyze"
+    config = Configuration(
+        "https://github.com/owner/repo",
+        1,
+        "",
+        "",
+        0,
+        "",
+        "secret",
+        None,
+        perspective_url=url,
+        perspective_qps=100,
+        perspective_concurrency=4,
+    )
+
+    pr_comments = ["thanks!", "you idiot", "thanks!", "looks good"]
+    issue_comments = ["you idiot", "any update?"]
+
+    assert get_toxicity_percentage(config, pr_comments, MagicMock(spec=Logger)) == 0.25
+    assert get_toxicity_percentage(config, issue_comments, MagicMock(spec=Logger)) == 0.5
+
+    assert sorted(perspective_server.texts) == ["any update?", "looks good", "thanks!", "you idiot"]
+    assert set(perspective_server.keys) == {"secret"}
+
+    return None
+
+
+def test_failedRequestsRaise(perspective_server) -> None:
+    url = f"http://127.0.0.1:{perspective_server.server_address[1]}/"
+    client = PerspectiveClient(url, "secret", 100, 2)
+
+    with pytest.raises(ToxicityAnalysisError):
+        client.score_many(["fine", "broken"], MagicMock(spec=Logger))
+
+    return None
+
+
+def test_cachedScoresAreReusedAcrossRuns(perspective_server, tmp_path: Path) -> None:
+    url = f"http://127.0.0.1:{perspective_server.server_address[1]}/"
+    db_path = str(tmp_path / "cache" / "toxicity.db")
+    comments = ["thanks!", "you idiot"]
+
+    first_run = PerspectiveClient(url, "secret", 100, 2, cache=ScoreCache(db_path, 100))
+    assert first_run.score_many(comments, MagicMock(spec=Logger)) == [0.1, 0.9]
+    assert len(perspective_server.texts) == 2
+
+    # a later run starts with an empty memo but finds every score in the cache
+    second_run = PerspectiveClient(url, "secret", 100, 2, cache=ScoreCache(db_path, 100))
+    assert second_run.score_many(comments, MagicMock(spec=Logger)) == [0.1, 0.9]
+    assert len(perspective_server.texts) == 2
+
+    # scores of an older model version are not reused
+    new_model = PerspectiveClient(
+        url, "secret", 100, 2, model_version="TOXICITY/v2", cache=ScoreCache(db_path, 100)
+    )
+    assert new_model.score_many(comments, MagicMock(spec=Logger)) == [0.1, 0.9]
+    assert len(perspective_server.texts) == 4
+
+    return None
+
+
+def test_offlineRunsUseOnlyCachedScores(perspective_server, tmp_path: Path) -> None:
+    url = f"http://127.0.0.1:{perspective_server.server_address[1]}/"
+    db_path = str(tmp_path / "cache" / "toxicity.db")
+    PerspectiveClient(url, "secret", 100, 2, cache=ScoreCache(db_path, 100)).score_many(
+        ["you idiot", "thanks!"], MagicMock(spec=Logger)
+    )
+
+    config = Configuration(
+        "https://github.com/owner/repo",
+        1,
+        "",
+        "",
+        0,
+        "",
+        None,
+        None,
+        perspective_url=url,
+        perspective_offline=True,
+    )
+    config.toxicity.cache = ScoreCache(db_path, 100)
+
+    # the uncached comment is left out instead of being sent
+    comments = ["you idiot", "thanks!", "never seen before"]
+    assert get_toxicity_percentage(config, comments, MagicMock(spec=Logger)) == 0.5
+    assert len(perspective_server.texts) == 2
+
+    return None
+
+
+def test_tokenBucketKeepsTheRate() -> None:
+    bucket = TokenBucket(rate=20, capacity=1)
+
+    started_at = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+
+    # the first token is there right away, the other four take 50ms each
+    assert time.monotonic() - started_at >= 0.19
+
+    return None
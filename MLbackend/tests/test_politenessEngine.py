@@ -0,0 +1,78 @@
+from logging import Logger
+from unittest.mock import MagicMock
+
+import convokit
+import spacy
+from convokit.text_processing.textParser import process_text
+
+from MLbackend.src.politeness_engine import PolitenessEngine, doc_to_parse
+
+COMMENTS = [
+    "Great work, thanks a lot!",
+    "  This breaks the build. Please fix it.  ",
+    "Nice catch! I really appreciate the quick fix.",
+    "",
+]
+
+
+def blank_pipeline() -> spacy.language.Language:
+    # the tokenizer and sentence boundaries are enough to compare against convokit
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+def test_parsesMatchConvokit() -> None:
+    nlp = blank_pipeline()
+
+    for comment in COMMENTS:
+        assert doc_to_parse(nlp(comment.strip())) == process_text(comment, spacy_nlp=nlp)
+
+    return None
+
+
+def test_markersAreCountedPerBatch() -> None:
+    nlp = blank_pipeline()
+    engine = PolitenessEngine(nlp, batch_size=2, n_process=1)
+
+    counts = engine.positive_marker_counts([COMMENTS[:2], [], COMMENTS[2:]], MagicMock(spec=Logger))
+
+    # same counts as parsing every batch separately with convokit's own parser
+    expected = []
+    for batch in [COMMENTS[:2], COMMENTS[2:]]:
+        speaker = convokit.Speaker(id="default")
+        corpus = convokit.Corpus(
+            utterances=[
+                convokit.Utterance(id=str(idx), speaker=speaker, text=comment)
+                for idx, comment in enumerate(batch)
+            ]
+        )
+        corpus = convokit.TextParser(spacy_nlp=nlp, verbosity=0).transform(corpus)
+        corpus = convokit.PolitenessStrategies().transform(corpus, markers=True)
+        expected.append(
+            sum(
+                feature["feature_politeness_==HASPOSITIVE=="]
+                for feature in corpus.get_utterances_dataframe()["meta.politeness_strategies"]
+            )
+        )
+
+    assert counts == [expected[0], 0.0, expected[1]]
+    assert counts[0] > 0 and counts[2] > 0
+    assert engine.positive_marker_counts([[], []], MagicMock(spec=Logger)) == [0.0, 0.0]
+
+    return None
+
+
+def test_largeBatchesAreStreamed() -> None:
+    engine = PolitenessEngine(blank_pipeline(), batch_size=64, n_process=1)
+    single_counts = engine.positive_marker_counts(
+        [[comment] for comment in COMMENTS], MagicMock(spec=Logger)
+    )
+
+    counts = engine.positive_marker_counts(
+        [COMMENTS * 2500, COMMENTS[:1] * 10], MagicMock(spec=Logger)
+    )
+
+    assert counts == [sum(single_counts) * 2500, single_counts[0] * 10]
+
+    return None
@@ -5,7 +5,7 @@ from unittest.mock import MagicMock, patch
 
 from dateutil.relativedelta import relativedelta
 
-from MLbackend.src.graphql_analysis.pr_analysis import pr_request
+from MLbackend.src.graphql_analysis.pr_analysis import fetch_pr_nodes, pr_request
 
 
 class TestPRRequest(unittest.TestCase):
@@ -165,6 +165,36 @@ class TestPRRequest(unittest.TestCase):
 
         return None
 
+    @patch("MLbackend.src.graphql_analysis.graphql_analysis_helper.run_graphql_request")
+    def test_fetchStopsAtPreviouslySeenPRs(self, mock_run_graphql_request) -> None:
+        mock_run_graphql_request.return_value = {
+            "repository": {
+                "pullRequests": {
+                    "pageInfo": {
+                        "endCursor": "Y3Vyc29yOnYyOpHOBYEJRz==",
+                        "hasNextPage": True,
+                    },
+                    "nodes": [
+                        {"number": 57, "updatedAt": "2024-10-23T09:00:00Z"},
+                        {"number": 42, "updatedAt": "2024-09-25T12:30:00Z"},
+                    ],
+                }
+            }
+        }
+
+        nodes = fetch_pr_nodes(
+            pat="test_pat",
+            owner="test_owner",
+            name="test_name",
+            logger=self.mock_logger,
+            since="2024-10-01T00:00:00Z",
+        )
+
+        self.assertEqual([node["number"] for node in nodes], [57])
+        mock_run_graphql_request.assert_called_once()
+
+        return None
+
 
 if __name__ == "__main__":
     unittest.main()
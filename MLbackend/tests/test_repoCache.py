@@ -0,0 +1,119 @@
+import os
+from datetime import datetime, timezone
+from logging import Logger
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import git
+import pytest
+
+from MLbackend.src.repo_cache import RepoCache, release_repo
+
+
+def create_origin(path: Path) -> str:
+    repo = git.Repo.init(path)
+    file_path = path / "README.md"
+    file_path.write_text("readme\n")
+    repo.index.add([str(file_path)])
+    repo.index.commit(
+        "first",
+        author=git.Actor("Dev", "dev@example.com"),
+        committer=git.Actor("Dev", "dev@example.com"),
+    )
+    repo.create_tag("v1")
+    return path.as_uri()
+
+
+@pytest.fixture
+def origin_url(tmp_path: Path) -> str:
+    return create_origin(tmp_path / "origin")
+
+
+def test_mirrorIsClonedOnceAndShared(tmp_path: Path, origin_url: str) -> None:
+    cache = RepoCache(str(tmp_path / "cache"), 1 << 30, MagicMock(spec=Logger))
+
+    first = cache.acquire("owner", "repo", origin_url, "secret-token")
+    with patch("MLbackend.src.repo_cache.clone_mirror") as mock_clone_mirror:
+        second = cache.acquire("owner", "repo", origin_url, "secret-token")
+
+    mock_clone_mirror.assert_not_called()
+    assert first.bare and first.git_dir == second.git_dir
+    assert first.head.commit.message == "first"
+    assert [tag.name for tag in first.tags] == ["v1"]
+    with open(os.path.join(first.git_dir, "config")) as file:
+        assert "secret-token" not in file.read()
+
+    release_repo(first)
+    release_repo(second)
+
+    return None
+
+
+def test_releasingOneCopyKeepsTheOtherLocked(tmp_path: Path, origin_url: str) -> None:
+    cache = RepoCache(str(tmp_path / "cache"), 1 << 30, MagicMock(spec=Logger))
+    first = cache.acquire("owner", "repo", origin_url, None)
+    second = cache.acquire("owner", "repo", origin_url, None)
+    release_repo(first)
+
+    # another job's eviction must still see the mirror as in use
+    cache.max_bytes = 0
+    cache.evict(keep="")
+    assert os.path.exists(cache.mirror_path("owner", "repo"))
+
+    release_repo(second)
+    cache.evict(keep="")
+    assert not os.path.exists(cache.mirror_path("owner", "repo"))
+
+    return None
+
+
+def test_leastRecentlyUsedMirrorsAreEvicted(tmp_path: Path, origin_url: str) -> None:
+    other_url = create_origin(tmp_path / "other")
+    cache = RepoCache(str(tmp_path / "cache"), 1 << 30, MagicMock(spec=Logger))
+    release_repo(cache.acquire("owner", "old", origin_url, None))
+    in_use = cache.acquire("owner", "busy", other_url, None)
+
+    cache.max_bytes = 0
+    newest = cache.acquire("owner", "new", origin_url, None)
+
+    assert not os.path.exists(cache.mirror_path("owner", "old"))
+    assert os.path.exists(cache.mirror_path("owner", "busy"))
+    assert os.path.exists(cache.mirror_path("owner", "new"))
+
+    release_repo(in_use)
+    release_repo(newest)
+
+    return None
+
+
+def test_startDateClonesShallowAndDeepens(tmp_path: Path) -> None:
+    repo = git.Repo.init(tmp_path / "origin")
+    for message, year in [("first", 2022), ("second", 2023), ("third", 2024)]:
+        repo.index.commit(
+            message,
+            author=git.Actor("Dev", "dev@example.com"),
+            committer=git.Actor("Dev", "dev@example.com"),
+            author_date=f"{year}-01-01T00:00:00",
+            commit_date=f"{year}-01-01T00:00:00",
+        )
+    origin_url = (tmp_path / "origin").as_uri()
+    cache = RepoCache(str(tmp_path / "cache"), 1 << 30, MagicMock(spec=Logger))
+
+    shallow = cache.acquire(
+        "owner", "repo", origin_url, None, datetime(2023, 6, 1, tzinfo=timezone.utc)
+    )
+    assert [commit.message for commit in shallow.iter_commits()] == ["third"]
+    release_repo(shallow)
+
+    deeper = cache.acquire(
+        "owner", "repo", origin_url, None, datetime(2022, 6, 1, tzinfo=timezone.utc)
+    )
+    assert [commit.message for commit in deeper.iter_commits()] == ["third", "second"]
+    release_repo(deeper)
+
+    full = cache.acquire("owner", "repo", origin_url, None)
+    assert [commit.message for commit in full.iter_commits()] == ["third", "second", "first"]
+    assert not os.path.exists(os.path.join(full.git_dir, "shallow"))
+    release_repo(full)
+
+    return None
@@ -1562,4 +1562,32 @@ def test_addSmellFailsDueToIncorrectAuthorValueType(
         "All values of Result are being reset"
     )
     result_instance.logger.error.assert_called_once_with("Incorrect smell type passed")
-    return None
\ No newline at end of file
+    return None
+
+
+def test_restoredBatchMatchesAnalysedBatch(result_instance: Result) -> None:
+
+    batch_dates = [datetime.now() - relativedelta(days=5), datetime.now()]
+    result_instance.add_batch_dates(batch_dates)
+    for idx, commit_count in enumerate([5, 10]):
+        result_instance.add_commit_count(batch_idx=idx, commit_count=commit_count)
+        result_instance.add_days_active(batch_idx=idx, days_active=idx + 1)
+        result_instance.add_metric_data(
+            batch_idx=idx, metric="AuthorCommitCount", count=1, mean=float(commit_count), std_dev=None
+        )
+    snapshots = [result_instance.batch_snapshot(idx) for idx in range(len(batch_dates))]
+
+    restored = Result(logger=result_instance.logger)
+    restored.add_batch_dates(batch_dates)
+    restored.restore_batch(batch_idx=0, snapshot=snapshots[0])
+    restored.add_commit_count(batch_idx=1, commit_count=10)
+    restored.add_days_active(batch_idx=1, days_active=2)
+    restored.add_metric_data(
+        batch_idx=1, metric="AuthorCommitCount", count=1, mean=10.0, std_dev=None
+    )
+
+    assert restored.commit_count == result_instance.commit_count
+    assert restored.days_active == result_instance.days_active
+    assert restored.metric_datas == result_instance.metric_datas
+
+    return None
@@ -0,0 +1,53 @@
+from logging import Logger
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from MLbackend.result_store import ResultStore
+
+
+@pytest.fixture
+def report_path(tmp_path: Path) -> Path:
+    path = tmp_path / "run" / "smell_report.pdf"
+    path.parent.mkdir()
+    path.write_bytes(b"%PDF-1.4 report")
+    return path
+
+
+def test_storedResultIsIsolatedFromRunFolder(tmp_path: Path, report_path: Path) -> None:
+    store = ResultStore(tmp_path / "store", 60, MagicMock(spec=Logger))
+
+    store.put("job1", {"smells": ["OSE"]}, str(report_path))
+    report_path.write_bytes(b"%PDF-1.4 overwritten by another run")
+
+    stored = store.get("job1")
+    assert stored["web_result"] == {"smells": ["OSE"]}
+    assert store.get_pdf_path("job1").read_bytes() == b"%PDF-1.4 report"
+
+    return None
+
+
+def test_resultsAreKeyedById(tmp_path: Path, report_path: Path) -> None:
+    store = ResultStore(tmp_path / "store", 60, MagicMock(spec=Logger))
+
+    store.put("job1", {"smells": ["OSE"]}, str(report_path))
+    store.put("job2", {"smells": ["TC"]}, None)
+
+    assert store.get("job1")["web_result"] == {"smells": ["OSE"]}
+    assert store.get("job2")["web_result"] == {"smells": ["TC"]}
+    assert store.get_pdf_path("job2") is None
+    assert store.get("job3") is None
+
+    return None
+
+
+def test_expiredResultsAreEvicted(tmp_path: Path, report_path: Path) -> None:
+    store = ResultStore(tmp_path / "store", 0, MagicMock(spec=Logger))
+
+    store.put("job1", {"smells": []}, str(report_path))
+
+    assert store.get("job1") is None
+    assert not (tmp_path / "store" / "job1.pdf").exists()
+
+    return None
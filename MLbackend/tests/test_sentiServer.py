@@ -0,0 +1,122 @@
+import sys
+from pathlib import Path
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from MLbackend.src.score_cache import ScoreCache
+from MLbackend.src.senti_server import (CachedSentiStrength,
+                                        SentiStrengthServer, convert_scores,
+                                        encode_text)
+
+# stands in for the SentiStrength jar: "good" words are positive, "bad" words negative
+FAKE_SENTI_STRENGTH = """
+import sys
+for line in sys.stdin:
+    words = line.strip().split("+")
+    positive = 1 + words.count("good")
+    negative = -1 - words.count("bad")
+    print(positive, negative, 0, flush=True)
+"""
+
+
+class FakeSentiStrengthServer(SentiStrengthServer):
+    def _build_command(self) -> List[str]:
+        return [sys.executable, "-u", "-c", FAKE_SENTI_STRENGTH]
+
+
+@pytest.fixture
+def server():
+    fake_server = FakeSentiStrengthServer("SentiStrength.jar", "SentiStrength_Data")
+    yield fake_server
+    fake_server.close()
+
+
+def test_batchScoresKeepInputOrder(server: FakeSentiStrengthServer) -> None:
+    scores = server.getSentiment(
+        ["good good work", "bad idea", "neutral text"], score="scale"
+    )
+
+    assert scores == [2, -1, 0]
+
+    return None
+
+
+def test_singleTextIsScored(server: FakeSentiStrengthServer) -> None:
+    assert server.getSentiment("bad bad bad") == [-3]
+    assert server.getSentiment([]) == []
+
+    return None
+
+
+def test_processIsReusedAcrossCalls(server: FakeSentiStrengthServer) -> None:
+    server.getSentiment(["good"])
+    first_pid = server._process.pid
+    server.getSentiment(["bad"])
+
+    assert server._process.pid == first_pid
+
+    return None
+
+
+def test_largeBatchesAreStreamedInChunks(server: FakeSentiStrengthServer) -> None:
+    texts = ["good" if idx % 2 == 0 else "bad" for idx in range(25)]
+
+    with patch("MLbackend.src.senti_server.CHUNK_SIZE", 4):
+        scores = server.getSentiment(texts, score="dual")
+
+    assert scores == [(2, -1) if idx % 2 == 0 else (1, -2) for idx in range(25)]
+
+    return None
+
+
+def test_processRestartsAfterClose(server: FakeSentiStrengthServer) -> None:
+    server.getSentiment(["good"])
+    server.close()
+
+    assert server.getSentiment(["good"]) == [1]
+
+    return None
+
+
+def test_cachedScoresSkipTheServer(tmp_path: Path) -> None:
+    server = MagicMock(spec=SentiStrengthServer)
+    server.get_trinary_scores.side_effect = lambda texts: [(2, -1, 1) for _ in texts]
+    senti = CachedSentiStrength(server, ScoreCache(str(tmp_path / "senti.db"), 100))
+
+    first = senti.getSentiment(["nice work", "nice work", "thanks"], score="scale")
+    second = senti.getSentiment(["thanks", "nice work"], score="dual")
+
+    assert first == [1, 1, 1]
+    assert second == [(2, -1), (2, -1)]
+    server.get_trinary_scores.assert_called_once_with(["nice work", "thanks"])
+    assert (senti.cache.hits, senti.cache.misses) == (2, 2)
+
+    return None
+
+
+def test_cacheEvictsLeastRecentlyUsedEntries(tmp_path: Path) -> None:
+    cache = ScoreCache(str(tmp_path / "scores.db"), 2)
+
+    cache.put_many({"a": [1, -1, 0]})
+    cache.put_many({"b": [2, -1, 1]})
+    cache.get_many(["a"])
+    cache.put_many({"c": [1, -3, -1]})
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": [1, -1, 0], "c": [1, -3, -1]}
+
+    return None
+
+
+def test_textIsEncodedLikePySentiStr() -> None:
+    assert encode_text("first line\nsecond\r line") == "first+linesecond+line"
+
+    return None
+
+
+def test_unknownScoreTypeRaises() -> None:
+    with pytest.raises(ValueError):
+        convert_scores([(1, -1, 0)], "percent")
+
+    return None
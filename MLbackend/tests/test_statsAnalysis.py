@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import MagicMock, patch, mock_open
 from logging import Logger
-import os
+from MLbackend.src.metrics_store import MetricsStore
 from  MLbackend.src.stats_analysis import output_statistics
 
 
@@ -20,21 +20,17 @@ def mock_calculate_stats(data, logger):
 class TestOutputStatistics(unittest.TestCase):
     def setUp(self):
         self.mock_logger = MagicMock(spec=Logger)
-        self.output_dir = "mock_output_dir"
-        os.makedirs(self.output_dir, exist_ok=True)
+        self.metrics = MetricsStore()
 
     @patch("builtins.open", new_callable=mock_open)
-    @patch("csv.writer")
     @patch(
         "MLbackend.src.stats_analysis.calculate_stats", side_effect=mock_calculate_stats
     )
-    def test_output_statistics_with_data(
-        self, mock_calculate_stats, mock_csv_writer, mock_open
-    ):
+    def test_output_statistics_with_data(self, mock_calculate_stats, mock_open):
         data = [10, 20, 30]
         metric = "test_metric"
 
-        metric, count, mean, stdev = output_statistics(1, data, metric, self.output_dir, self.mock_logger)
+        metric, count, mean, stdev = output_statistics(1, data, metric, self.metrics, self.mock_logger)
 
         # Assertions
         self.assertEqual(metric, "test_metric")
@@ -44,10 +40,10 @@ class TestOutputStatistics(unittest.TestCase):
 
         mock_calculate_stats.assert_called_once_with(data, self.mock_logger)
 
-        mock_open.assert_called_once_with(
-            os.path.join(self.output_dir, "results_1.csv"), "a", newline=""
-        )
-        mock_csv_writer.assert_called()
+        # results stay in memory until the run exports them
+        mock_open.assert_not_called()
+        self.assertEqual(self.metrics.get(1)["test_metric_count"], 3)
+        self.assertEqual(self.metrics.get(1)["test_metric_mean"], 20.0)
 
     @patch("builtins.open", new_callable=mock_open)
     @patch(
@@ -59,7 +55,7 @@ class TestOutputStatistics(unittest.TestCase):
 
         # Run the function
         metric, count, mean, stdev = output_statistics(
-            2, data, metric, self.output_dir, self.mock_logger
+            2, data, metric, self.metrics, self.mock_logger
         )
         # Assertions for empty data case
         self.assertEqual(metric, "test_metric")
@@ -72,11 +68,7 @@ class TestOutputStatistics(unittest.TestCase):
 
         # Verify that file operations did not occur
         mock_open.assert_not_called()
-
-    def tearDown(self):
-        # Clean up the output directory if needed
-        if os.path.exists(self.output_dir):
-            os.rmdir(self.output_dir)
+        self.assertEqual(self.metrics.get(2), {})
 
 
 if __name__ == "__main__":
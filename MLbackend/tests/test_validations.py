@@ -4,7 +4,8 @@ import sys
 import pytest
 
 from MLbackend.validations import (InvalidInputError, validate_email,
-                                   validate_pat, validate_url)
+                                   validate_pat, validate_url,
+                                   validate_window_months)
 
 
 def test_validate_url():
@@ -20,3 +21,18 @@ def test_validate_email():
 def test_validate_pat():
     with pytest.raises(ValueError):
         validate_pat("invalid_pat!")
+
+
+def test_validate_window_months():
+    validate_window_months("12")
+    validate_window_months("1200")
+    with pytest.raises(InvalidInputError):
+        validate_window_months("0")
+    with pytest.raises(InvalidInputError):
+        validate_window_months("-3")
+    with pytest.raises(InvalidInputError):
+        validate_window_months("1201")
+    with pytest.raises(InvalidInputError):
+        validate_window_months("100000")
+    with pytest.raises(InvalidInputError):
+        validate_window_months("²")
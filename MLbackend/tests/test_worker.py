@@ -0,0 +1,20 @@
+from unittest.mock import MagicMock, patch
+
+from MLbackend.config import JOB_QUEUE_PATH, MAIL_OUTBOX_PATH
+from MLbackend.worker import main
+
+
+@patch("MLbackend.worker.signal.signal")
+@patch("MLbackend.worker.start_mail_sender")
+@patch("MLbackend.worker.start_workers")
+def test_workerStartsJobsAndMail(mock_start_workers, mock_start_mail_sender, _) -> None:
+    worker = MagicMock()
+    mock_start_workers.return_value = [worker]
+
+    main()
+
+    assert mock_start_workers.call_args.args[0] == JOB_QUEUE_PATH
+    assert mock_start_mail_sender.call_args.args[0] == MAIL_OUTBOX_PATH
+    worker.join.assert_called_once()
+
+    return None
@@ -4,6 +4,9 @@ import validators
 
 from MLbackend.config import LOGGER
 
+# a century, anything longer can't be turned into a start date
+MAX_WINDOW_MONTHS: int = 1200
+
 
 class InvalidInputError(Exception):
     pass
@@ -24,4 +27,15 @@ def validate_email(email: str) -> None:
 def validate_pat(token: str) -> None:
     if not re.match(r"^[a-zA-Z0-9-_]+$", token):
         LOGGER.error(f"Invalid PAT format {token}.")
-        raise ValueError("Invalid PAT format.")
\ No newline at end of file
+        raise ValueError("Invalid PAT format.")
+
+
+def validate_window_months(window_months: str) -> None:
+    if not window_months.isdecimal() or int(window_months) == 0:
+        LOGGER.error(f"Invalid analysis window {window_months}.")
+        raise InvalidInputError("Analysis window should be a positive number of months.")
+    if int(window_months) > MAX_WINDOW_MONTHS:
+        LOGGER.error(f"Analysis window {window_months} is too long.")
+        raise InvalidInputError(
+            f"Analysis window should be at most {MAX_WINDOW_MONTHS} months."
+        )
@@ -0,0 +1,29 @@
+import signal
+import sys
+
+from MLbackend.community_smells import preload_models, run_smells_job
+from MLbackend.config import (JOB_QUEUE_PATH, JOB_WORKER_COUNT, LOGGER,
+                              MAIL_OUTBOX_PATH)
+from MLbackend.email_utils import SMTP_SETTINGS
+from MLbackend.job_queue import start_workers
+from MLbackend.mail_outbox import start_mail_sender
+
+
+def main() -> None:
+    # runs next to the API, however many processes the WSGI server starts for it
+    workers = start_workers(
+        JOB_QUEUE_PATH, run_smells_job, JOB_WORKER_COUNT, initializer=preload_models
+    )
+    start_mail_sender(MAIL_OUTBOX_PATH, SMTP_SETTINGS)
+
+    # containers are stopped with SIGTERM, exiting stops the workers and the sender with us
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    for worker in workers:
+        worker.join()
+    LOGGER.info("All job workers stopped.")
+    return None
+
+
+if __name__ == "__main__":
+    main()
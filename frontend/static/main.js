@@ -38,7 +38,7 @@ form.addEventListener('submit', function(event) {
 
     loaderOverlay.style.display = 'flex'; 
 
-    // Send a POST request to the Flask backend
+    // Send a POST request to the Flask backend, it queues the analysis and returns a job id
     fetch('/api/v1/smells', {
         method: 'POST',
         headers: {
@@ -51,27 +51,53 @@ form.addEventListener('submit', function(event) {
         }),
     })
     .then(response => {
-        loaderOverlay.style.display = 'none'; // Hide the overlay
-
         if (response.ok) {
-            return response.text();  // Get the response as text
+            return response.json();
         } else {
             console.error('Response status:', response.status);
             throw new Error(`Network response was not ok: ${response.statusText}`);
         }
     })
+    .then(job => waitForJob(job))
     .then(html => {
+        loaderOverlay.style.display = 'none'; // Hide the overlay
+
         // Here, you can use innerHTML to render the HTML response into a specific element
         document.open();
         document.write(html);
         document.close();
     })
     .catch(error => {
+        loaderOverlay.style.display = 'none'; // Hide the overlay
         console.error('Error:', error); 
         alert('Something went wrong!'); // Optional: Show an alert for the error
     });
 });
 
+// Poll the job status until the analysis has finished and return the rendered results
+function waitForJob(job, interval = 5000) {
+    return new Promise((resolve, reject) => {
+        const poll = () => {
+            fetch(job.status_url)
+            .then(response => response.json())
+            .then(status => {
+                if (status.status === 'finished') {
+                    fetch(job.result_url)
+                    .then(response => response.ok ? response.text() : Promise.reject(new Error(response.statusText)))
+                    .then(resolve)
+                    .catch(reject);
+                } else if (status.status === 'failed' || status.status === 'error') {
+                    reject(new Error(status.message));
+                } else {
+                    setTimeout(poll, interval);
+                }
+            })
+            .catch(reject);
+        };
+        poll();
+    });
+}
+
 // Function to render errors on the TextFields
 function renderErrors() {
     // Clear previous error states